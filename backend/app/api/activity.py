@@ -0,0 +1,100 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from sqlalchemy import tuple_
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+import uuid
+
+from ..database import get_db
+from ..config import settings
+from ..models import Task, TaskEvent, Board, User, TeamMember
+from ..schemas import TaskEvent as TaskEventSchema, ActivityPage
+from ..api.deps import get_current_active_user
+
+router = APIRouter()
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+def _in_window():
+    # The lower bound on occurred_at lets Postgres prune to recent partitions
+    window_start = datetime.now(timezone.utc) - timedelta(days=settings.ACTIVITY_FEED_WINDOW_DAYS)
+    return TaskEvent.occurred_at >= window_start
+
+def _read_page(query, cursor: Optional[str], limit: int) -> ActivityPage:
+    query = query.filter(_in_window())
+
+    if cursor:
+        try:
+            micros, event_id = cursor.split("_")
+            position = (EPOCH + timedelta(microseconds=int(micros)), uuid.UUID(event_id))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(tuple_(TaskEvent.occurred_at, TaskEvent.id) < position)
+
+    events = query.order_by(
+        TaskEvent.occurred_at.desc(),
+        TaskEvent.id.desc()
+    ).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(events) > limit:
+        events = events[:limit]
+        last = events[-1]
+        micros = (last.occurred_at - EPOCH) // timedelta(microseconds=1)
+        next_cursor = f"{micros}_{last.id}"
+
+    return ActivityPage(
+        events=[TaskEventSchema.model_validate(event) for event in events],
+        next_cursor=next_cursor
+    )
+
+def _check_board_access(db: Session, board_id: uuid.UUID, user: User):
+    membership = db.query(TeamMember).join(
+        Board, Board.team_id == TeamMember.team_id
+    ).filter(
+        Board.id == board_id,
+        TeamMember.user_id == user.id
+    ).first()
+
+    if not membership:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+@router.get("/tasks/{task_id}", response_model=ActivityPage)
+async def get_task_activity(
+    task_id: uuid.UUID,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=100),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get the activity feed of a task, newest first"""
+
+    # Deleted tasks keep their history, so fall back to the board recorded on the events
+    board_id = db.query(Task.board_id).filter(Task.id == task_id).scalar()
+    if board_id is None:
+        board_id = db.query(TaskEvent.board_id).filter(
+            TaskEvent.task_id == task_id,
+            _in_window()
+        ).limit(1).scalar()
+    if board_id is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    _check_board_access(db, board_id, current_user)
+
+    query = db.query(TaskEvent).filter(TaskEvent.task_id == task_id)
+    return _read_page(query, cursor, limit)
+
+@router.get("/boards/{board_id}", response_model=ActivityPage)
+async def get_board_activity(
+    board_id: uuid.UUID,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=100),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get the activity feed of a board, newest first"""
+
+    _check_board_access(db, board_id, current_user)
+
+    query = db.query(TaskEvent).filter(TaskEvent.board_id == board_id)
+    return _read_page(query, cursor, limit)
@@ -0,0 +1,122 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session, joinedload
+from typing import List, Optional
+import uuid
+
+from ..database import get_db
+from ..models import ArchivedTask, Board, Task, User, TeamMember
+from ..schemas import (
+    ArchivedTask as ArchivedTaskSchema,
+    ArchivedTaskWithComments,
+    TaskWithDetails
+)
+from ..api.deps import get_current_active_user
+from ..services.archive_service import restore_task
+from ..services.attachment_service import available_derivatives
+from ..core.websocket import websocket_manager
+
+router = APIRouter()
+
+@router.get("/tasks", response_model=List[ArchivedTaskSchema])
+async def search_archived_tasks(
+    board_id: Optional[uuid.UUID] = Query(None),
+    q: Optional[str] = Query(None, min_length=1),
+    limit: int = Query(50, le=100),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Search archived tasks, most recently archived first"""
+
+    query = db.query(ArchivedTask).join(
+        Board, Board.id == ArchivedTask.board_id
+    ).join(
+        TeamMember, TeamMember.team_id == Board.team_id
+    ).filter(TeamMember.user_id == current_user.id)
+
+    if board_id:
+        query = query.filter(ArchivedTask.board_id == board_id)
+    if q:
+        query = query.filter(ArchivedTask.title.ilike(f"%{q}%"))
+
+    return query.order_by(
+        ArchivedTask.archived_at.desc()
+    ).offset(offset).limit(limit).all()
+
+@router.get("/tasks/{task_id}", response_model=ArchivedTaskWithComments)
+async def get_archived_task(
+    task_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get an archived task with its comments and attachments"""
+
+    archived = db.query(ArchivedTask).options(
+        joinedload(ArchivedTask.comments),
+        joinedload(ArchivedTask.attachments)
+    ).filter(ArchivedTask.id == task_id).first()
+
+    if not archived:
+        raise HTTPException(status_code=404, detail="Archived task not found")
+
+    membership = db.query(TeamMember).join(
+        Board, Board.team_id == TeamMember.team_id
+    ).filter(
+        Board.id == archived.board_id,
+        TeamMember.user_id == current_user.id
+    ).first()
+
+    if not membership:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    result = ArchivedTaskWithComments.model_validate(archived)
+    for attachment, item in zip(archived.attachments, result.attachments):
+        item.derivatives = available_derivatives(attachment)
+    return result
+
+@router.post("/tasks/{task_id}/restore", response_model=TaskWithDetails)
+async def restore_archived_task(
+    task_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Move an archived task back onto its board"""
+
+    board_id = db.query(ArchivedTask.board_id).filter(ArchivedTask.id == task_id).scalar()
+    if board_id is None:
+        raise HTTPException(status_code=404, detail="Archived task not found")
+
+    membership = db.query(TeamMember).join(
+        Board, Board.team_id == TeamMember.team_id
+    ).filter(
+        Board.id == board_id,
+        TeamMember.user_id == current_user.id
+    ).first()
+
+    if not membership or membership.role.value == "viewer":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+
+    task = restore_task(db, task_id, current_user.id)
+
+    task = db.query(Task).options(
+        joinedload(Task.assignee),
+        joinedload(Task.creator),
+        joinedload(Task.subtasks),
+        joinedload(Task.comments),
+        joinedload(Task.attachments)
+    ).filter(Task.id == task.id).first()
+
+    task_dict = TaskWithDetails.model_validate(task).model_dump()
+    task_dict["comments_count"] = len(task.comments)
+    task_dict["attachments_count"] = len(task.attachments)
+
+    # Restored tasks reappear on the board like new ones
+    await websocket_manager.broadcast_to_board(
+        board_id,
+        {
+            "type": "task_created",
+            "task": TaskWithDetails(**task_dict).model_dump(mode="json")
+        }
+    )
+
+    return TaskWithDetails(**task_dict)
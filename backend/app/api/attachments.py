@@ -0,0 +1,180 @@
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import List
+import uuid
+
+from ..database import get_db
+from ..models import Task, ArchivedTask, Board, User, TeamMember, Attachment, DerivativeStatus
+from ..schemas import Attachment as AttachmentSchema
+from ..api.deps import get_current_active_user
+from ..services.attachment_service import (
+    DERIVATIVE_SIZES,
+    available_derivatives,
+    derivative_pipeline,
+    derivative_path,
+    has_derivatives,
+    original_path,
+    store_upload,
+    supports_derivatives
+)
+
+router = APIRouter()
+
+def _check_task_access(db: Session, task_id: uuid.UUID, user: User, write: bool = False):
+    board = db.query(Board).join(Task, Task.board_id == Board.id).filter(Task.id == task_id).first()
+    if not board:
+        # Attachments of an archived task stay readable until it is restored
+        board = db.query(Board).join(
+            ArchivedTask, ArchivedTask.board_id == Board.id
+        ).filter(ArchivedTask.id == task_id).first()
+        if not board:
+            raise HTTPException(status_code=404, detail="Task not found")
+        if write:
+            raise HTTPException(status_code=409, detail="Task is archived; restore it first")
+
+    membership = db.query(TeamMember).filter(
+        TeamMember.user_id == user.id,
+        TeamMember.team_id == board.team_id
+    ).first()
+
+    if not membership:
+        raise HTTPException(status_code=403, detail="Access denied")
+    if write and membership.role.value == "viewer":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+
+def _get_attachment(db: Session, attachment_id: uuid.UUID, user: User, write: bool = False) -> Attachment:
+    attachment = db.query(Attachment).filter(Attachment.id == attachment_id).first()
+    if not attachment:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+
+    _check_task_access(db, attachment.task_id, user, write)
+    return attachment
+
+def _to_schema(attachment: Attachment) -> AttachmentSchema:
+    result = AttachmentSchema.model_validate(attachment)
+    result.derivatives = available_derivatives(attachment)
+    return result
+
+@router.post("/tasks/{task_id}", response_model=AttachmentSchema)
+async def upload_attachment(
+    task_id: uuid.UUID,
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Upload a file to a task; thumbnails are rendered in the background"""
+
+    _check_task_access(db, task_id, current_user, write=True)
+
+    content_hash, size = await run_in_threadpool(store_upload, file.file)
+    content_type = file.content_type or "application/octet-stream"
+
+    if not supports_derivatives(content_type):
+        derivative_status = DerivativeStatus.UNSUPPORTED
+    elif has_derivatives(content_hash):
+        derivative_status = DerivativeStatus.READY
+    else:
+        derivative_status = DerivativeStatus.PENDING
+
+    attachment = Attachment(
+        filename=file.filename or content_hash,
+        content_type=content_type,
+        size=size,
+        content_hash=content_hash,
+        derivative_status=derivative_status,
+        task_id=task_id,
+        uploader_id=current_user.id
+    )
+    db.add(attachment)
+    db.commit()
+    db.refresh(attachment)
+
+    if derivative_status == DerivativeStatus.PENDING:
+        derivative_pipeline.submit(content_hash, content_type)
+
+    return _to_schema(attachment)
+
+@router.get("/tasks/{task_id}", response_model=List[AttachmentSchema])
+async def get_task_attachments(
+    task_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """List a task's attachments with their derivative state"""
+
+    _check_task_access(db, task_id, current_user)
+
+    attachments = db.query(Attachment).filter(
+        Attachment.task_id == task_id
+    ).order_by(Attachment.created_at).all()
+
+    return [_to_schema(attachment) for attachment in attachments]
+
+@router.get("/{attachment_id}", response_model=AttachmentSchema)
+async def get_attachment(
+    attachment_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get an attachment; poll until derivative_status leaves pending"""
+
+    return _to_schema(_get_attachment(db, attachment_id, current_user))
+
+@router.get("/{attachment_id}/download")
+async def download_attachment(
+    attachment_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Download the original file"""
+
+    attachment = _get_attachment(db, attachment_id, current_user)
+    return FileResponse(
+        original_path(attachment.content_hash),
+        media_type=attachment.content_type,
+        filename=attachment.filename
+    )
+
+@router.get("/{attachment_id}/derivatives/{name}")
+async def get_derivative(
+    attachment_id: uuid.UUID,
+    name: str,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get a rendered thumbnail or preview"""
+
+    attachment = _get_attachment(db, attachment_id, current_user)
+
+    if name not in DERIVATIVE_SIZES:
+        raise HTTPException(status_code=404, detail="Unknown derivative")
+    if attachment.derivative_status != DerivativeStatus.READY:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Derivative not available: {attachment.derivative_status.value}"
+        )
+
+    # Content-addressed, so the file behind this URL never changes
+    return FileResponse(
+        derivative_path(attachment.content_hash, name),
+        media_type="image/webp",
+        headers={"Cache-Control": "private, max-age=31536000, immutable"}
+    )
+
+@router.delete("/{attachment_id}")
+async def delete_attachment(
+    attachment_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Delete an attachment"""
+
+    attachment = _get_attachment(db, attachment_id, current_user, write=True)
+
+    # Stored files are shared by content hash, so only the row goes
+    db.delete(attachment)
+    db.commit()
+
+    return {"message": "Attachment deleted successfully"}
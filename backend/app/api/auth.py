@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends, Response, status
+from fastapi.security import HTTPAuthorizationCredentials
+
+from ..models import User
+from ..api.deps import get_current_active_user, security
+from ..core.auth import token_verifier
+
+router = APIRouter()
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Revoke the presented access token on every worker"""
+
+    await token_verifier.revoke_everywhere(credentials.credentials)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
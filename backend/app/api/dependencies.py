@@ -0,0 +1,149 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import or_
+from typing import List, Optional
+import uuid
+
+from ..database import get_db
+from ..models import Task, Board, User, TeamMember, TaskDependency
+from ..schemas import (
+    TaskDependency as TaskDependencySchema,
+    TaskDependencyCreate,
+    CriticalPath
+)
+from ..api.deps import get_current_active_user
+from ..core.cache import VersionedLRU
+from ..core.compression import CompressedPayload
+from ..services.graph_service import (
+    bump_graph_version,
+    creates_cycle,
+    get_critical_path,
+    graph_version,
+    lock_team_graph
+)
+
+router = APIRouter()
+
+# Serialized and compressed critical paths, keyed like the critical path cache
+critical_path_payloads: VersionedLRU[CompressedPayload] = VersionedLRU(maxsize=256)
+
+def _get_team_membership(db: Session, team_id: uuid.UUID, user: User) -> Optional[TeamMember]:
+    return db.query(TeamMember).filter(
+        TeamMember.user_id == user.id,
+        TeamMember.team_id == team_id
+    ).first()
+
+def _load_editable_tasks(db: Session, task_ids: List[uuid.UUID], user: User) -> List[Task]:
+    tasks = db.query(Task).options(joinedload(Task.board)).filter(Task.id.in_(task_ids)).all()
+    if len(tasks) != len(set(task_ids)):
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    team_ids = {task.board.team_id for task in tasks}
+    if len(team_ids) != 1:
+        raise HTTPException(status_code=400, detail="Dependencies must stay within one team")
+
+    team_id = team_ids.pop()
+    membership = _get_team_membership(db, team_id, user)
+    if not membership or membership.role.value == "viewer":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+
+    lock_team_graph(db, team_id)
+    return tasks
+
+@router.post("/", response_model=TaskDependencySchema)
+async def create_dependency(
+    dependency_data: TaskDependencyCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Record that one task blocks another"""
+
+    tasks = _load_editable_tasks(
+        db, [dependency_data.blocker_id, dependency_data.blocked_id], current_user
+    )
+
+    existing = db.query(TaskDependency).filter(
+        TaskDependency.blocker_id == dependency_data.blocker_id,
+        TaskDependency.blocked_id == dependency_data.blocked_id
+    ).first()
+    if existing:
+        return existing
+
+    if creates_cycle(db, dependency_data.blocker_id, dependency_data.blocked_id):
+        raise HTTPException(status_code=409, detail="Dependency would create a cycle")
+
+    dependency = TaskDependency(**dependency_data.model_dump())
+    db.add(dependency)
+    bump_graph_version(db, *(task.board_id for task in tasks))
+    db.commit()
+    db.refresh(dependency)
+
+    return dependency
+
+@router.get("/tasks/{task_id}", response_model=List[TaskDependencySchema])
+async def get_task_dependencies(
+    task_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get the edges where a task is the blocker or the blocked one"""
+
+    task = db.query(Task).filter(Task.id == task_id).first()
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    if not _get_team_membership(db, task.board.team_id, current_user):
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    return db.query(TaskDependency).filter(
+        or_(TaskDependency.blocker_id == task_id, TaskDependency.blocked_id == task_id)
+    ).all()
+
+@router.delete("/{dependency_id}")
+async def delete_dependency(
+    dependency_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Remove a dependency"""
+
+    dependency = db.query(TaskDependency).filter(TaskDependency.id == dependency_id).first()
+    if not dependency:
+        raise HTTPException(status_code=404, detail="Dependency not found")
+
+    tasks = _load_editable_tasks(
+        db, [dependency.blocker_id, dependency.blocked_id], current_user
+    )
+
+    db.delete(dependency)
+    bump_graph_version(db, *(task.board_id for task in tasks))
+    db.commit()
+
+    return {"message": "Dependency deleted successfully"}
+
+@router.get("/boards/{board_id}/critical-path", response_model=CriticalPath)
+async def get_board_critical_path(
+    request: Request,
+    board_id: uuid.UUID,
+    sprint_id: Optional[uuid.UUID] = Query(None),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get the critical path and earliest finish times of a board's tasks"""
+
+    board = db.query(Board).filter(Board.id == board_id).first()
+    if not board:
+        raise HTTPException(status_code=404, detail="Board not found")
+
+    if not _get_team_membership(db, board.team_id, current_user):
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    # Until the graph changes, repeat reads skip serialization and compression
+    key = (board.id, sprint_id)
+    payload = critical_path_payloads.get(key, graph_version(db, board.id))
+    if payload is None:
+        result = get_critical_path(db, board, sprint_id)
+        payload = CompressedPayload(result.model_dump_json().encode())
+        critical_path_payloads.put(key, result.graph_version, payload)
+
+    return await payload.response(request)
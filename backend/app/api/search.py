@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+import uuid
+
+from ..database import get_db
+from ..models import User
+from ..schemas import SearchPage
+from ..api.deps import get_current_active_user
+from ..services.search_service import search_tasks
+
+router = APIRouter()
+
+@router.get("/tasks", response_model=SearchPage)
+async def search(
+    q: str = Query(..., min_length=1, max_length=256),
+    board_id: Optional[uuid.UUID] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Full-text search over tasks and their comments on the user's boards"""
+
+    return search_tasks(db, current_user, q, board_id, cursor, limit)
@@ -1,47 +1,109 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from pydantic import TypeAdapter, create_model
 from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
+from sqlalchemy.orm.exc import StaleDataError
+from functools import lru_cache
+from typing import List, Optional, Tuple, Union
 import uuid
 
 from ..database import get_db
-from ..models import Task, Board, User, TeamMember
+from ..models import Task, Board, User, TeamMember, Comment, Attachment
 from ..schemas import (
     Task as TaskSchema, 
     TaskCreate, 
     TaskUpdate, 
     TaskWithDetails,
+    TaskSummary,
     TaskMove
 )
+from ..schemas.base import BaseSchema
 from ..api.deps import get_current_active_user
+from ..core.rate_limit import enforce_board_write_limit, limit_task_writes
+from ..core.permissions import get_team_role
 from ..services.task_service import TaskService
-from ..core.websocket import websocket_manager
+from ..services.activity_service import record_activity, diff_changes
+from ..services.reminder_service import notify_due_change, REMINDER_FIELDS
+from ..services.graph_service import bump_graph_version, linked_board_ids, GRAPH_FIELDS
+from ..services.workload_service import apply_workload_change, task_snapshot
+from ..services.board_service import column_index, shift_column_count
+from ..core.websocket import websocket_manager, task_patch
 
 router = APIRouter()
 
-@router.get("/", response_model=List[TaskWithDetails])
+# Columns a move can change; moves broadcast only these to patch clients
+MOVED_FIELDS = ("board_id", "column_id", "position", "status", "version", "updated_at")
+
+# Columns selectable with ?fields=; all are plain columns of the tasks table
+SPARSE_FIELDS = tuple(TaskSchema.model_fields)
+
+@lru_cache(maxsize=128)
+def _sparse_adapter(fields: Tuple[str, ...]) -> TypeAdapter:
+    """Build (once per field set) a list serializer for the selected columns"""
+    
+    model = create_model(
+        "TaskFields",
+        __base__=BaseSchema,
+        **{field: (TaskSchema.model_fields[field].annotation, None) for field in fields}
+    )
+    return TypeAdapter(List[model])
+
+summary_adapter = TypeAdapter(List[TaskSummary])
+
+# Documents ?fields= responses: any subset of the task columns, plus id
+TaskFields = create_model(
+    "TaskFields",
+    __base__=BaseSchema,
+    **{field: (Optional[TaskSchema.model_fields[field].annotation], None) for field in SPARSE_FIELDS}
+)
+
+@router.get("/", response_model=Union[List[TaskWithDetails], List[TaskSummary], List[TaskFields]])
 async def get_tasks(
     board_id: Optional[uuid.UUID] = Query(None),
     assignee_id: Optional[uuid.UUID] = Query(None),
     status: Optional[str] = Query(None),
     sprint_id: Optional[uuid.UUID] = Query(None),
+    view: str = Query("full", pattern="^(full|summary)$"),
+    fields: Optional[str] = Query(None, description="Comma-separated task columns to return"),
     limit: int = Query(50, le=100),
     offset: int = Query(0, ge=0),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Get tasks with filtering options"""
-    
-    query = db.query(Task).options(
-        joinedload(Task.assignee),
-        joinedload(Task.creator),
-        joinedload(Task.board),
-        joinedload(Task.subtasks),
-        joinedload(Task.comments),
-        joinedload(Task.attachments)
-    )
+    """Get tasks with filtering options.
+    
+    `view=summary` returns TaskSummary items and `fields=` only the listed
+    columns; both select just those columns and skip the nested users,
+    subtasks and counts.
+    """
+    
+    selected = None
+    if fields:
+        selected = tuple(dict.fromkeys(["id"] + [field.strip() for field in fields.split(",") if field.strip()]))
+        unknown = [field for field in selected if field not in SPARSE_FIELDS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(unknown)}"
+            )
+    elif view == "summary":
+        selected = tuple(TaskSummary.model_fields)
+    
+    if selected:
+        query = db.query(*(getattr(Task, field) for field in selected))
+    else:
+        query = db.query(Task).options(
+            joinedload(Task.assignee),
+            joinedload(Task.creator),
+            joinedload(Task.board),
+            joinedload(Task.subtasks),
+            joinedload(Task.comments),
+            joinedload(Task.attachments)
+        )
     
     # Filter by user's team access
-    query = query.join(Board).join(TeamMember).filter(
+    query = query.join(Board, Board.id == Task.board_id).join(
+        TeamMember, TeamMember.team_id == Board.team_id
+    ).filter(
         TeamMember.user_id == current_user.id
     )
     
@@ -56,6 +118,15 @@ async def get_tasks(
     
     tasks = query.offset(offset).limit(limit).all()
     
+    if selected:
+        # Rows go straight to JSON; no ORM objects or response_model pass
+        adapter = summary_adapter if not fields else _sparse_adapter(selected)
+        rows = [row._asdict() for row in tasks]
+        return Response(
+            content=adapter.dump_json(adapter.validate_python(rows)),
+            media_type="application/json"
+        )
+    
     # Convert to schema with additional details
     result = []
     for task in tasks:
@@ -101,7 +172,11 @@ async def get_task(
     
     return TaskWithDetails(**task_dict)
 
-@router.post("/", response_model=TaskWithDetails)
+@router.post(
+    "/",
+    response_model=TaskWithDetails,
+    dependencies=[Depends(limit_task_writes)]
+)
 async def create_task(
     task_data: TaskCreate,
     current_user: User = Depends(get_current_active_user),
@@ -122,11 +197,15 @@ async def create_task(
     if not membership or membership.role.value == "viewer":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
     
-    # Get next position in column
-    max_position = db.query(Task).filter(
-        Task.board_id == task_data.board_id,
-        Task.column_id == task_data.column_id
-    ).count()
+    await enforce_board_write_limit(board.id)
+    
+    column = column_index(board).column(task_data.column_id)
+    
+    # Taking a slot in the column's counter enforces its WIP limit and gives
+    # the next position without counting the column's tasks
+    max_position = shift_column_count(
+        db, after=(board.id, column.id), wip_limit=column.wip_limit
+    ) - 1
     
     # Create task
     task = Task(
@@ -134,17 +213,21 @@ async def create_task(
         creator_id=current_user.id,
         position=max_position
     )
+    if column.status:
+        task.status = column.status
     
     if task_data.assignee_id:
         # Verify assignee is team member
-        assignee_membership = db.query(TeamMember).filter(
-            TeamMember.user_id == task_data.assignee_id,
-            TeamMember.team_id == board.team_id
-        ).first()
-        if assignee_membership:
+        if get_team_role(db, board.team_id, task_data.assignee_id):
             task.assignee_id = task_data.assignee_id
     
     db.add(task)
+    db.flush()
+    if task.due_date:
+        notify_due_change(db, task, due_date_changed=True)
+    apply_workload_change(db, after=task_snapshot(task, board.team_id))
+    record_activity(db, task.id, board.id, current_user.id, "created")
+    bump_graph_version(db, board.id)
     db.commit()
     db.refresh(task)
     
@@ -171,7 +254,11 @@ async def create_task(
     
     return TaskWithDetails(**task_dict)
 
-@router.put("/{task_id}", response_model=TaskWithDetails)
+@router.put(
+    "/{task_id}",
+    response_model=TaskWithDetails,
+    dependencies=[Depends(limit_task_writes)]
+)
 async def update_task(
     task_id: uuid.UUID,
     task_data: TaskUpdate,
@@ -194,12 +281,47 @@ async def update_task(
     if not membership or membership.role.value == "viewer":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
     
+    await enforce_board_write_limit(board.id)
+    
+    task_service = TaskService(db)
+    if task_data.version is not None and task_data.version != task.version:
+        raise task_service.version_conflict(task_id)
+    
+    before = TaskSchema.model_validate(task).model_dump(mode="json")
+    workload_before = task_snapshot(task, board.team_id)
+    
     # Update task fields
-    update_data = task_data.model_dump(exclude_unset=True)
+    update_data = task_data.model_dump(exclude_unset=True, exclude={"version"})
+    old_column = task.column_id
+    old_due_date = task.due_date
+    column = None
+    if update_data.get("column_id", old_column) != old_column:
+        column = column_index(board).column(update_data["column_id"])
+        if column.status and "status" not in update_data:
+            update_data["status"] = column.status
     for field, value in update_data.items():
         if hasattr(task, field):
             setattr(task, field, value)
     
+    # Claim the row first with UPDATE ... WHERE version = :v, as move_task
+    # does, so both paths lock the task before any shared counter rows
+    try:
+        db.flush()
+    except StaleDataError:
+        raise task_service.version_conflict(task_id)
+    
+    if column:
+        shift_column_count(
+            db, (board.id, old_column), (board.id, column.id), column.wip_limit
+        )
+    if REMINDER_FIELDS & update_data.keys():
+        notify_due_change(db, task, due_date_changed=task.due_date != old_due_date)
+    apply_workload_change(db, workload_before, task_snapshot(task, board.team_id))
+    after = TaskSchema.model_validate(task).model_dump(mode="json")
+    record_activity(db, task.id, board.id, current_user.id, "updated", diff_changes(before, after))
+    if GRAPH_FIELDS & update_data.keys():
+        bump_graph_version(db, board.id)
+    
     db.commit()
     db.refresh(task)
     
@@ -214,12 +336,12 @@ async def update_task(
     ).filter(Task.id == task.id).first()
     
     # Notify via WebSocket
-    await websocket_manager.broadcast_to_board(
+    task_json = TaskWithDetails.model_validate(task).model_dump(mode="json")
+    await websocket_manager.broadcast_task_change(
         board.id,
-        {
-            "type": "task_updated",
-            "task": TaskWithDetails.model_validate(task).model_dump()
-        }
+        "task_updated",
+        task_json,
+        task_patch(task_json, before=before)
     )
     
     task_dict = TaskWithDetails.model_validate(task).model_dump()
@@ -228,7 +350,11 @@ async def update_task(
     
     return TaskWithDetails(**task_dict)
 
-@router.post("/{task_id}/move", response_model=TaskWithDetails)
+@router.post(
+    "/{task_id}/move",
+    response_model=TaskWithDetails,
+    dependencies=[Depends(limit_task_writes)]
+)
 async def move_task(
     task_id: uuid.UUID,
     move_data: TaskMove,
@@ -241,18 +367,20 @@ async def move_task(
     task = await task_service.move_task(task_id, move_data, current_user)
     
     # Notify via WebSocket
-    board = db.query(Board).filter(Board.id == task.board_id).first()
-    await websocket_manager.broadcast_to_board(
-        board.id,
-        {
-            "type": "task_moved",
-            "task": TaskWithDetails.model_validate(task).model_dump()
-        }
+    task_json = task.model_dump(mode="json")
+    await websocket_manager.broadcast_task_change(
+        task.board_id,
+        "task_moved",
+        task_json,
+        task_patch(task_json, fields=MOVED_FIELDS)
     )
     
     return task
 
-@router.delete("/{task_id}")
+@router.delete(
+    "/{task_id}",
+    dependencies=[Depends(limit_task_writes)]
+)
 async def delete_task(
     task_id: uuid.UUID,
     current_user: User = Depends(get_current_active_user),
@@ -274,7 +402,32 @@ async def delete_task(
     if not membership or membership.role.value == "viewer":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
     
+    await enforce_board_write_limit(board.id)
+    
+    workload_before = task_snapshot(task, board.team_id)
+    
+    # Read before the delete cascades the task's edges away; edges may reach
+    # other boards of the team
+    graph_boards = linked_board_ids(db, [task_id]) | {board.id}
+    
+    # The task row goes first, in the same lock order as updates and moves.
+    # The DELETE is also conditional on version, so it loses to a racing write
     db.delete(task)
+    try:
+        db.flush()
+    except StaleDataError:
+        raise TaskService(db).version_conflict(task_id)
+    
+    # comments.task_id and attachments.task_id carry no foreign key, so
+    # remove them explicitly. Stored files are shared by content hash and stay.
+    db.query(Comment).filter(Comment.task_id == task_id).delete(synchronize_session=False)
+    db.query(Attachment).filter(Attachment.task_id == task_id).delete(synchronize_session=False)
+    shift_column_count(db, before=(board.id, task.column_id))
+    if task.due_date:
+        notify_due_change(db, task, deleted=True)
+    apply_workload_change(db, before=workload_before)
+    record_activity(db, task_id, board.id, current_user.id, "deleted")
+    bump_graph_version(db, *graph_boards)
     db.commit()
     
     # Notify via WebSocket
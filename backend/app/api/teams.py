@@ -0,0 +1,259 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, literal_column
+from sqlalchemy.dialects.postgresql import insert
+from typing import Dict, List, Tuple
+import uuid
+
+from ..database import get_db
+from ..models import Team, TeamMember, Board, User, UserRole
+from ..schemas import (
+    Team as TeamSchema,
+    TeamCreate,
+    TeamSummary,
+    TeamWithMembers,
+    TeamMemberAdd,
+    TeamMemberInfo,
+    TeamMemberUpdate,
+    TeamMembersBulkAdd,
+    TeamMembersBulkResult
+)
+from ..api.deps import get_current_active_user
+from ..core.permissions import require_team_role, team_role_cache
+
+router = APIRouter()
+
+def _team_counts(db: Session, team_ids: List[uuid.UUID]) -> Dict[uuid.UUID, Tuple[int, int]]:
+    """(member_count, board_count) per team from two grouped aggregates"""
+
+    members = dict(db.query(TeamMember.team_id, func.count(TeamMember.id)).filter(
+        TeamMember.team_id.in_(team_ids)
+    ).group_by(TeamMember.team_id).all())
+    boards = dict(db.query(Board.team_id, func.count(Board.id)).filter(
+        Board.team_id.in_(team_ids)
+    ).group_by(Board.team_id).all())
+
+    return {team_id: (members.get(team_id, 0), boards.get(team_id, 0)) for team_id in team_ids}
+
+def _ensure_admin_remains(db: Session, team_id: uuid.UUID, losing_admin: List[uuid.UUID]):
+    """Reject a write that would leave the team without an admin.
+
+    The team's admin rows stay locked until commit, so two admins demoting
+    each other at the same time cannot both succeed.
+    """
+
+    admins = {
+        user_id for user_id, in db.query(TeamMember.user_id).filter(
+            TeamMember.team_id == team_id,
+            TeamMember.role == UserRole.ADMIN
+        ).order_by(TeamMember.user_id).with_for_update()
+    }
+    if admins and not admins - set(losing_admin):
+        raise HTTPException(status_code=409, detail="A team must keep at least one admin")
+
+def _check_own_role(current_user: User, user_id: uuid.UUID, role: UserRole):
+    # Admins hand over by promoting someone else, who can then demote them
+    if user_id == current_user.id and role != UserRole.ADMIN:
+        raise HTTPException(status_code=400, detail="You cannot change your own role")
+
+async def _upsert_members(
+    db: Session,
+    team_id: uuid.UUID,
+    members: List[TeamMemberAdd],
+    current_user: User,
+    update_existing: bool = True
+) -> TeamMembersBulkResult:
+    # Later entries for the same email win
+    roles = {member.user_email.strip(): member.role for member in members}
+
+    # One IN query against the unique index on users.email
+    users = dict(db.query(User.email, User.id).filter(User.email.in_(roles)).all())
+
+    result = TeamMembersBulkResult(not_found=sorted(set(roles) - set(users)))
+    if not users:
+        return result
+
+    # Only an upsert can change an existing member's role
+    if update_existing:
+        for email, user_id in users.items():
+            _check_own_role(current_user, user_id, roles[email])
+        _ensure_admin_remains(db, team_id, [
+            user_id for email, user_id in users.items() if roles[email] != UserRole.ADMIN
+        ])
+
+    statement = insert(TeamMember).values([
+        {"id": uuid.uuid4(), "team_id": team_id, "user_id": user_id, "role": roles[email]}
+        # Sorted so concurrent bulk adds lock membership rows in the same order
+        for email, user_id in sorted(users.items(), key=lambda item: str(item[1]))
+    ])
+    if update_existing:
+        statement = statement.on_conflict_do_update(
+            constraint="uq_team_member",
+            set_={"role": statement.excluded.role, "updated_at": func.now()}
+        )
+    else:
+        statement = statement.on_conflict_do_nothing(constraint="uq_team_member")
+    rows = db.execute(statement.returning(
+        TeamMember.user_id,
+        # xmax is 0 only for rows this statement inserted
+        literal_column("xmax = 0").label("inserted")
+    )).all()
+    db.commit()
+
+    # Cached roles for every affected user go in one step, on every worker
+    await team_role_cache.invalidate(team_id, [row.user_id for row in rows])
+
+    emails = {user_id: email for email, user_id in users.items()}
+    for row in rows:
+        (result.added if row.inserted else result.updated).append(emails[row.user_id])
+    result.added.sort()
+    result.updated.sort()
+    return result
+
+@router.get("/", response_model=List[TeamSummary])
+async def get_teams(
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get the user's teams with member and board counts"""
+
+    teams = db.query(Team.id, Team.name).join(
+        TeamMember, TeamMember.team_id == Team.id
+    ).filter(TeamMember.user_id == current_user.id).order_by(Team.name).all()
+
+    counts = _team_counts(db, [team.id for team in teams])
+    return [
+        TeamSummary(
+            id=team.id,
+            name=team.name,
+            member_count=counts[team.id][0],
+            board_count=counts[team.id][1]
+        )
+        for team in teams
+    ]
+
+@router.post("/", response_model=TeamSchema)
+async def create_team(
+    team_data: TeamCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Create a team with the current user as its admin"""
+
+    team = Team(**team_data.model_dump())
+    db.add(team)
+    db.flush()
+    db.add(TeamMember(team_id=team.id, user_id=current_user.id, role=UserRole.ADMIN))
+    db.commit()
+    db.refresh(team)
+
+    await team_role_cache.invalidate(team.id, [current_user.id])
+    return team
+
+@router.get("/{team_id}", response_model=TeamWithMembers)
+async def get_team(
+    team_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get a team with its members"""
+
+    require_team_role(db, team_id, current_user)
+
+    team = db.query(Team).filter(Team.id == team_id).first()
+    if not team:
+        raise HTTPException(status_code=404, detail="Team not found")
+
+    members = db.query(TeamMember).options(
+        joinedload(TeamMember.user)
+    ).filter(TeamMember.team_id == team_id).order_by(TeamMember.created_at).all()
+
+    member_count, board_count = _team_counts(db, [team_id])[team_id]
+    return TeamWithMembers(
+        **TeamSchema.model_validate(team).model_dump(),
+        members=[TeamMemberInfo.model_validate(member) for member in members],
+        member_count=member_count,
+        board_count=board_count
+    )
+
+@router.post("/{team_id}/members", response_model=TeamMembersBulkResult)
+async def add_team_member(
+    team_id: uuid.UUID,
+    member_data: TeamMemberAdd,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Add a member by email; existing members keep their role (change it with PUT)"""
+
+    require_team_role(db, team_id, current_user, UserRole.ADMIN)
+    result = await _upsert_members(
+        db, team_id, [member_data], current_user, update_existing=False
+    )
+    if not result.added and not result.not_found:
+        raise HTTPException(status_code=409, detail="Already a member of this team")
+    return result
+
+@router.post("/{team_id}/members/bulk", response_model=TeamMembersBulkResult)
+async def bulk_add_team_members(
+    team_id: uuid.UUID,
+    bulk_data: TeamMembersBulkAdd,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Add or update many members in one transaction; unknown emails are reported back"""
+
+    require_team_role(db, team_id, current_user, UserRole.ADMIN)
+    return await _upsert_members(db, team_id, bulk_data.members, current_user)
+
+@router.put("/{team_id}/members/{user_id}", response_model=TeamMemberInfo)
+async def update_team_member(
+    team_id: uuid.UUID,
+    user_id: uuid.UUID,
+    member_data: TeamMemberUpdate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Change a member's role"""
+
+    require_team_role(db, team_id, current_user, UserRole.ADMIN)
+    _check_own_role(current_user, user_id, member_data.role)
+
+    member = db.query(TeamMember).options(joinedload(TeamMember.user)).filter(
+        TeamMember.team_id == team_id,
+        TeamMember.user_id == user_id
+    ).first()
+    if not member:
+        raise HTTPException(status_code=404, detail="Member not found")
+
+    if member_data.role != UserRole.ADMIN:
+        _ensure_admin_remains(db, team_id, [user_id])
+
+    member.role = member_data.role
+    db.commit()
+    db.refresh(member)
+
+    await team_role_cache.invalidate(team_id, [user_id])
+    return member
+
+@router.delete("/{team_id}/members/{user_id}")
+async def remove_team_member(
+    team_id: uuid.UUID,
+    user_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Remove a member from a team"""
+
+    require_team_role(db, team_id, current_user, UserRole.ADMIN)
+    _ensure_admin_remains(db, team_id, [user_id])
+
+    deleted = db.query(TeamMember).filter(
+        TeamMember.team_id == team_id,
+        TeamMember.user_id == user_id
+    ).delete(synchronize_session=False)
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Member not found")
+    db.commit()
+
+    await team_role_cache.invalidate(team_id, [user_id])
+    return {"message": "Member removed successfully"}
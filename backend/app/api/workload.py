@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+import uuid
+
+from ..database import get_db
+from ..models import User, TeamMember, TaskStatus, WorkloadRollup
+from ..schemas import TeamWorkload, AssigneeWorkload, WorkloadCell
+from ..api.deps import get_current_active_user
+from ..services.workload_service import UNASSIGNED
+
+router = APIRouter()
+
+@router.get("/teams/{team_id}", response_model=TeamWorkload)
+async def get_team_workload(
+    team_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get task counts and estimated hours per assignee across a team's boards"""
+
+    membership = db.query(TeamMember).filter(
+        TeamMember.user_id == current_user.id,
+        TeamMember.team_id == team_id
+    ).first()
+
+    if not membership:
+        raise HTTPException(status_code=403, detail="Not a member of this team")
+
+    # Reads precomputed cells only: bounded by assignees x statuses x
+    # priorities, independent of how many tasks the team has
+    cells = db.query(WorkloadRollup).filter(
+        WorkloadRollup.team_id == team_id,
+        WorkloadRollup.task_count > 0
+    ).all()
+
+    assignees = {}
+    for cell in cells:
+        workload = assignees.setdefault(cell.assignee_id, AssigneeWorkload(
+            assignee_id=None if cell.assignee_id == UNASSIGNED else cell.assignee_id
+        ))
+        status_cell = workload.by_status.setdefault(cell.status, WorkloadCell())
+        status_cell.task_count += cell.task_count
+        status_cell.estimated_hours += cell.estimated_hours
+        if cell.status != TaskStatus.DONE:
+            workload.open_tasks += cell.task_count
+            workload.open_hours += cell.estimated_hours
+
+    return TeamWorkload(
+        team_id=team_id,
+        assignees=sorted(assignees.values(), key=lambda workload: -workload.open_hours)
+    )
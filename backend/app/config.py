@@ -10,6 +10,7 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    TOKEN_CACHE_SIZE: int = 10000  # Verified tokens kept per worker
     
     # Google OAuth
     GOOGLE_CLIENT_ID: str = ""
@@ -21,10 +22,64 @@ class Settings(BaseSettings):
     # File storage
     UPLOAD_DIR: str = "uploads"
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
+    DERIVATIVE_WORKERS: int = 2  # Processes rendering thumbnails and previews
     
     # Redis (for caching and websockets)
     REDIS_URL: str = "redis://localhost:6379"
     
+    # Activity log
+    ACTIVITY_MAINTENANCE_SECONDS: int = 3600
+    ACTIVITY_PARTITIONS_AHEAD: int = 2  # Monthly partitions created in advance
+    ACTIVITY_RETENTION_MONTHS: int = 12
+    ACTIVITY_ARCHIVE_SCHEMA: str = "archive"  # Empty string drops expired partitions instead
+    ACTIVITY_FEED_WINDOW_DAYS: int = 90  # Feeds only read partitions inside this window
+    
+    # Task archival
+    TASK_ARCHIVE_AFTER_DAYS: int = 30  # Done tasks untouched this long are archived
+    TASK_ARCHIVE_BATCH_SIZE: int = 1000
+    TASK_ARCHIVE_INTERVAL_SECONDS: int = 3600
+    
+    # Due-date reminders
+    REMINDER_LEAD_MINUTES: int = 60  # How long before due_date the assignee is reminded
+    REMINDER_HORIZON_HOURS: int = 24  # Only reminders this close are held in memory
+    REMINDER_LEADER_RETRY_SECONDS: int = 30
+    
+    # Rate limiting (requests per second and burst size)
+    RATE_LIMIT_BACKEND: str = "memory"  # "redis" shares buckets across workers
+    TASK_WRITE_RATE: float = 5.0  # Per user
+    TASK_WRITE_BURST: int = 20
+    BOARD_WRITE_RATE: float = 20.0  # Per board, across all its users
+    BOARD_WRITE_BURST: int = 60
+    WS_MESSAGE_RATE: float = 10.0  # Inbound messages per connection
+    WS_MESSAGE_BURST: int = 30
+    BROADCAST_COALESCE_MS: int = 100  # Task changes on a board are merged within this window
+    
+    # Board presence
+    PRESENCE_TTL_SECONDS: int = 30  # A viewer lapses if its worker stops refreshing it
+    PRESENCE_HEARTBEAT_SECONDS: int = 10
+    PRESENCE_BATCH_MS: int = 300  # Joins and leaves are sent as one diff per window
+    
+    # Idempotency keys
+    IDEMPOTENCY_TTL_SECONDS: int = 24 * 60 * 60  # How long a completed response is replayed
+    IDEMPOTENCY_LOCK_SECONDS: int = 60  # How long an in-flight request holds its key
+    
+    # Workload rollups
+    WORKLOAD_RECONCILE_SECONDS: int = 900
+    
+    # Team roles
+    TEAM_ROLE_CACHE_SECONDS: int = 30  # Backstop; changes are also pushed to every worker
+    TEAM_BULK_MAX_MEMBERS: int = 1000
+    
+    # Response compression
+    COMPRESSION_MIN_SIZE: int = 1000  # Smaller bodies are sent as-is
+    COMPRESSION_OFFLOAD_SIZE: int = 64 * 1024  # Larger bodies compress in the threadpool
+    BROTLI_QUALITY: int = 5
+    ZSTD_LEVEL: int = 3
+    GZIP_LEVEL: int = 6
+    
+    # Board columns
+    COLUMN_COUNT_RECONCILE_SECONDS: int = 900  # Repairs drift in WIP limit counters
+    
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,134 @@
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from jose import JWTError, jwt
+import redis.asyncio as redis
+
+from ..config import settings
+
+# Revocations are published here and kept, until the token expires, in a
+# sorted set scored by expiry so a (re)subscribing worker can catch up
+TOKEN_REVOCATION_CHANNEL = "token_revocations"
+REVOKED_TOKENS_KEY = "revoked_tokens"
+
+logger = logging.getLogger(__name__)
+
+class InvalidToken(Exception):
+    pass
+
+class TokenVerifier:
+    """Verifies JWTs once and serves repeat requests from a bounded LRU.
+
+    Entries expire with the token's own exp claim, so a cached token is never
+    accepted past the point jwt.decode would have rejected it. Tokens are
+    held by their SHA-256 digest. Logging out revokes a token on every
+    worker; revocations are kept in memory until the token would have
+    expired anyway.
+    """
+
+    def __init__(self, maxsize: int = settings.TOKEN_CACHE_SIZE, redis_url: str = settings.REDIS_URL):
+        self.maxsize = maxsize
+        self.redis = redis.from_url(redis_url)
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._revoked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        now = time.time()
+        digest = self.digest(token)
+        with self._lock:
+            if digest in self._revoked:
+                raise InvalidToken("Token has been revoked")
+            entry = self._cache.get(digest)
+            if entry is not None:
+                expires_at, claims = entry
+                if expires_at > now:
+                    self._cache.move_to_end(digest)
+                    return claims
+                del self._cache[digest]
+
+        try:
+            claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except JWTError as exc:
+            raise InvalidToken(str(exc))
+        if claims.get("sub") is None:
+            raise InvalidToken("Token has no subject")
+
+        # Tokens without exp are still re-verified periodically
+        expires_at = claims.get("exp", now + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+        with self._lock:
+            # A revocation may have arrived while the token was being decoded
+            if digest in self._revoked:
+                raise InvalidToken("Token has been revoked")
+            self._cache[digest] = (expires_at, claims)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return claims
+
+    def revoke(self, token: str) -> float:
+        """Reject the token in this worker; returns when the revocation can be forgotten"""
+
+        digest = self.digest(token)
+        with self._lock:
+            entry = self._cache.get(digest)
+        expires_at = entry[0] if entry else time.time() + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        self.discard(digest, expires_at)
+        return expires_at
+
+    def discard(self, digest: str, expires_at: float):
+        now = time.time()
+        with self._lock:
+            self._cache.pop(digest, None)
+            self._revoked[digest] = expires_at
+
+            # Expired tokens fail verification anyway; no need to remember them
+            self._revoked = {
+                revoked: until for revoked, until in self._revoked.items() if until > now
+            }
+
+    async def revoke_everywhere(self, token: str):
+        """Reject the token on every worker, e.g. on logout"""
+
+        expires_at = self.revoke(token)
+        digest = self.digest(token)
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.zadd(REVOKED_TOKENS_KEY, {digest: expires_at})
+                pipe.publish(TOKEN_REVOCATION_CHANNEL, json.dumps({"token": digest, "expires_at": expires_at}))
+                await pipe.execute()
+        except redis.RedisError:
+            logger.exception("Failed to publish token revocation")
+
+    async def listen(self):
+        """Apply revocations published by any worker, forever"""
+
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(TOKEN_REVOCATION_CHANNEL)
+                    # Catch up on revocations published while unsubscribed
+                    await self.redis.zremrangebyscore(REVOKED_TOKENS_KEY, "-inf", time.time())
+                    for digest, expires_at in await self.redis.zrange(REVOKED_TOKENS_KEY, 0, -1, withscores=True):
+                        self.discard(digest.decode(), expires_at)
+                    async for item in pubsub.listen():
+                        if item["type"] != "message":
+                            continue
+                        data = json.loads(item["data"])
+                        self.discard(data["token"], data["expires_at"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Token revocation listener failed, retrying")
+            await asyncio.sleep(5)
+
+token_verifier = TokenVerifier()
@@ -0,0 +1,33 @@
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, Tuple, TypeVar
+import threading
+
+T = TypeVar("T")
+
+class VersionedLRU(Generic[T]):
+    """Per-process LRU of values that are only valid for the version they were stored with.
+
+    The caller passes the current version, usually a counter read from a row
+    it already loads, so a value built before another worker's change is
+    never returned and no cross-worker invalidation is needed.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[int, T]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: int) -> Optional[T]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, version: int, value: T):
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
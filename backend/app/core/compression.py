@@ -0,0 +1,143 @@
+from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Dict, Optional
+import gzip
+
+import brotli
+import zstandard
+
+from ..config import settings
+
+# Server preference when the client rates encodings equally
+ENCODINGS = ("br", "zstd", "gzip")
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header"""
+
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                continue
+        weights[name.strip()] = weight
+
+    wildcard = weights.get("*", 0.0)
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, wildcard)
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+def compress(body: bytes, encoding: str) -> bytes:
+    # Mid-range levels: the top levels cost several times the CPU for a few
+    # percent on JSON
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.BROTLI_QUALITY, mode=brotli.MODE_TEXT)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=settings.ZSTD_LEVEL).compress(body)
+    return gzip.compress(body, compresslevel=settings.GZIP_LEVEL, mtime=0)
+
+async def compress_async(body: bytes, encoding: str) -> bytes:
+    """Compress small bodies inline and large ones in the threadpool"""
+
+    # All three codecs release the GIL while compressing
+    if len(body) >= settings.COMPRESSION_OFFLOAD_SIZE:
+        return await run_in_threadpool(compress, body, encoding)
+    return compress(body, encoding)
+
+def _compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+class CompressionMiddleware:
+    """Negotiates brotli, zstd or gzip for complete, compressible responses.
+
+    Replaces GZipMiddleware, which compressed on the event loop at level 9.
+    Streamed bodies (file downloads) and responses that already carry a
+    Content-Encoding, such as precompressed cached payloads, pass through.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = settings.COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        start: Optional[Message] = None
+
+        async def compressing_send(message: Message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or "content-encoding" in headers
+                or len(body) < self.minimum_size
+                or not _compressible(headers.get("content-type"))
+            ):
+                await send(start)
+                start = None
+                await send(message)
+                return
+
+            body = await compress_async(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            start = None
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, compressing_send)
+
+class CompressedPayload:
+    """A serialized JSON payload plus its compressed variants, each built once"""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.variants: Dict[str, bytes] = {}
+
+    async def encoded(self, encoding: Optional[str]) -> bytes:
+        if encoding is None:
+            return self.body
+        variant = self.variants.get(encoding)
+        if variant is None:
+            # Concurrent first requests may both compress; the result is identical
+            variant = self.variants[encoding] = await compress_async(self.body, encoding)
+        return variant
+
+    async def response(self, request: Request) -> Response:
+        encoding = None
+        if len(self.body) >= settings.COMPRESSION_MIN_SIZE:
+            encoding = negotiate(request.headers.get("accept-encoding", ""))
+
+        headers = {"Vary": "Accept-Encoding"}
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(
+            content=await self.encoded(encoding),
+            media_type="application/json",
+            headers=headers
+        )
@@ -0,0 +1,155 @@
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Tuple
+import base64
+import hashlib
+import json
+import logging
+
+import redis.asyncio as redis
+
+from ..config import settings
+from .auth import token_verifier, InvalidToken
+
+logger = logging.getLogger(__name__)
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+class IdempotencyMiddleware:
+    """Replays the stored response for retried writes carrying an Idempotency-Key.
+
+    Keys are scoped per user. The first request claims the key, and its 2xx
+    response is stored for IDEMPOTENCY_TTL_SECONDS. Retries get that response
+    back without reaching the endpoint, so the write and its WebSocket
+    broadcast happen once. A retry that arrives while the first request is
+    still running gets 409; reusing a key with a different request gets 422.
+    """
+
+    def __init__(self, app: ASGIApp, path_prefixes: Tuple[str, ...] = ("/api/tasks",)):
+        self.app = app
+        self.path_prefixes = path_prefixes
+        self.redis = redis.from_url(settings.REDIS_URL)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in WRITE_METHODS
+            or not scope["path"].startswith(self.path_prefixes)
+        ):
+            return await self.app(scope, receive, send)
+
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get("idempotency-key")
+        user_id = self._user_id(headers)
+        if not idempotency_key or user_id is None:
+            return await self.app(scope, receive, send)
+
+        body = await self._read_body(receive)
+        fingerprint = hashlib.sha256(
+            b"%s %s\n" % (scope["method"].encode(), scope["path"].encode()) + body
+        ).hexdigest()
+        redis_key = f"idempotency:{user_id}:{idempotency_key}"
+
+        try:
+            claimed = await self.redis.set(
+                redis_key,
+                json.dumps({"state": "in_flight", "fingerprint": fingerprint}),
+                nx=True,
+                ex=settings.IDEMPOTENCY_LOCK_SECONDS
+            )
+            stored = None if claimed else await self.redis.get(redis_key)
+        except redis.RedisError:
+            logger.exception("Idempotency store unavailable, processing request normally")
+            return await self.app(scope, self._replay_body(body, receive), send)
+
+        if stored is not None:
+            return await self._respond_from_store(json.loads(stored), fingerprint, send)
+
+        status, response_headers, chunks = None, [], []
+
+        async def capture(message: Message):
+            nonlocal status, response_headers
+            if message["type"] == "http.response.start":
+                # Copied: outer middleware such as CompressionMiddleware edits
+                # the list in place, and the stored body is the uncompressed one
+                status, response_headers = message["status"], list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, self._replay_body(body, receive), capture)
+        except Exception:
+            await self._release(redis_key)
+            raise
+
+        # Only successes are replayed; failures leave the key free for a real retry
+        if status is not None and 200 <= status < 300:
+            record = {
+                "state": "done",
+                "fingerprint": fingerprint,
+                "status": status,
+                "headers": [[name.decode("latin-1"), value.decode("latin-1")] for name, value in response_headers],
+                "body": base64.b64encode(b"".join(chunks)).decode(),
+            }
+            try:
+                await self.redis.set(redis_key, json.dumps(record), ex=settings.IDEMPOTENCY_TTL_SECONDS)
+            except redis.RedisError:
+                logger.exception("Failed to store idempotent response")
+        else:
+            await self._release(redis_key)
+
+    def _user_id(self, headers: Headers):
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return None
+        try:
+            return token_verifier.verify(token)["sub"]
+        except InvalidToken:
+            return None
+
+    async def _read_body(self, receive: Receive) -> bytes:
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body", False):
+                return body
+
+    def _replay_body(self, body: bytes, receive: Receive) -> Receive:
+        sent = False
+
+        async def replay() -> Message:
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        return replay
+
+    async def _release(self, redis_key: str):
+        try:
+            await self.redis.delete(redis_key)
+        except redis.RedisError:
+            logger.exception("Failed to release idempotency key")
+
+    async def _respond_from_store(self, record, fingerprint: str, send: Send):
+        if record["fingerprint"] != fingerprint:
+            return await self._send_json(send, 422, "Idempotency-Key was already used for a different request")
+        if record["state"] == "in_flight":
+            return await self._send_json(send, 409, "A request with this Idempotency-Key is still in progress")
+
+        headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in record["headers"]]
+        headers.append((b"idempotent-replayed", b"true"))
+        await send({"type": "http.response.start", "status": record["status"], "headers": headers})
+        await send({"type": "http.response.body", "body": base64.b64decode(record["body"])})
+
+    async def _send_json(self, send: Send, status: int, detail: str):
+        body = json.dumps({"detail": detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,147 @@
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from typing import Dict, Iterable, Optional, Tuple
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+
+import redis.asyncio as redis
+
+from ..config import settings
+from ..models import TeamMember, User, UserRole
+
+# Role hierarchy: admin > editor > viewer
+ROLE_RANK = {UserRole.VIEWER: 0, UserRole.EDITOR: 1, UserRole.ADMIN: 2}
+
+TEAM_ROLE_CHANNEL = "team_roles"
+
+logger = logging.getLogger(__name__)
+
+class TeamRoleCache:
+    """Per-process cache of (team_id, user_id) -> role, including non-members.
+
+    Membership writes publish the affected keys on Redis and every worker
+    drops them on receipt. While a worker is not subscribed, for instance
+    because Redis is down, it bypasses the cache, so a removed or demoted
+    member never keeps access longer than the pub/sub delivery takes.
+    """
+
+    MAX_ENTRIES = 100000
+
+    def __init__(self, redis_url: str, ttl: float = settings.TEAM_ROLE_CACHE_SECONDS):
+        self.redis = redis.from_url(redis_url)
+        self.ttl = ttl
+        self.listening = False
+        # Bumped by every invalidation, so a lookup that raced one isn't cached
+        self.generation = 0
+        self._entries: Dict[Tuple[uuid.UUID, uuid.UUID], Tuple[float, Optional[UserRole]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, team_id: uuid.UUID, user_id: uuid.UUID) -> Tuple[bool, Optional[UserRole]]:
+        if not self.listening:
+            return False, None
+        with self._lock:
+            entry = self._entries.get((team_id, user_id))
+        if entry is None or entry[0] <= time.monotonic():
+            return False, None
+        return True, entry[1]
+
+    def put(self, team_id: uuid.UUID, user_id: uuid.UUID, role: Optional[UserRole], generation: int):
+        now = time.monotonic()
+        with self._lock:
+            if generation != self.generation or not self.listening:
+                return
+            if len(self._entries) >= self.MAX_ENTRIES:
+                self._entries = {
+                    key: entry for key, entry in self._entries.items() if entry[0] > now
+                }
+            self._entries[(team_id, user_id)] = (now + self.ttl, role)
+
+    def discard(self, team_id: uuid.UUID, user_ids: Iterable[uuid.UUID]):
+        with self._lock:
+            self.generation += 1
+            for user_id in user_ids:
+                self._entries.pop((team_id, user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    async def invalidate(self, team_id: uuid.UUID, user_ids: Iterable[uuid.UUID]):
+        """Drop cached roles for these users on every worker; call after commit"""
+
+        user_ids = list(user_ids)
+        self.discard(team_id, user_ids)
+        try:
+            await self.redis.publish(TEAM_ROLE_CHANNEL, json.dumps({
+                "team_id": str(team_id),
+                "user_ids": [str(user_id) for user_id in user_ids]
+            }))
+        except redis.RedisError:
+            # Other workers' listeners have lost the connection as well and
+            # bypass their caches until they resubscribe
+            logger.exception("Failed to publish team role invalidation")
+
+    async def listen(self):
+        """Apply invalidations published by any worker, forever"""
+
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(TEAM_ROLE_CHANNEL)
+                    # Entries cached while unsubscribed may have missed messages
+                    self.clear()
+                    self.listening = True
+                    async for item in pubsub.listen():
+                        if item["type"] != "message":
+                            continue
+                        data = json.loads(item["data"])
+                        self.discard(
+                            uuid.UUID(data["team_id"]),
+                            [uuid.UUID(user_id) for user_id in data["user_ids"]]
+                        )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Team role listener failed, bypassing the cache until reconnected")
+            finally:
+                self.listening = False
+            await asyncio.sleep(5)
+
+team_role_cache = TeamRoleCache(settings.REDIS_URL)
+
+def get_team_role(db: Session, team_id: uuid.UUID, user_id: uuid.UUID) -> Optional[UserRole]:
+    """The user's role in a team, or None if they are not a member"""
+
+    hit, role = team_role_cache.get(team_id, user_id)
+    if not hit:
+        generation = team_role_cache.generation
+        role = db.query(TeamMember.role).filter(
+            TeamMember.user_id == user_id,
+            TeamMember.team_id == team_id
+        ).scalar()
+        team_role_cache.put(team_id, user_id, role, generation)
+    return role
+
+def require_team_role(
+    db: Session,
+    team_id: uuid.UUID,
+    user: User,
+    required_role: UserRole = UserRole.VIEWER
+) -> UserRole:
+    role = get_team_role(db, team_id, user.id)
+    if role is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not a member of this team"
+        )
+    if ROLE_RANK[role] < ROLE_RANK[required_role]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Insufficient permissions. Required: {required_role.value}"
+        )
+    return role
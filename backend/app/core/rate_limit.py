@@ -0,0 +1,126 @@
+from fastapi import Depends, HTTPException, status
+from typing import Dict
+import logging
+import math
+import threading
+import time
+
+import redis.asyncio as redis
+
+from ..config import settings
+from ..models import User
+from ..api.deps import get_current_active_user
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """Single-owner token bucket, e.g. for one WebSocket connection"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """Consume a token; return 0 if allowed, else seconds until one is available"""
+
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+class MemoryRateLimiter:
+    """Per-process buckets; limits are per worker"""
+
+    MAX_KEYS = 100000
+
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.MAX_KEYS:
+                    self._prune()
+                bucket = self._buckets[key] = TokenBucket(rate, burst)
+            return bucket.take()
+
+    def _prune(self):
+        # Buckets idle long enough to have refilled are equivalent to new ones
+        now = time.monotonic()
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items()
+            if now - bucket.updated < bucket.burst / bucket.rate
+        }
+
+# Refill and take atomically; returns the wait in seconds as a string
+# because Redis truncates Lua numbers to integers
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+class RedisRateLimiter:
+    """Buckets shared by all workers; requests are allowed while Redis is down"""
+
+    def __init__(self, redis_url: str):
+        self.redis = redis.from_url(redis_url)
+        self._script = self.redis.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        try:
+            wait = await self._script(keys=[f"ratelimit:{key}"], args=[rate, burst, time.time()])
+        except redis.RedisError:
+            logger.exception("Rate limit store unavailable, allowing request")
+            return 0.0
+        return float(wait)
+
+def _build_limiter():
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimiter(settings.REDIS_URL)
+    return MemoryRateLimiter()
+
+rate_limiter = _build_limiter()
+
+async def enforce_rate_limit(key: str, rate: float, burst: int):
+    """Raise 429 with Retry-After once the bucket for `key` is empty"""
+
+    wait = await rate_limiter.acquire(key, rate, burst)
+    if wait > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(math.ceil(wait))}
+        )
+
+async def enforce_board_write_limit(board_id):
+    await enforce_rate_limit(
+        f"board:{board_id}", settings.BOARD_WRITE_RATE, settings.BOARD_WRITE_BURST
+    )
+
+async def limit_task_writes(current_user: User = Depends(get_current_active_user)):
+    """Per-user limit for task write endpoints"""
+
+    await enforce_rate_limit(
+        f"user:{current_user.id}:task_write", settings.TASK_WRITE_RATE, settings.TASK_WRITE_BURST
+    )
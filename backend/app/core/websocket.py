@@ -0,0 +1,474 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import uuid
+
+from fastapi import WebSocket, WebSocketDisconnect
+from starlette.concurrency import run_in_threadpool
+import msgpack
+import redis.asyncio as redis
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models import Board, TeamMember
+from .auth import token_verifier, InvalidToken
+from .rate_limit import TokenBucket
+
+# Protocol 1 receives full task payloads on every change. Protocol 2 receives
+# JSON-patch style diffs of the changed fields only.
+PROTOCOL_FULL = 1
+PROTOCOL_PATCH = 2
+SUPPORTED_PROTOCOLS = (PROTOCOL_FULL, PROTOCOL_PATCH)
+SUPPORTED_ENCODINGS = ("json", "msgpack")
+
+PRESENCE_CHANNEL = "presence"
+
+logger = logging.getLogger(__name__)
+
+def task_patch(
+    after: Dict[str, Any],
+    before: Optional[Dict[str, Any]] = None,
+    fields: Optional[Iterable[str]] = None
+) -> List[Dict[str, Any]]:
+    """Build replace ops for the fields that differ between two task snapshots"""
+
+    keys = fields if fields is not None else (before or after).keys()
+    return [
+        {"op": "replace", "path": f"/{key}", "value": after.get(key)}
+        for key in keys
+        if before is None or before.get(key) != after.get(key)
+    ]
+
+def encode_message(message: Dict[str, Any], encoding: str):
+    if encoding == "msgpack":
+        return msgpack.packb(message, default=str)
+    return json.dumps(message, default=str)
+
+def decode_message(frame: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Decode a received frame, binary as msgpack and text as JSON.
+
+    Returns None for anything that doesn't decode to an object.
+    """
+
+    try:
+        if frame.get("bytes") is not None:
+            message = msgpack.unpackb(frame["bytes"])
+        else:
+            message = json.loads(frame.get("text") or "")
+    except (ValueError, TypeError):
+        return None
+    return message if isinstance(message, dict) else None
+
+def can_view_board(user_id: uuid.UUID, board_id: uuid.UUID) -> bool:
+    db = SessionLocal()
+    try:
+        return db.query(Board.id).join(
+            TeamMember, TeamMember.team_id == Board.team_id
+        ).filter(
+            Board.id == board_id,
+            TeamMember.user_id == user_id
+        ).first() is not None
+    finally:
+        db.close()
+
+class PresenceTracker:
+    """Who is viewing which board, shared across workers through Redis hashes.
+
+    Each worker owns the fields `{user_id}|{worker_id}` of `presence:{board_id}`,
+    valued with their expiry time, and refreshes them every heartbeat. Fields
+    left behind by a worker that died lapse after PRESENCE_TTL_SECONDS. Joins
+    and leaves only mark boards dirty; viewers get one diff per batch window.
+    """
+
+    def __init__(self, redis_url: str):
+        self.redis = redis.from_url(redis_url)
+        self.worker_id = uuid.uuid4().hex
+        # board_id -> users last sent to this worker's viewers
+        self.viewers: Dict[uuid.UUID, Set[uuid.UUID]] = {}
+        self.dirty: Set[uuid.UUID] = set()
+        self.departed: Set[Tuple[uuid.UUID, uuid.UUID]] = set()
+
+    def key(self, board_id: uuid.UUID) -> str:
+        return f"presence:{board_id}"
+
+    def field(self, user_id: uuid.UUID) -> str:
+        return f"{user_id}|{self.worker_id}"
+
+    def live_users(self, fields: Dict[bytes, bytes]) -> Tuple[Set[uuid.UUID], List[bytes]]:
+        """Split a presence hash into current users and lapsed fields"""
+
+        now = time.time()
+        users, expired = set(), []
+        for field, expires_at in fields.items():
+            if float(expires_at) > now:
+                users.add(uuid.UUID(field.decode().split("|")[0]))
+            else:
+                expired.append(field)
+        return users, expired
+
+    async def join(self, board_id: uuid.UUID, user_id: uuid.UUID) -> Set[uuid.UUID]:
+        """Register a viewer on this worker and return everyone on the board"""
+
+        self.departed.discard((board_id, user_id))
+        key = self.key(board_id)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hset(key, self.field(user_id), time.time() + settings.PRESENCE_TTL_SECONDS)
+            pipe.expire(key, settings.PRESENCE_TTL_SECONDS)
+            pipe.hgetall(key)
+            pipe.publish(PRESENCE_CHANNEL, str(board_id))
+            fields = (await pipe.execute())[2]
+        return self.live_users(fields)[0]
+
+    def leave(self, board_id: uuid.UUID, user_id: uuid.UUID):
+        """Queue a viewer's removal; applied on the next flush"""
+
+        self.departed.add((board_id, user_id))
+
+    async def heartbeat(self, local: Dict[uuid.UUID, Set[uuid.UUID]]):
+        """Extend this worker's fields for the users it still serves"""
+
+        expires_at = time.time() + settings.PRESENCE_TTL_SECONDS
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for board_id, user_ids in local.items():
+                key = self.key(board_id)
+                pipe.hset(key, mapping={self.field(user_id): expires_at for user_id in user_ids})
+                pipe.expire(key, settings.PRESENCE_TTL_SECONDS)
+            await pipe.execute()
+        # Re-read every watched board so fields lapsed elsewhere show up as leaves
+        self.dirty.update(local)
+
+    async def collect(self, local: Dict[uuid.UUID, Set[uuid.UUID]]) -> Dict[uuid.UUID, Tuple[Set[uuid.UUID], Set[uuid.UUID]]]:
+        """Apply queued leaves and return (joined, left) for each dirty board watched here"""
+
+        departed, self.departed = self.departed, set()
+        dirty, self.dirty = self.dirty, set()
+        # Boards nobody here watches any more need no diff
+        for board_id in set(self.viewers) - set(local):
+            del self.viewers[board_id]
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for board_id, user_id in departed:
+                # Another socket of the same user may still be viewing the board
+                if user_id in local.get(board_id, ()):
+                    continue
+                pipe.hdel(self.key(board_id), self.field(user_id))
+                pipe.publish(PRESENCE_CHANNEL, str(board_id))
+                dirty.add(board_id)
+            boards = [board_id for board_id in dirty if board_id in local]
+            for board_id in boards:
+                pipe.hgetall(self.key(board_id))
+            results = await pipe.execute()
+
+        diffs, lapsed = {}, {}
+        for board_id, fields in zip(boards, results[len(results) - len(boards):]):
+            users, expired = self.live_users(fields)
+            if expired:
+                lapsed[board_id] = expired
+            previous = self.viewers.get(board_id, set())
+            self.viewers[board_id] = users
+            if users != previous:
+                diffs[board_id] = (users - previous, previous - users)
+
+        if lapsed:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for board_id, fields in lapsed.items():
+                    pipe.hdel(self.key(board_id), *fields)
+                await pipe.execute()
+        return diffs
+
+class Client:
+    def __init__(self, websocket: WebSocket, user_id: uuid.UUID, protocol: int, encoding: str):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.protocol = protocol
+        self.encoding = encoding
+        self.inbound = TokenBucket(settings.WS_MESSAGE_RATE, settings.WS_MESSAGE_BURST)
+        self.boards: Set[uuid.UUID] = set()
+
+    async def send(self, frame):
+        if isinstance(frame, bytes):
+            await self.websocket.send_bytes(frame)
+        else:
+            await self.websocket.send_text(frame)
+
+class ConnectionManager:
+    def __init__(self):
+        self.clients: Set[Client] = set()
+        self.user_clients: Dict[uuid.UUID, Set[Client]] = {}
+        self.board_subscribers: Dict[uuid.UUID, Set[Client]] = {}
+        self.presence = PresenceTracker(settings.REDIS_URL)
+        self.coalesce_window = settings.BROADCAST_COALESCE_MS / 1000
+        # board_id -> task_id -> latest coalesced change, flushed once per window
+        self._pending: Dict[uuid.UUID, Dict[str, Dict[str, Any]]] = {}
+        self._flushers: Dict[uuid.UUID, asyncio.Task] = {}
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        token: str,
+        protocol: int = PROTOCOL_FULL,
+        encoding: str = "json"
+    ):
+        """Authenticate, negotiate the protocol and serve the socket until it closes"""
+
+        try:
+            user_id = uuid.UUID(token_verifier.verify(token)["sub"])
+        except (InvalidToken, ValueError):
+            await websocket.close(code=1008)
+            return
+
+        # Unknown versions fall back to full payloads so old clients keep working
+        if protocol not in SUPPORTED_PROTOCOLS:
+            protocol = PROTOCOL_FULL
+        if encoding not in SUPPORTED_ENCODINGS:
+            encoding = "json"
+
+        # permessage-deflate is negotiated by the server during the handshake
+        # whenever the client offers it, on top of either encoding
+        await websocket.accept()
+        client = Client(websocket, user_id, protocol, encoding)
+        self.clients.add(client)
+        self.user_clients.setdefault(user_id, set()).add(client)
+
+        try:
+            await client.send(encode_message(
+                {"type": "hello", "protocol": protocol, "encoding": encoding},
+                encoding
+            ))
+            while True:
+                frame = await websocket.receive()
+                if frame["type"] == "websocket.disconnect":
+                    break
+                message = decode_message(frame)
+                if message is None:
+                    continue
+
+                # Over-limit messages are dropped rather than queued
+                wait = client.inbound.take()
+                if wait > 0:
+                    await client.send(encode_message(
+                        {"type": "rate_limited", "retry_after": wait},
+                        client.encoding
+                    ))
+                    continue
+                await self.handle_message(client, message)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            self.disconnect(client)
+
+    def disconnect(self, client: Client):
+        for board_id in list(client.boards):
+            self.unsubscribe(client, board_id)
+        self.clients.discard(client)
+        user_clients = self.user_clients.get(client.user_id)
+        if user_clients is not None:
+            user_clients.discard(client)
+            if not user_clients:
+                del self.user_clients[client.user_id]
+
+    async def handle_message(self, client: Client, message: Dict[str, Any]):
+        message_type = message.get("type")
+        if message_type == "ping":
+            await client.send(encode_message({"type": "pong"}, client.encoding))
+            return
+        if message_type not in ("subscribe_board", "unsubscribe_board"):
+            return
+
+        try:
+            board_id = uuid.UUID(str(message.get("board_id")))
+        except ValueError:
+            await client.send(encode_message(
+                {"type": "error", "message": "Invalid board_id"},
+                client.encoding
+            ))
+            return
+
+        if message_type == "subscribe_board":
+            await self.subscribe(client, board_id)
+        else:
+            self.unsubscribe(client, board_id)
+
+    async def subscribe(self, client: Client, board_id: uuid.UUID):
+        """Start sending a board's events to a client and announce it to other viewers"""
+
+        if board_id in client.boards:
+            return
+        if not await run_in_threadpool(can_view_board, client.user_id, board_id):
+            await client.send(encode_message(
+                {"type": "error", "message": "Not a member of this board's team"},
+                client.encoding
+            ))
+            return
+        # The socket may have closed while membership was checked
+        if client not in self.clients:
+            return
+
+        client.boards.add(board_id)
+        self.board_subscribers.setdefault(board_id, set()).add(client)
+        try:
+            users = await self.presence.join(board_id, client.user_id)
+        except redis.RedisError:
+            logger.exception("Presence store unavailable, reporting local viewers only")
+            users = {subscriber.user_id for subscriber in self.board_subscribers[board_id]}
+        # The first local viewer starts from this snapshot instead of a diff of everyone
+        self.presence.viewers.setdefault(board_id, set(users))
+
+        await client.send(encode_message(
+            {"type": "subscribed", "board_id": board_id, "users": sorted(map(str, users))},
+            client.encoding
+        ))
+
+    def unsubscribe(self, client: Client, board_id: uuid.UUID):
+        client.boards.discard(board_id)
+        subscribers = self.board_subscribers.get(board_id)
+        if subscribers is None:
+            return
+        subscribers.discard(client)
+        if not subscribers:
+            del self.board_subscribers[board_id]
+        self.presence.leave(board_id, client.user_id)
+
+    def board_clients(self, board_id: uuid.UUID) -> Set[Client]:
+        # Copied because a failed send unsubscribes the client mid fan-out
+        return set(self.board_subscribers.get(board_id, ()))
+
+    def _local_viewers(self) -> Dict[uuid.UUID, Set[uuid.UUID]]:
+        return {
+            board_id: {client.user_id for client in subscribers}
+            for board_id, subscribers in self.board_subscribers.items()
+        }
+
+    async def run_presence(self):
+        """Refresh heartbeats, listen for other workers and send batched presence diffs, forever"""
+
+        await asyncio.gather(self._listen_presence(), self._batch_presence())
+
+    async def _listen_presence(self):
+        while True:
+            try:
+                async with self.presence.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(PRESENCE_CHANNEL)
+                    async for item in pubsub.listen():
+                        if item["type"] != "message":
+                            continue
+                        board_id = uuid.UUID(item["data"].decode())
+                        if board_id in self.board_subscribers:
+                            self.presence.dirty.add(board_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Presence listener failed, reconnecting")
+                await asyncio.sleep(5)
+
+    async def _batch_presence(self):
+        next_heartbeat = 0.0
+        while True:
+            await asyncio.sleep(settings.PRESENCE_BATCH_MS / 1000)
+            try:
+                if time.monotonic() >= next_heartbeat:
+                    next_heartbeat = time.monotonic() + settings.PRESENCE_HEARTBEAT_SECONDS
+                    await self.presence.heartbeat(self._local_viewers())
+                diffs = await self.presence.collect(self._local_viewers())
+            except redis.RedisError:
+                logger.exception("Presence update failed")
+                continue
+
+            for board_id, (joined, left) in diffs.items():
+                message = {
+                    "type": "presence_diff",
+                    "board_id": board_id,
+                    "joined": sorted(map(str, joined)),
+                    "left": sorted(map(str, left)),
+                }
+                await self._fan_out(self.board_clients(board_id), lambda protocol: [message])
+
+    async def _fan_out(self, clients: Iterable[Client], messages_for):
+        # Encode once per (protocol, encoding) pair rather than once per socket
+        frames = {}
+        for client in clients:
+            key = (client.protocol, client.encoding)
+            if key not in frames:
+                frames[key] = [
+                    encode_message(message, client.encoding)
+                    for message in messages_for(client.protocol)
+                ]
+            try:
+                for frame in frames[key]:
+                    await client.send(frame)
+            except Exception:
+                self.disconnect(client)
+
+    async def send_to_user(self, user_id: uuid.UUID, message: Dict[str, Any]):
+        """Send a message to every socket this worker holds for a user"""
+
+        await self._fan_out(set(self.user_clients.get(user_id, ())), lambda protocol: [message])
+
+    async def broadcast_to_board(self, board_id: uuid.UUID, message: Dict[str, Any]):
+        """Send the same message to every client watching a board"""
+
+        # Coalesced changes were made earlier, so they must go out first
+        flusher = self._flushers.pop(board_id, None)
+        if flusher is not None:
+            flusher.cancel()
+        await self._flush_board(board_id)
+
+        await self._fan_out(self.board_clients(board_id), lambda protocol: [message])
+
+    async def broadcast_task_change(
+        self,
+        board_id: uuid.UUID,
+        event_type: str,
+        task: Dict[str, Any],
+        patch: List[Dict[str, Any]]
+    ):
+        """Send the full task to protocol 1 clients and only the patch to protocol 2 clients.
+
+        Changes are held for the coalescing window: repeated changes to a task
+        collapse into its latest state and merged patch, and protocol 2
+        clients get every task changed in the window as one event.
+        """
+
+        pending = self._pending.setdefault(board_id, {})
+        change = pending.setdefault(task["id"], {"patch": {}})
+        change["event"] = event_type
+        change["task"] = task
+        change["patch"].update((op["path"], op) for op in patch)
+
+        if self.coalesce_window <= 0:
+            await self._flush_board(board_id)
+        elif board_id not in self._flushers:
+            self._flushers[board_id] = asyncio.create_task(self._flush_later(board_id))
+
+    async def _flush_later(self, board_id: uuid.UUID):
+        await asyncio.sleep(self.coalesce_window)
+        self._flushers.pop(board_id, None)
+        await self._flush_board(board_id)
+
+    async def _flush_board(self, board_id: uuid.UUID):
+        changes = list(self._pending.pop(board_id, {}).values())
+        if not changes:
+            return
+
+        full = [{"type": change["event"], "task": change["task"]} for change in changes]
+        compact = [
+            {
+                "type": "task_patch",
+                "event": change["event"],
+                "task_id": change["task"]["id"],
+                "version": change["task"].get("version"),
+                "patch": list(change["patch"].values())
+            }
+            for change in changes
+        ]
+        if len(compact) > 1:
+            compact = [{"type": "task_patch_batch", "events": compact}]
+
+        await self._fan_out(
+            self.board_clients(board_id),
+            lambda protocol: compact if protocol == PROTOCOL_PATCH else full
+        )
+
+websocket_manager = ConnectionManager()
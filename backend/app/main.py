@@ -1,13 +1,26 @@
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+import asyncio
 import uvicorn
 
 from .database import engine, get_db
 from .models import Base
-from .api import auth, users, boards, tasks, teams, sprints
+from .api import auth, users, boards, tasks, teams, sprints, activity, archive, dependencies, workload, attachments, search
 from .core.websocket import websocket_manager
+from .core.idempotency import IdempotencyMiddleware
+from .core.compression import CompressionMiddleware
+from .core.auth import token_verifier
+from .core.permissions import team_role_cache
+from .services.activity_service import maintain_partitions
+from .services.archive_service import archive_job
+from .services.attachment_service import derivative_pipeline
+from .services.notification_service import notification_service
+from .services.reminder_service import reminder_scheduler
+from .services.workload_service import reconcile_job
+from .services.board_service import column_count_job
+from .utils.helpers import run_periodically
 from .config import settings
 
 # Create database tables
@@ -29,12 +42,42 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+app.add_middleware(IdempotencyMiddleware, path_prefixes=("/api/tasks",))
+app.add_middleware(CompressionMiddleware)
+
+# Background jobs
+@app.on_event("startup")
+async def start_background_jobs():
+    # Partitions must exist before the first task event is written
+    await run_in_threadpool(maintain_partitions)
+    await derivative_pipeline.resume()
+    app.state.background_jobs = [
+        asyncio.create_task(run_periodically(settings.ACTIVITY_MAINTENANCE_SECONDS, maintain_partitions)),
+        asyncio.create_task(run_periodically(settings.TASK_ARCHIVE_INTERVAL_SECONDS, archive_job)),
+        asyncio.create_task(notification_service.listen()),
+        asyncio.create_task(team_role_cache.listen()),
+        asyncio.create_task(token_verifier.listen()),
+        asyncio.create_task(websocket_manager.run_presence()),
+        asyncio.create_task(reminder_scheduler.run()),
+        asyncio.create_task(run_periodically(settings.WORKLOAD_RECONCILE_SECONDS, reconcile_job)),
+        asyncio.create_task(run_periodically(settings.COLUMN_COUNT_RECONCILE_SECONDS, column_count_job)),
+    ]
+
+@app.on_event("shutdown")
+async def stop_background_jobs():
+    for job in app.state.background_jobs:
+        job.cancel()
+    derivative_pipeline.shutdown()
 
 # WebSocket endpoint
 @app.websocket("/ws/{token}")
-async def websocket_endpoint(websocket, token: str):
-    await websocket_manager.connect(websocket, token)
+async def websocket_endpoint(
+    websocket: WebSocket,
+    token: str,
+    protocol: int = 1,
+    encoding: str = "json"
+):
+    await websocket_manager.connect(websocket, token, protocol, encoding)
 
 # API Routes
 app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
@@ -43,6 +86,12 @@ app.include_router(teams.router, prefix="/api/teams", tags=["teams"])
 app.include_router(boards.router, prefix="/api/boards", tags=["boards"])
 app.include_router(tasks.router, prefix="/api/tasks", tags=["tasks"])
 app.include_router(sprints.router, prefix="/api/sprints", tags=["sprints"])
+app.include_router(activity.router, prefix="/api/activity", tags=["activity"])
+app.include_router(archive.router, prefix="/api/archive", tags=["archive"])
+app.include_router(dependencies.router, prefix="/api/dependencies", tags=["dependencies"])
+app.include_router(workload.router, prefix="/api/workload", tags=["workload"])
+app.include_router(attachments.router, prefix="/api/attachments", tags=["attachments"])
+app.include_router(search.router, prefix="/api/search", tags=["search"])
 
 @app.get("/api/health")
 async def health_check():
@@ -3,17 +3,25 @@ from .user import User, UserRole
 from .team import Team, TeamMember
 from .board import Board
 from .task import Task, TaskStatus, TaskPriority, TaskType
+from .archived_task import ArchivedTask, ArchivedTaskDependency
+from .task_dependency import TaskDependency
+from .workload import WorkloadRollup
+from .column_count import BoardColumnCount
+from .graph_version import BoardGraphVersion
 from .sprint import Sprint
 from .comment import Comment
-from .attachment import Attachment
+from .attachment import Attachment, DerivativeStatus
+from .task_event import TaskEvent
 
 __all__ = [
     "Base",
     "User", "UserRole",
     "Team", "TeamMember", 
     "Board",
-    "Task", "TaskStatus", "TaskPriority", "TaskType",
+    "Task", "TaskStatus", "TaskPriority", "TaskType", "ArchivedTask",
+    "TaskDependency", "ArchivedTaskDependency", "WorkloadRollup", "BoardColumnCount", "BoardGraphVersion",
     "Sprint",
     "Comment",
-    "Attachment"
+    "Attachment", "DerivativeStatus",
+    "TaskEvent"
 ]
\ No newline at end of file
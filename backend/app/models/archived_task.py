@@ -0,0 +1,50 @@
+from sqlalchemy import Column, DateTime, Index, Table, func
+from sqlalchemy.orm import relationship
+from .base import Base
+from .task import Task
+from .task_dependency import TaskDependency
+
+# Same columns as tasks, minus constraints, so rows move with a plain
+# INSERT ... SELECT. Keeping archived rows out of tasks keeps the hot table
+# and its (board_id, column_id) ranges small.
+archived_tasks = Table(
+    "archived_tasks",
+    Base.metadata,
+    *[
+        Column(column.name, column.type.copy(), primary_key=column.primary_key)
+        for column in Task.__table__.columns
+    ],
+    Column("archived_at", DateTime(timezone=True), nullable=False, server_default=func.now()),
+)
+
+class ArchivedTask(Base):
+    __table__ = archived_tasks
+    
+    # Comments and attachments stay in place while a task is archived
+    comments = relationship(
+        "Comment",
+        primaryjoin="ArchivedTask.id == foreign(Comment.task_id)",
+        viewonly=True
+    )
+    attachments = relationship(
+        "Attachment",
+        primaryjoin="ArchivedTask.id == foreign(Attachment.task_id)",
+        order_by="Attachment.created_at",
+        viewonly=True
+    )
+
+# Dependency edges of archived tasks, moved here before the archive cascades
+# them away and moved back once both of their tasks are live again
+archived_task_dependencies = Table(
+    "archived_task_dependencies",
+    Base.metadata,
+    *[
+        Column(column.name, column.type.copy(), primary_key=column.primary_key)
+        for column in TaskDependency.__table__.columns
+    ],
+    Index("ix_archived_task_dependencies_blocker", "blocker_id"),
+    Index("ix_archived_task_dependencies_blocked", "blocked_id"),
+)
+
+class ArchivedTaskDependency(Base):
+    __table__ = archived_task_dependencies
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, String, Integer, ForeignKey, Enum
+from sqlalchemy.orm import relationship
+from .base import Base, TimestampMixin
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+import enum
+
+class DerivativeStatus(str, enum.Enum):
+    PENDING = "pending"
+    READY = "ready"
+    FAILED = "failed"
+    UNSUPPORTED = "unsupported"
+
+class Attachment(Base, TimestampMixin):
+    __tablename__ = "attachments"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    filename = Column(String, nullable=False)
+    content_type = Column(String, nullable=False)
+    size = Column(Integer, nullable=False)
+
+    # Files are stored once per sha256 under UPLOAD_DIR, along with their
+    # thumbnails and previews (see services/attachment_service.py)
+    content_hash = Column(String(64), nullable=False, index=True)
+    derivative_status = Column(Enum(DerivativeStatus), nullable=False, default=DerivativeStatus.PENDING)
+
+    # References. task_id has no foreign key, like comments, so attachments
+    # stay in place while their task is archived
+    task_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    uploader_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+
+    # Relationships
+    task = relationship(
+        "Task",
+        primaryjoin="foreign(Attachment.task_id) == Task.id",
+        back_populates="attachments"
+    )
+    uploader = relationship("User")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, JSON
+from sqlalchemy import Column, String, Integer, ForeignKey, JSON, event
 from sqlalchemy.orm import relationship
 from .base import Base, TimestampMixin
 from sqlalchemy.dialects.postgresql import UUID
@@ -12,14 +12,22 @@ class Board(Base, TimestampMixin):
     description = Column(String)
     team_id = Column(UUID(as_uuid=True), ForeignKey("teams.id"), nullable=False)
     
-    # Board configuration
+    # Board configuration. Each column may also carry "status" (the task
+    # status it implies) and "wip_limit"; see services/board_service.py
     columns = Column(JSON, default=lambda: [
-        {"id": "todo", "name": "To Do", "order": 0},
-        {"id": "in_progress", "name": "In Progress", "order": 1},
-        {"id": "review", "name": "Review", "order": 2},
-        {"id": "done", "name": "Done", "order": 3}
+        {"id": "todo", "name": "To Do", "order": 0, "status": "todo"},
+        {"id": "in_progress", "name": "In Progress", "order": 1, "status": "in_progress"},
+        {"id": "review", "name": "Review", "order": 2, "status": "review"},
+        {"id": "done", "name": "Done", "order": 3, "status": "done"}
     ])
     
+    # Bumped whenever columns is assigned; compiled column indexes are keyed on it
+    columns_version = Column(Integer, nullable=False, default=0, server_default="0")
+    
     # Relationships
     team = relationship("Team", back_populates="boards")
     tasks = relationship("Task", back_populates="board")
+
+@event.listens_for(Board.columns, "set")
+def _bump_columns_version(target, value, oldvalue, initiator):
+    target.columns_version = (target.columns_version or 0) + 1
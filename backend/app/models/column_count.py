@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, Integer
+from .base import Base
+from sqlalchemy.dialects.postgresql import UUID
+
+class BoardColumnCount(Base):
+    """Number of tasks in each board column, used to enforce WIP limits.
+    
+    Maintained incrementally by the task write paths and periodically
+    reconciled against tasks (see services/board_service.py).
+    """
+    __tablename__ = "board_column_counts"
+    
+    board_id = Column(UUID(as_uuid=True), primary_key=True)
+    column_id = Column(String, primary_key=True)
+    
+    task_count = Column(Integer, nullable=False, default=0)
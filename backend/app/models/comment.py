@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Text, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Text, ForeignKey, Computed, Index
+from sqlalchemy.orm import relationship, deferred
 from .base import Base, TimestampMixin
-from sqlalchemy.dialects.postgresql import UUID
+from .task import SEARCH_CONFIG
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 import uuid
 
 class Comment(Base, TimestampMixin):
@@ -10,10 +11,24 @@ class Comment(Base, TimestampMixin):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     content = Column(Text, nullable=False)
     
-    # References
-    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id"), nullable=False)
+    # References. task_id has no foreign key because archived tasks move to
+    # archived_tasks and keep their comments (see services/archive_service.py)
+    task_id = Column(UUID(as_uuid=True), nullable=False, index=True)
     author_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(f"to_tsvector('{SEARCH_CONFIG}', content)", persisted=True)
+    ))
+    
     # Relationships
-    task = relationship("Task", back_populates="comments")
-    author = relationship("User", back_populates="comments")
\ No newline at end of file
+    task = relationship(
+        "Task",
+        primaryjoin="foreign(Comment.task_id) == Task.id",
+        back_populates="comments"
+    )
+    author = relationship("User", back_populates="comments")
+    
+    __table_args__ = (
+        Index("ix_comments_search_vector", "search_vector", postgresql_using="gin"),
+    )
\ No newline at end of file
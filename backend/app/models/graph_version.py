@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer
+from .base import Base
+from sqlalchemy.dialects.postgresql import UUID
+
+class BoardGraphVersion(Base):
+    """Version of a board's dependency graph; cached critical paths are keyed on it.
+    
+    Kept out of the boards row so the bump, which every task write that
+    affects the graph makes, doesn't lock the board itself until commit.
+    Boards without a row are at version 0.
+    """
+    __tablename__ = "board_graph_versions"
+    
+    board_id = Column(UUID(as_uuid=True), primary_key=True)
+    
+    version = Column(Integer, nullable=False, default=0)
@@ -1,10 +1,13 @@
-from sqlalchemy import Column, String, Text, Integer, ForeignKey, Enum, DateTime, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Text, Integer, ForeignKey, Enum, DateTime, Boolean, DDL, Index, event
+from sqlalchemy.orm import relationship, deferred
 from .base import Base, TimestampMixin
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, TSVECTOR
 import uuid
 import enum
 
+# Text search configuration for task and comment search vectors
+SEARCH_CONFIG = "english"
+
 class TaskStatus(str, enum.Enum):
     TODO = "todo"
     IN_PROGRESS = "in_progress"
@@ -43,7 +46,7 @@ class Task(Base, TimestampMixin):
     sprint_id = Column(UUID(as_uuid=True), ForeignKey("sprints.id"))
     
     # Task details
-    due_date = Column(DateTime(timezone=True))
+    due_date = Column(DateTime(timezone=True), index=True)
     estimated_hours = Column(Integer)
     actual_hours = Column(Integer)
     tags = Column(ARRAY(String), default=list)
@@ -52,15 +55,53 @@ class Task(Base, TimestampMixin):
     column_id = Column(String, default="todo")
     position = Column(Integer, default=0)
     
+    # Optimistic concurrency: every UPDATE is issued as WHERE version = :v
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    
     # Hierarchy
     parent_task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id"))
     
+    # Full-text search, maintained by the tasks_search_vector trigger below.
+    # Deferred so regular task loads never read it.
+    search_vector = deferred(Column(TSVECTOR))
+    
     # Relationships
     assignee = relationship("User", foreign_keys=[assignee_id], back_populates="assigned_tasks")
     creator = relationship("User", foreign_keys=[creator_id], back_populates="created_tasks")
     board = relationship("Board", back_populates="tasks")
     sprint = relationship("Sprint", back_populates="tasks")
-    parent_task = relationship("Task", remote_side=[id])
-    subtasks = relationship("Task")
-    comments = relationship("Comment", back_populates="task")
-    attachments = relationship("Attachment", back_populates="task")
\ No newline at end of file
+    parent_task = relationship("Task", remote_side=[id], back_populates="subtasks")
+    subtasks = relationship("Task", back_populates="parent_task")
+    comments = relationship(
+        "Comment",
+        primaryjoin="Task.id == foreign(Comment.task_id)",
+        back_populates="task"
+    )
+    attachments = relationship(
+        "Attachment",
+        primaryjoin="Task.id == foreign(Attachment.task_id)",
+        back_populates="task"
+    )
+    
+    __table_args__ = (
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+    )
+    __mapper_args__ = {"version_id_col": version}
+
+# A trigger rather than a generated column because array_to_string is not
+# immutable. Only writes touching the searched columns re-index a row.
+event.listen(Task.__table__, "after_create", DDL(f"""
+CREATE OR REPLACE FUNCTION tasks_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(array_to_string(NEW.tags, ' '), '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER tasks_search_vector
+    BEFORE INSERT OR UPDATE OF title, description, tags ON tasks
+    FOR EACH ROW EXECUTE FUNCTION tasks_search_vector_update();
+"""))
\ No newline at end of file
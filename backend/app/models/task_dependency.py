@@ -0,0 +1,22 @@
+from sqlalchemy import Column, ForeignKey, UniqueConstraint
+from .base import Base, TimestampMixin
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+class TaskDependency(Base, TimestampMixin):
+    """Edge blocker -> blocked: the blocked task cannot finish before the blocker"""
+    __tablename__ = "task_dependencies"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    
+    # Edges go away with either task; archiving copies them out first
+    blocker_id = Column(
+        UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False
+    )
+    blocked_id = Column(
+        UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    
+    __table_args__ = (
+        UniqueConstraint("blocker_id", "blocked_id", name="uq_task_dependency_edge"),
+    )
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, String, DateTime, JSON, Index
+from .base import Base
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+class TaskEvent(Base):
+    """Append-only task activity, range-partitioned by month on occurred_at.
+    
+    Rows are never updated. Monthly partitions are created ahead of time and
+    detached once they fall out of retention (see services/activity_service.py).
+    """
+    __tablename__ = "task_events"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    occurred_at = Column(DateTime(timezone=True), primary_key=True)
+    
+    # No foreign keys: events outlive the tasks they describe
+    task_id = Column(UUID(as_uuid=True), nullable=False)
+    board_id = Column(UUID(as_uuid=True), nullable=False)
+    actor_id = Column(UUID(as_uuid=True))
+    
+    event_type = Column(String, nullable=False)  # created, updated, moved, deleted
+    changes = Column(JSON)  # {field: [old, new]}
+    
+    __table_args__ = (
+        Index("ix_task_events_task_occurred", "task_id", "occurred_at"),
+        Index("ix_task_events_board_occurred", "board_id", "occurred_at"),
+        {"postgresql_partition_by": "RANGE (occurred_at)"},
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, Enum
+from sqlalchemy import Column, String, ForeignKey, Enum, UniqueConstraint
 from sqlalchemy.orm import relationship
 from .base import Base, TimestampMixin
 from .user import UserRole
@@ -26,4 +26,9 @@ class TeamMember(Base, TimestampMixin):
     
     # Relationships
     user = relationship("User", back_populates="team_memberships")
-    team = relationship("Team", back_populates="members")
\ No newline at end of file
+    team = relationship("Team", back_populates="members")
+    
+    # Also the conflict target for bulk membership upserts
+    __table_args__ = (
+        UniqueConstraint("team_id", "user_id", name="uq_team_member"),
+    )
\ No newline at end of file
@@ -21,7 +21,7 @@ class User(Base, TimestampMixin):
     is_active = Column(Boolean, default=True)
     
     # Relationships
-    assigned_tasks = relationship("Task", back_populates="assignee")
+    assigned_tasks = relationship("Task", foreign_keys="Task.assignee_id", back_populates="assignee")
     created_tasks = relationship("Task", foreign_keys="Task.creator_id", back_populates="creator")
     team_memberships = relationship("TeamMember", back_populates="user")
     comments = relationship("Comment", back_populates="author")
\ No newline at end of file
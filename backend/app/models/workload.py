@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, Enum
+from .base import Base
+from .task import TaskStatus, TaskPriority
+from sqlalchemy.dialects.postgresql import UUID
+
+class WorkloadRollup(Base):
+    """Task counts and estimated hours per team, assignee, status and priority.
+    
+    Maintained incrementally by the task write paths and periodically
+    reconciled against tasks (see services/workload_service.py). Unassigned
+    tasks are counted under the all-zero UUID so the key stays a primary key.
+    """
+    __tablename__ = "workload_rollups"
+    
+    team_id = Column(UUID(as_uuid=True), primary_key=True)
+    assignee_id = Column(UUID(as_uuid=True), primary_key=True)
+    status = Column(Enum(TaskStatus), primary_key=True)
+    priority = Column(Enum(TaskPriority), primary_key=True)
+    
+    task_count = Column(Integer, nullable=False, default=0)
+    estimated_hours = Column(Integer, nullable=False, default=0)
@@ -1,15 +1,33 @@
 from .user import User, UserCreate, UserUpdate, UserWithTeams
-from .team import Team, TeamCreate, TeamUpdate, TeamWithMembers, TeamMemberAdd, TeamMemberUpdate
+from .team import (
+    Team, TeamCreate, TeamUpdate, TeamWithMembers, TeamMemberAdd, TeamMemberUpdate,
+    TeamMemberInfo, TeamSummary, TeamMembersBulkAdd, TeamMembersBulkResult
+)
 from .board import Board, BoardCreate, BoardUpdate, BoardWithTasks, BoardSummary
-from .task import Task, TaskCreate, TaskUpdate, TaskMove, TaskWithDetails, TaskSummary
+from .task import (
+    Task, TaskCreate, TaskUpdate, TaskMove, TaskWithDetails, TaskSummary,
+    ArchivedTask, ArchivedTaskWithComments
+)
 from .sprint import Sprint, SprintCreate, SprintUpdate, SprintWithTasks
 from .comment import Comment, CommentCreate, CommentUpdate, CommentWithAuthor
+from .attachment import Attachment
+from .task_event import TaskEvent, ActivityPage
+from .task_dependency import TaskDependency, TaskDependencyCreate, CriticalPath
+from .workload import WorkloadCell, AssigneeWorkload, TeamWorkload
+from .search import SearchHit, SearchPage
 
 __all__ = [
     "User", "UserCreate", "UserUpdate", "UserWithTeams",
     "Team", "TeamCreate", "TeamUpdate", "TeamWithMembers", "TeamMemberAdd", "TeamMemberUpdate",
+    "TeamMemberInfo", "TeamSummary", "TeamMembersBulkAdd", "TeamMembersBulkResult",
     "Board", "BoardCreate", "BoardUpdate", "BoardWithTasks", "BoardSummary",
     "Task", "TaskCreate", "TaskUpdate", "TaskMove", "TaskWithDetails", "TaskSummary",
+    "ArchivedTask", "ArchivedTaskWithComments",
     "Sprint", "SprintCreate", "SprintUpdate", "SprintWithTasks",
-    "Comment", "CommentCreate", "CommentUpdate", "CommentWithAuthor"
+    "Comment", "CommentCreate", "CommentUpdate", "CommentWithAuthor",
+    "Attachment",
+    "TaskEvent", "ActivityPage",
+    "TaskDependency", "TaskDependencyCreate", "CriticalPath",
+    "WorkloadCell", "AssigneeWorkload", "TeamWorkload",
+    "SearchHit", "SearchPage"
 ]
\ No newline at end of file
@@ -0,0 +1,16 @@
+from typing import List
+import uuid
+from .base import TimestampSchema
+from ..models.attachment import DerivativeStatus
+
+class AttachmentInDB(TimestampSchema):
+    id: uuid.UUID
+    filename: str
+    content_type: str
+    size: int
+    task_id: uuid.UUID
+    uploader_id: uuid.UUID
+    derivative_status: DerivativeStatus
+
+class Attachment(AttachmentInDB):
+    derivatives: List[str] = []  # Names servable from /derivatives/{name}
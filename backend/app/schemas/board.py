@@ -3,11 +3,14 @@ from typing import List, Dict, Any, Optional
 import uuid
 from .base import BaseSchema, TimestampSchema
 from .task import TaskWithDetails
+from ..models.task import TaskStatus
 
 class BoardColumn(BaseSchema):
     id: str
     name: str
     order: int
+    status: Optional[TaskStatus] = None  # Status given to tasks moved here
+    wip_limit: Optional[int] = Field(None, ge=1)
 
 class BoardBase(BaseSchema):
     name: str = Field(..., min_length=1, max_length=255)
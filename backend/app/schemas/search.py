@@ -0,0 +1,17 @@
+from typing import List, Optional
+import uuid
+from .base import BaseSchema
+from .task import TaskSummary
+
+class SearchHit(BaseSchema):
+    task: TaskSummary
+    board_id: uuid.UUID
+    rank: float
+    # Fragments with matches wrapped in <mark></mark>; the rest is raw user text
+    title_highlight: str
+    description_highlight: Optional[str] = None
+    comment_highlight: Optional[str] = None
+
+class SearchPage(BaseSchema):
+    hits: List[SearchHit] = []
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= for the next page
@@ -4,6 +4,8 @@ from datetime import datetime
 import uuid
 from .base import BaseSchema, TimestampSchema
 from .user import User
+from .comment import Comment
+from .attachment import Attachment
 from ..models.task import TaskStatus, TaskPriority, TaskType
 
 class TaskBase(BaseSchema):
@@ -35,11 +37,13 @@ class TaskUpdate(BaseSchema):
     column_id: Optional[str] = None
     position: Optional[int] = None
     sprint_id: Optional[uuid.UUID] = None
+    version: Optional[int] = None  # Expected version; 409 if the task changed since
 
 class TaskMove(BaseSchema):
     column_id: str
     position: int
     board_id: Optional[uuid.UUID] = None  # For moving between boards
+    version: Optional[int] = None  # Expected version; 409 if the task changed since
 
 class TaskInDB(TaskBase, TimestampSchema):
     id: uuid.UUID
@@ -52,6 +56,7 @@ class TaskInDB(TaskBase, TimestampSchema):
     position: int
     parent_task_id: Optional[uuid.UUID] = None
     actual_hours: Optional[int] = None
+    version: int = 1
 
 class Task(TaskInDB):
     pass
@@ -70,3 +75,12 @@ class TaskSummary(BaseSchema):
     priority: TaskPriority
     assignee_id: Optional[uuid.UUID] = None
     due_date: Optional[datetime] = None
+
+TaskWithDetails.model_rebuild()
+
+class ArchivedTask(TaskInDB):
+    archived_at: datetime
+
+class ArchivedTaskWithComments(ArchivedTask):
+    comments: List[Comment] = []
+    attachments: List[Attachment] = []
@@ -0,0 +1,18 @@
+from typing import Dict, List, Optional
+import uuid
+from .base import BaseSchema, TimestampSchema
+
+class TaskDependencyCreate(BaseSchema):
+    blocker_id: uuid.UUID
+    blocked_id: uuid.UUID
+
+class TaskDependency(TaskDependencyCreate, TimestampSchema):
+    id: uuid.UUID
+
+class CriticalPath(BaseSchema):
+    board_id: uuid.UUID
+    sprint_id: Optional[uuid.UUID] = None
+    graph_version: int
+    total_hours: int = 0  # Earliest finish of the whole board, in estimated hours
+    critical_path: List[uuid.UUID] = []
+    earliest_finish: Dict[uuid.UUID, int] = {}
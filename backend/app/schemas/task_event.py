@@ -0,0 +1,17 @@
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+import uuid
+from .base import BaseSchema
+
+class TaskEvent(BaseSchema):
+    id: uuid.UUID
+    occurred_at: datetime
+    task_id: uuid.UUID
+    board_id: uuid.UUID
+    actor_id: Optional[uuid.UUID] = None
+    event_type: str
+    changes: Optional[Dict[str, Any]] = None
+
+class ActivityPage(BaseSchema):
+    events: List[TaskEvent] = []
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= for the next page
@@ -1,6 +1,8 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, AliasChoices
 from typing import List, Optional
+from datetime import datetime
 import uuid
+from ..config import settings
 from .base import BaseSchema, TimestampSchema
 from .user import User, UserRole
 
@@ -19,6 +21,14 @@ class TeamMemberAdd(BaseSchema):
     user_email: str
     role: UserRole = UserRole.EDITOR
 
+class TeamMembersBulkAdd(BaseSchema):
+    members: List[TeamMemberAdd] = Field(..., min_length=1, max_length=settings.TEAM_BULK_MAX_MEMBERS)
+
+class TeamMembersBulkResult(BaseSchema):
+    added: List[str] = []
+    updated: List[str] = []
+    not_found: List[str] = []  # Emails without an account
+
 class TeamMemberUpdate(BaseSchema):
     role: UserRole
 
@@ -26,7 +36,7 @@ class TeamMemberInfo(BaseSchema):
     id: uuid.UUID
     user: User
     role: UserRole
-    joined_at: datetime
+    joined_at: datetime = Field(validation_alias=AliasChoices("joined_at", "created_at"))
 
 class TeamInDB(TeamBase, TimestampSchema):
     id: uuid.UUID
@@ -37,6 +47,7 @@ class Team(TeamInDB):
 class TeamWithMembers(Team):
     members: List[TeamMemberInfo] = []
     member_count: int = 0
+    board_count: int = 0
 
 class TeamSummary(BaseSchema):
     id: uuid.UUID
@@ -0,0 +1,18 @@
+from typing import Dict, List, Optional
+import uuid
+from .base import BaseSchema
+from ..models.task import TaskStatus
+
+class WorkloadCell(BaseSchema):
+    task_count: int = 0
+    estimated_hours: int = 0
+
+class AssigneeWorkload(BaseSchema):
+    assignee_id: Optional[uuid.UUID] = None  # None for unassigned tasks
+    open_tasks: int = 0
+    open_hours: int = 0
+    by_status: Dict[TaskStatus, WorkloadCell] = {}
+
+class TeamWorkload(BaseSchema):
+    team_id: uuid.UUID
+    assignees: List[AssigneeWorkload] = []
@@ -0,0 +1,106 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import insert, text
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import logging
+import uuid
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models import TaskEvent
+
+logger = logging.getLogger(__name__)
+
+# Snapshot keys that change on every write and carry no activity information
+IGNORED_FIELDS = {"updated_at", "version"}
+
+def diff_changes(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """Map each changed field to its [old, new] pair"""
+    return {
+        key: [before.get(key), after.get(key)]
+        for key in before
+        if key not in IGNORED_FIELDS and before.get(key) != after.get(key)
+    }
+
+def month_start(moment: datetime, offset: int = 0) -> datetime:
+    month_index = moment.year * 12 + moment.month - 1 + offset
+    return datetime(month_index // 12, month_index % 12 + 1, 1, tzinfo=timezone.utc)
+
+def partition_name(start: datetime) -> str:
+    return f"{TaskEvent.__tablename__}_{start:%Y_%m}"
+
+def ensure_partitions(db: Session, months_ahead: int = settings.ACTIVITY_PARTITIONS_AHEAD):
+    """Create the current month's partition and the next few"""
+
+    now = datetime.now(timezone.utc)
+    for offset in range(months_ahead + 1):
+        start, end = month_start(now, offset), month_start(now, offset + 1)
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {partition_name(start)} "
+            f"PARTITION OF {TaskEvent.__tablename__} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+    db.commit()
+
+def archive_expired_partitions(
+    db: Session,
+    retention_months: int = settings.ACTIVITY_RETENTION_MONTHS,
+    archive_schema: str = settings.ACTIVITY_ARCHIVE_SCHEMA
+) -> List[str]:
+    """Detach partitions older than the retention window and archive or drop them"""
+
+    cutoff = partition_name(month_start(datetime.now(timezone.utc), -retention_months))
+    partitions = db.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+        "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+        "WHERE parent.relname = :parent"
+    ), {"parent": TaskEvent.__tablename__}).scalars().all()
+
+    # Names are zero-padded task_events_YYYY_MM, so they sort chronologically
+    expired = sorted(name for name in partitions if name < cutoff)
+    for name in expired:
+        db.execute(text(f"ALTER TABLE {TaskEvent.__tablename__} DETACH PARTITION {name}"))
+        if archive_schema:
+            db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {archive_schema}"))
+            db.execute(text(f"ALTER TABLE {name} SET SCHEMA {archive_schema}"))
+        else:
+            db.execute(text(f"DROP TABLE {name}"))
+    db.commit()
+    return expired
+
+def maintain_partitions():
+    """Periodic job: keep partitions created ahead and expire old ones"""
+
+    db = SessionLocal()
+    try:
+        ensure_partitions(db)
+        expired = archive_expired_partitions(db)
+        if expired:
+            logger.info("Archived task event partitions: %s", ", ".join(expired))
+    finally:
+        db.close()
+
+def record_activity(
+    db: Session,
+    task_id: uuid.UUID,
+    board_id: uuid.UUID,
+    actor_id: Optional[uuid.UUID],
+    event_type: str,
+    changes: Optional[Dict[str, Any]] = None
+):
+    """Append a task event in the caller's transaction.
+
+    One INSERT into the current partition, committed or rolled back
+    together with the write it describes.
+    """
+
+    db.execute(insert(TaskEvent).values(
+        id=uuid.uuid4(),
+        occurred_at=datetime.now(timezone.utc),
+        task_id=task_id,
+        board_id=board_id,
+        actor_id=actor_id,
+        event_type=event_type,
+        changes=changes
+    ))
@@ -0,0 +1,189 @@
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import delete, exists, func, insert, or_, select
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException
+from typing import Optional
+import logging
+import uuid
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models import Task, TaskStatus, ArchivedTask, ArchivedTaskDependency, TaskDependency, Sprint, Board
+from .workload_service import (
+    apply_workload_change,
+    collect_deltas,
+    record_deltas,
+    task_snapshot,
+    workload_snapshot
+)
+from .board_service import column_index, release_column_counts, shift_column_count
+from .graph_service import bump_graph_version, creates_cycle, linked_board_ids, lock_team_graph
+from .activity_service import record_activity
+
+logger = logging.getLogger(__name__)
+
+TASK_COLUMNS = [column.name for column in Task.__table__.columns]
+EDGE_COLUMNS = [column.name for column in TaskDependency.__table__.columns]
+
+def archive_done_tasks(
+    db: Session,
+    older_than_days: int = settings.TASK_ARCHIVE_AFTER_DAYS,
+    batch_size: int = settings.TASK_ARCHIVE_BATCH_SIZE
+) -> int:
+    """Move one batch of stale done tasks into archived_tasks in a single statement"""
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    child = aliased(Task)
+
+    # Parents wait until their subtasks have left the table, which keeps
+    # tasks.parent_task_id valid; they are picked up on a later run. Rows
+    # locked by a concurrent edit are skipped until the next run as well
+    task_ids = db.execute(
+        select(Task.id).where(
+            Task.status == TaskStatus.DONE,
+            func.coalesce(Task.updated_at, Task.created_at) < cutoff,
+            ~exists().where(child.parent_task_id == Task.id)
+        ).limit(batch_size).with_for_update(of=Task, skip_locked=True)
+    ).scalars().all()
+    if not task_ids:
+        db.commit()
+        return 0
+
+    # Read and set aside before the move cascades the tasks' edges away
+    linked_boards = linked_board_ids(db, task_ids)
+    edges = TaskDependency.__table__.c
+    db.execute(insert(ArchivedTaskDependency.__table__).from_select(
+        EDGE_COLUMNS,
+        select(*[edges[name] for name in EDGE_COLUMNS]).where(
+            or_(edges.blocker_id.in_(task_ids), edges.blocked_id.in_(task_ids))
+        )
+    ))
+
+    moved = delete(Task.__table__).where(
+        Task.__table__.c.id.in_(task_ids)
+    ).returning(*Task.__table__.columns).cte("moved")
+
+    archived = ArchivedTask.__table__.c
+    rows = db.execute(
+        insert(ArchivedTask.__table__).from_select(
+            TASK_COLUMNS,
+            select(*[moved.c[name] for name in TASK_COLUMNS])
+        ).returning(
+            archived.board_id,
+            archived.column_id,
+            archived.assignee_id,
+            archived.status,
+            archived.priority,
+            archived.estimated_hours
+        )
+    ).all()
+
+    # Archived tasks leave the counters in the same transaction
+    teams = dict(db.query(Board.id, Board.team_id).filter(
+        Board.id.in_({row.board_id for row in rows})
+    ).all())
+    release_column_counts(db, [(row.board_id, row.column_id) for row in rows])
+    record_deltas(db, collect_deltas(removed=[
+        workload_snapshot(
+            teams[row.board_id], row.assignee_id, row.status, row.priority, row.estimated_hours
+        )
+        for row in rows
+    ]))
+    bump_graph_version(db, *teams, *linked_boards)
+
+    db.commit()
+    return len(rows)
+
+def restore_task(db: Session, task_id: uuid.UUID, actor_id: Optional[uuid.UUID] = None) -> Task:
+    """Move an archived task back onto the end of its board column"""
+
+    archived = db.query(ArchivedTask).filter(ArchivedTask.id == task_id).first()
+    if not archived:
+        raise HTTPException(status_code=404, detail="Archived task not found")
+
+    values = {name: getattr(archived, name) for name in TASK_COLUMNS}
+
+    # References may have gone away while the task was archived
+    if values["parent_task_id"] and not db.query(
+        exists().where(Task.id == values["parent_task_id"])
+    ).scalar():
+        values["parent_task_id"] = None
+    if values["sprint_id"] and not db.query(
+        exists().where(Sprint.id == values["sprint_id"])
+    ).scalar():
+        values["sprint_id"] = None
+
+    # The column may have been removed from the board in the meantime. WIP
+    # limits are not enforced: restoring must not fail because a column filled up
+    board = db.query(Board).filter(Board.id == archived.board_id).first()
+    index = column_index(board)
+    if archived.column_id not in index.columns and index.first:
+        values["column_id"] = index.first.id
+    values["position"] = shift_column_count(db, after=(board.id, values["column_id"])) - 1
+
+    task = Task(**values)
+    db.delete(archived)
+    db.add(task)
+    db.flush()
+
+    restore_dependencies(db, task.id, board.team_id)
+    apply_workload_change(db, after=task_snapshot(task, board.team_id))
+    record_activity(db, task.id, board.id, actor_id, "restored")
+    bump_graph_version(db, board.id, *linked_board_ids(db, [task.id]))
+    db.commit()
+    db.refresh(task)
+    return task
+
+def restore_dependencies(db: Session, task_id: uuid.UUID, team_id: uuid.UUID) -> int:
+    """Move a restored task's archived edges back where the other task is live.
+
+    Edges to tasks that are still archived wait for those to be restored.
+    Edges to deleted tasks, or that would now close a cycle, are dropped.
+    Returns the number of edges restored.
+    """
+
+    edges = db.query(ArchivedTaskDependency).filter(or_(
+        ArchivedTaskDependency.blocker_id == task_id,
+        ArchivedTaskDependency.blocked_id == task_id
+    )).all()
+    if not edges:
+        return 0
+
+    others = {
+        edge.blocked_id if edge.blocker_id == task_id else edge.blocker_id
+        for edge in edges
+    }
+    live = set(db.execute(select(Task.id).where(Task.id.in_(others))).scalars())
+    archived = set(db.execute(
+        select(ArchivedTask.id).where(ArchivedTask.id.in_(others - live))
+    ).scalars())
+
+    lock_team_graph(db, team_id)
+    restored = 0
+    for edge in edges:
+        other = edge.blocked_id if edge.blocker_id == task_id else edge.blocker_id
+        if other in archived:
+            continue
+        if other in live and not creates_cycle(db, edge.blocker_id, edge.blocked_id):
+            db.add(TaskDependency(**{name: getattr(edge, name) for name in EDGE_COLUMNS}))
+            # Later cycle checks must see this edge
+            db.flush()
+            restored += 1
+        db.delete(edge)
+    return restored
+
+def archive_job():
+    """Periodic job: archive stale done tasks until a batch comes back short"""
+
+    db = SessionLocal()
+    try:
+        total = 0
+        while True:
+            archived = archive_done_tasks(db)
+            total += archived
+            if archived < settings.TASK_ARCHIVE_BATCH_SIZE:
+                break
+        if total:
+            logger.info("Archived %d done tasks", total)
+    finally:
+        db.close()
@@ -0,0 +1,188 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+from typing import BinaryIO, Dict, List, Tuple
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import tempfile
+
+from PIL import Image, ImageOps
+import pypdfium2
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models import Attachment, DerivativeStatus
+
+logger = logging.getLogger(__name__)
+
+# Largest first: each derivative is downscaled from the previous one
+DERIVATIVE_SIZES = {
+    "preview": (1024, 1024),
+    "thumbnail": (256, 256),
+}
+IMAGE_TYPES = {"image/png", "image/jpeg", "image/gif", "image/webp", "image/bmp"}
+PDF_TYPES = {"application/pdf"}
+
+def original_path(content_hash: str) -> str:
+    return os.path.join(settings.UPLOAD_DIR, "originals", content_hash[:2], content_hash)
+
+def derivative_path(content_hash: str, name: str) -> str:
+    return os.path.join(settings.UPLOAD_DIR, "derivatives", content_hash[:2], f"{content_hash}_{name}.webp")
+
+def supports_derivatives(content_type: str) -> bool:
+    return content_type in IMAGE_TYPES or content_type in PDF_TYPES
+
+def available_derivatives(attachment: Attachment) -> List[str]:
+    """Names servable from /derivatives/{name} for this attachment"""
+    if attachment.derivative_status == DerivativeStatus.READY:
+        return list(DERIVATIVE_SIZES)
+    return []
+
+def has_derivatives(content_hash: str) -> bool:
+    return all(os.path.exists(derivative_path(content_hash, name)) for name in DERIVATIVE_SIZES)
+
+def store_upload(file: BinaryIO) -> Tuple[str, int]:
+    """Stream an upload into content-addressed storage; blocking, run in the threadpool"""
+
+    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    with tempfile.NamedTemporaryFile(dir=settings.UPLOAD_DIR, delete=False) as temp:
+        try:
+            while chunk := file.read(1024 * 1024):
+                size += len(chunk)
+                if size > settings.MAX_FILE_SIZE:
+                    raise HTTPException(status_code=413, detail="File too large")
+                digest.update(chunk)
+                temp.write(chunk)
+        except BaseException:
+            temp.close()
+            os.remove(temp.name)
+            raise
+
+    content_hash = digest.hexdigest()
+    path = original_path(content_hash)
+    if os.path.exists(path):
+        # Same bytes uploaded before; reuse that copy and its derivatives
+        os.remove(temp.name)
+    else:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(temp.name, path)
+    return content_hash, size
+
+def render_derivatives(content_hash: str, content_type: str):
+    """Write every derivative of one stored file; runs in a worker process"""
+
+    source = original_path(content_hash)
+    if content_type in PDF_TYPES:
+        pdf = pypdfium2.PdfDocument(source)
+        try:
+            image = pdf[0].render(scale=2).to_pil()
+        finally:
+            pdf.close()
+    else:
+        image = Image.open(source)
+        # Lets JPEG decode at reduced size instead of full resolution
+        image.draft("RGB", max(DERIVATIVE_SIZES.values()))
+        image = ImageOps.exif_transpose(image)
+
+    image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+    for name, size in DERIVATIVE_SIZES.items():
+        image.thumbnail(size)
+        path = derivative_path(content_hash, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        image.save(temp_path, "WEBP", quality=80)
+        os.replace(temp_path, path)
+
+def set_derivative_status(content_hash: str, status: DerivativeStatus):
+    """Resolve every pending attachment sharing this content"""
+
+    db = SessionLocal()
+    try:
+        db.query(Attachment).filter(
+            Attachment.content_hash == content_hash,
+            Attachment.derivative_status == DerivativeStatus.PENDING
+        ).update({Attachment.derivative_status: status}, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+def _lower_priority():
+    # Rendering yields the CPU to API workers whenever they need it
+    os.nice(10)
+
+class DerivativePipeline:
+    """Renders thumbnails and previews in a process pool.
+
+    Decoding and resizing never run in the request or on the event loop, and
+    the pool's processes run at lower priority than the API workers. Each
+    content hash is rendered at most once at a time; attachments that share
+    it are resolved together.
+    """
+
+    def __init__(self, workers: int = settings.DERIVATIVE_WORKERS):
+        self.workers = workers
+        self._pool = None
+        self._jobs: Dict[str, asyncio.Task] = {}
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: workers must not inherit the event loop, threads or DB connections
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_lower_priority
+            )
+        return self._pool
+
+    def submit(self, content_hash: str, content_type: str):
+        if content_hash not in self._jobs:
+            self._jobs[content_hash] = asyncio.create_task(self._process(content_hash, content_type))
+
+    async def _process(self, content_hash: str, content_type: str):
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                self._executor(), render_derivatives, content_hash, content_type
+            )
+            status = DerivativeStatus.READY
+        except BrokenProcessPool:
+            # A worker died (e.g. on a malformed file); start a fresh pool next time
+            logger.exception("Derivative worker crashed on %s", content_hash)
+            self._pool = None
+            status = DerivativeStatus.FAILED
+        except Exception:
+            logger.exception("Failed to render derivatives for %s", content_hash)
+            status = DerivativeStatus.FAILED
+
+        # Release the hash before writing the status: an upload committed
+        # before the write is resolved by it, and one committed after finds
+        # no job and submits its own instead of staying pending
+        self._jobs.pop(content_hash, None)
+        await run_in_threadpool(set_derivative_status, content_hash, status)
+
+    async def resume(self):
+        """Queue attachments left pending by a previous run"""
+
+        def pending():
+            db = SessionLocal()
+            try:
+                return db.query(Attachment.content_hash, Attachment.content_type).filter(
+                    Attachment.derivative_status == DerivativeStatus.PENDING
+                ).distinct().all()
+            finally:
+                db.close()
+
+        for content_hash, content_type in await run_in_threadpool(pending):
+            self.submit(content_hash, content_type)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+derivative_pipeline = DerivativePipeline()
@@ -0,0 +1,178 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, select
+from sqlalchemy.dialects.postgresql import insert
+from fastapi import HTTPException
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import logging
+import uuid
+
+from ..database import SessionLocal
+from ..models import Board, Task, TaskStatus, BoardColumnCount
+from ..core.cache import VersionedLRU
+
+logger = logging.getLogger(__name__)
+
+ColumnKey = Tuple[uuid.UUID, str]
+
+class ColumnSpec(NamedTuple):
+    id: str
+    name: str
+    order: int
+    status: Optional[TaskStatus]
+    wip_limit: Optional[int]
+
+class ColumnIndex:
+    """A board's columns compiled once from the Board.columns JSON"""
+
+    def __init__(self, board: Board):
+        self.board_id = board.id
+        self.version = board.columns_version
+        self.columns: Dict[str, ColumnSpec] = {}
+        for column in sorted(board.columns or [], key=lambda column: column.get("order", 0)):
+            status = column.get("status")
+            # Boards created before columns carried a status keep the old
+            # behaviour: a column named after a status implies it
+            if status is None and column["id"] in TaskStatus._value2member_map_:
+                status = column["id"]
+            self.columns[column["id"]] = ColumnSpec(
+                id=column["id"],
+                name=column.get("name", column["id"]),
+                order=column.get("order", 0),
+                status=TaskStatus(status) if status else None,
+                wip_limit=column.get("wip_limit")
+            )
+
+    @property
+    def first(self) -> Optional[ColumnSpec]:
+        return next(iter(self.columns.values()), None)
+
+    def column(self, column_id: str) -> ColumnSpec:
+        spec = self.columns.get(column_id)
+        if spec is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown column '{column_id}' for this board"
+            )
+        return spec
+
+# Compiled column indexes keyed by board, valid for one columns version
+column_index_cache: VersionedLRU[ColumnIndex] = VersionedLRU(maxsize=1024)
+
+def column_index(board: Board) -> ColumnIndex:
+    # Another worker may have changed the columns; the version on the board
+    # row we already loaded tells us, so no extra query is needed
+    index = column_index_cache.get(board.id, board.columns_version)
+    if index is None:
+        index = ColumnIndex(board)
+        column_index_cache.put(board.id, board.columns_version, index)
+    return index
+
+def _claim(db: Session, key: ColumnKey, wip_limit: Optional[int]) -> int:
+    statement = insert(BoardColumnCount).values(board_id=key[0], column_id=key[1], task_count=1)
+    statement = statement.on_conflict_do_update(
+        index_elements=["board_id", "column_id"],
+        set_={"task_count": BoardColumnCount.task_count + 1},
+        where=BoardColumnCount.task_count < wip_limit if wip_limit else None
+    ).returning(BoardColumnCount.task_count)
+
+    count = db.execute(statement).scalar()
+    if count is None:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Column '{key[1]}' is at its WIP limit of {wip_limit}"
+        )
+    return count
+
+def _release(db: Session, key: ColumnKey, count: int = 1):
+    db.query(BoardColumnCount).filter(
+        BoardColumnCount.board_id == key[0],
+        BoardColumnCount.column_id == key[1]
+    ).update(
+        {BoardColumnCount.task_count: func.greatest(BoardColumnCount.task_count - count, 0)},
+        synchronize_session=False
+    )
+
+def shift_column_count(
+    db: Session,
+    before: Optional[ColumnKey] = None,
+    after: Optional[ColumnKey] = None,
+    wip_limit: Optional[int] = None
+) -> Optional[int]:
+    """Move one task between column counters; takes effect on commit.
+
+    Entering `after` is a single conditional upsert that fails with 409 once
+    the column holds `wip_limit` tasks. Returns the new count of `after`.
+    """
+
+    if before == after:
+        return None
+
+    count = None
+    # Sorted so concurrent moves lock counter rows in the same order
+    for key in sorted((key for key in (before, after) if key), key=str):
+        if key == after:
+            count = _claim(db, key, wip_limit)
+        else:
+            _release(db, key)
+    return count
+
+def release_column_counts(db: Session, keys: List[ColumnKey]):
+    """Remove many tasks from their column counters, one UPDATE per column"""
+
+    deltas: Dict[ColumnKey, int] = {}
+    for key in keys:
+        deltas[key] = deltas.get(key, 0) + 1
+    for key in sorted(deltas, key=str):
+        _release(db, key, deltas[key])
+
+def reconcile_column_counts(db: Session) -> int:
+    """Repair column counters that drifted from the tasks they count.
+
+    Tasks and counters are compared in one statement, so both come from the
+    same snapshot: a write is either fully in it or fully outside. The
+    differences are then added to the counters rather than written over
+    them, which leaves increments committed in the meantime intact.
+    """
+
+    actual = select(
+        Task.board_id, Task.column_id, func.count(Task.id).label("task_count")
+    ).group_by(Task.board_id, Task.column_id).subquery()
+    stored = select(
+        BoardColumnCount.board_id, BoardColumnCount.column_id, BoardColumnCount.task_count
+    ).subquery()
+
+    delta = func.coalesce(actual.c.task_count, 0) - func.coalesce(stored.c.task_count, 0)
+    drifted = db.execute(select(
+        func.coalesce(actual.c.board_id, stored.c.board_id),
+        func.coalesce(actual.c.column_id, stored.c.column_id),
+        delta
+    ).select_from(actual.outerjoin(
+        stored,
+        and_(stored.c.board_id == actual.c.board_id, stored.c.column_id == actual.c.column_id),
+        full=True
+    )).where(delta != 0)).all()
+
+    if drifted:
+        statement = insert(BoardColumnCount).values([
+            {"board_id": board_id, "column_id": column_id, "task_count": count}
+            # Sorted like shift_column_count so the two lock rows in the same order
+            for board_id, column_id, count in sorted(drifted, key=lambda row: str(tuple(row[:2])))
+        ])
+        db.execute(statement.on_conflict_do_update(
+            index_elements=["board_id", "column_id"],
+            set_={"task_count": BoardColumnCount.task_count + statement.excluded.task_count}
+        ))
+
+    db.commit()
+    return len(drifted)
+
+def column_count_job():
+    """Periodic job: repair column counter drift"""
+
+    db = SessionLocal()
+    try:
+        repaired = reconcile_column_counts(db)
+        if repaired:
+            logger.warning("Repaired %d drifted board column counters", repaired)
+    finally:
+        db.close()
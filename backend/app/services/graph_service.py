@@ -0,0 +1,177 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert
+from typing import Dict, List, Optional, Set, Tuple
+import uuid
+
+from ..models import Board, BoardGraphVersion, Task, TaskDependency, TaskStatus
+from ..schemas import CriticalPath
+from ..core.cache import VersionedLRU
+
+# Task fields whose change invalidates a board's cached critical path
+GRAPH_FIELDS = {"estimated_hours", "status", "sprint_id"}
+
+def bump_graph_version(db: Session, *board_ids: uuid.UUID):
+    """Invalidate cached graph results for boards; takes effect on commit.
+
+    Locks the boards' counter rows until commit, so write paths call it last.
+    """
+
+    # Sorted so concurrent bumps of several boards lock rows in the same order
+    board_ids = sorted({board_id for board_id in board_ids if board_id}, key=str)
+    if not board_ids:
+        return
+
+    statement = insert(BoardGraphVersion).values([
+        {"board_id": board_id, "version": 1} for board_id in board_ids
+    ])
+    db.execute(statement.on_conflict_do_update(
+        index_elements=["board_id"],
+        set_={"version": BoardGraphVersion.version + 1}
+    ))
+
+def linked_board_ids(db: Session, task_ids: List[uuid.UUID]) -> Set[uuid.UUID]:
+    """Boards of the tasks at the other end of edges touching `task_ids`.
+
+    Deleting or archiving a task cascades its edges away, which changes the
+    graph of every board those edges reach, not only the task's own.
+    """
+
+    if not task_ids:
+        return set()
+
+    linked = select(TaskDependency.blocker_id).where(
+        TaskDependency.blocked_id.in_(task_ids)
+    ).union(
+        select(TaskDependency.blocked_id).where(TaskDependency.blocker_id.in_(task_ids))
+    )
+    return {
+        board_id for board_id, in db.query(Task.board_id).filter(
+            Task.id.in_(linked.scalar_subquery())
+        ).distinct()
+    }
+
+def graph_version(db: Session, board_id: uuid.UUID) -> int:
+    version = db.query(BoardGraphVersion.version).filter(
+        BoardGraphVersion.board_id == board_id
+    ).scalar()
+    return version or 0
+
+def lock_team_graph(db: Session, team_id: uuid.UUID):
+    """Serialize dependency edits within a team until the transaction ends.
+
+    Without it two concurrent inserts of A -> B and B -> A both pass the
+    cycle check.
+    """
+    db.execute(text("SELECT pg_advisory_xact_lock(hashtext(:key))"), {"key": f"graph:{team_id}"})
+
+def creates_cycle(db: Session, blocker_id: uuid.UUID, blocked_id: uuid.UUID) -> bool:
+    """Check whether adding blocker -> blocked would close a cycle.
+
+    Only the part of the graph reachable from the blocked task is visited,
+    one IN query per level, so the cost tracks the affected subgraph rather
+    than the whole team.
+    """
+
+    if blocker_id == blocked_id:
+        return True
+
+    visited: Set[uuid.UUID] = {blocked_id}
+    frontier = {blocked_id}
+    while frontier:
+        successors = {
+            row.blocked_id for row in db.query(TaskDependency.blocked_id).filter(
+                TaskDependency.blocker_id.in_(frontier)
+            )
+        }
+        if blocker_id in successors:
+            return True
+        frontier = successors - visited
+        visited |= frontier
+    return False
+
+def compute_critical_path(
+    tasks: List[Tuple[uuid.UUID, Optional[int], TaskStatus]],
+    edges: List[Tuple[uuid.UUID, uuid.UUID]]
+) -> Tuple[int, List[uuid.UUID], Dict[uuid.UUID, int]]:
+    """Longest path through the DAG weighted by remaining estimated hours"""
+
+    # Done tasks have no remaining work
+    duration = {
+        task_id: 0 if status == TaskStatus.DONE else (hours or 0)
+        for task_id, hours, status in tasks
+    }
+    successors: Dict[uuid.UUID, List[uuid.UUID]] = {task_id: [] for task_id in duration}
+    indegree = {task_id: 0 for task_id in duration}
+    for blocker_id, blocked_id in edges:
+        if blocker_id in duration and blocked_id in duration:
+            successors[blocker_id].append(blocked_id)
+            indegree[blocked_id] += 1
+
+    # Kahn's algorithm; earliest start is the latest finish among blockers
+    earliest_start = {task_id: 0 for task_id in duration}
+    predecessor: Dict[uuid.UUID, Optional[uuid.UUID]] = {task_id: None for task_id in duration}
+    earliest_finish: Dict[uuid.UUID, int] = {}
+    ready = [task_id for task_id, degree in indegree.items() if degree == 0]
+    while ready:
+        task_id = ready.pop()
+        finish = earliest_start[task_id] + duration[task_id]
+        earliest_finish[task_id] = finish
+        for next_id in successors[task_id]:
+            if predecessor[next_id] is None or finish > earliest_start[next_id]:
+                earliest_start[next_id] = finish
+                predecessor[next_id] = task_id
+            indegree[next_id] -= 1
+            if indegree[next_id] == 0:
+                ready.append(next_id)
+
+    if not earliest_finish:
+        return 0, [], {}
+
+    end = max(earliest_finish, key=earliest_finish.get)
+    path = []
+    while end is not None:
+        path.append(end)
+        end = predecessor[end]
+    path.reverse()
+    return earliest_finish[path[-1]], path, earliest_finish
+
+# Critical paths keyed by (board, sprint), valid for one graph version
+critical_path_cache: VersionedLRU[CriticalPath] = VersionedLRU(maxsize=256)
+
+def get_critical_path(
+    db: Session,
+    board: Board,
+    sprint_id: Optional[uuid.UUID] = None
+) -> CriticalPath:
+    """Return the board's critical path, recomputing only when its graph changed"""
+
+    key = (board.id, sprint_id)
+    version = graph_version(db, board.id)
+    cached = critical_path_cache.get(key, version)
+    if cached is not None:
+        return cached
+
+    query = db.query(Task.id, Task.estimated_hours, Task.status).filter(
+        Task.board_id == board.id
+    )
+    if sprint_id:
+        query = query.filter(Task.sprint_id == sprint_id)
+    tasks = query.all()
+
+    task_ids = [task_id for task_id, _, _ in tasks]
+    edges = db.query(TaskDependency.blocker_id, TaskDependency.blocked_id).filter(
+        TaskDependency.blocked_id.in_(task_ids)
+    ).all() if task_ids else []
+
+    total_hours, path, earliest_finish = compute_critical_path(tasks, edges)
+    result = CriticalPath(
+        board_id=board.id,
+        sprint_id=sprint_id,
+        graph_version=version,
+        total_hours=total_hours,
+        critical_path=path,
+        earliest_finish=earliest_finish
+    )
+    critical_path_cache.put(key, version, result)
+    return result
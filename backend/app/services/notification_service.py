@@ -0,0 +1,53 @@
+from typing import Any, Dict
+import asyncio
+import json
+import logging
+import uuid
+
+import redis.asyncio as redis
+
+from ..config import settings
+from ..core.websocket import websocket_manager
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_CHANNEL = "notifications"
+
+class NotificationService:
+    """Delivers user notifications through Redis pub/sub.
+
+    The worker that produces a notification rarely holds the user's socket,
+    so every worker subscribes and forwards messages to its own connections.
+    """
+
+    def __init__(self, redis_url: str):
+        self.redis = redis.from_url(redis_url)
+
+    async def notify_user(self, user_id: uuid.UUID, message: Dict[str, Any]):
+        await self.redis.publish(
+            NOTIFICATION_CHANNEL,
+            json.dumps({"user_id": str(user_id), "message": message}, default=str)
+        )
+
+    async def listen(self):
+        """Forward published notifications to this worker's sockets, forever"""
+
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(NOTIFICATION_CHANNEL)
+                    async for item in pubsub.listen():
+                        if item["type"] != "message":
+                            continue
+                        data = json.loads(item["data"])
+                        await websocket_manager.send_to_user(
+                            uuid.UUID(data["user_id"]),
+                            data["message"]
+                        )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Notification listener failed, reconnecting")
+                await asyncio.sleep(5)
+
+notification_service = NotificationService(settings.REDIS_URL)
@@ -0,0 +1,272 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import heapq
+import json
+import logging
+import uuid
+
+import psycopg2
+import redis.asyncio as redis
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models import Task, TaskStatus
+from .notification_service import notification_service
+
+logger = logging.getLogger(__name__)
+
+REMINDER_CHANNEL = "task_reminders"
+REMINDER_LOCK_KEY = 7300  # pg advisory lock held by the scheduling worker
+
+# Task fields that can add, move or cancel a reminder
+REMINDER_FIELDS = {"due_date", "status", "assignee_id"}
+
+# A reminder that fails to send is retried after this long
+FIRE_RETRY = timedelta(seconds=30)
+
+def notify_due_change(
+    db: Session,
+    task: Task,
+    deleted: bool = False,
+    due_date_changed: bool = False
+):
+    """Tell the scheduling worker about a reminder change.
+
+    NOTIFY is transactional: the scheduler only hears about it once the
+    caller's transaction commits, and never if it rolls back. Pass
+    `due_date_changed` when the write set a new due date; only then is a
+    reminder whose lead time already passed sent straight away.
+    """
+
+    payload = {"task_id": str(task.id), "deleted": deleted}
+    if not deleted:
+        payload.update(
+            due_date=task.due_date.isoformat() if task.due_date else None,
+            status=TaskStatus(task.status).value,
+            assignee_id=str(task.assignee_id) if task.assignee_id else None,
+            due_date_changed=due_date_changed
+        )
+    db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": REMINDER_CHANNEL, "payload": json.dumps(payload)}
+    )
+
+class ReminderScheduler:
+    """Fires due-date reminders from an in-memory min-heap.
+
+    Only tasks due within REMINDER_HORIZON_HOURS are held; the window slides
+    forward with an indexed range query on due_date every half horizon.
+    Between reloads the heap is updated incrementally from NOTIFY messages
+    sent by the task write paths. Superseded heap entries are skipped lazily
+    when popped. Only the worker holding the advisory lock schedules.
+
+    Sent reminders are remembered per (task, due date), so later writes to
+    the task don't send the same reminder again.
+    """
+
+    def __init__(self):
+        self.lead = timedelta(minutes=settings.REMINDER_LEAD_MINUTES)
+        self.horizon = timedelta(hours=settings.REMINDER_HORIZON_HOURS)
+        self._heap: List[Tuple[datetime, uuid.UUID]] = []
+        self._scheduled: Dict[uuid.UUID, Tuple[datetime, uuid.UUID, datetime]] = {}
+        self._fired: Dict[uuid.UUID, datetime] = {}
+        # Notifications that arrive while reload() is fetching, replayed on top
+        self._pending: Optional[Dict[uuid.UUID, dict]] = None
+        self._wakeup = asyncio.Event()
+        self._connection_lost = False
+
+    def schedule(
+        self,
+        task_id: uuid.UUID,
+        due_date: Optional[datetime],
+        status: TaskStatus,
+        assignee_id: Optional[uuid.UUID],
+        due_date_changed: bool = False
+    ):
+        now = datetime.now(timezone.utc)
+        if (
+            due_date is None
+            or assignee_id is None
+            or status == TaskStatus.DONE
+            or not now < due_date <= now + self.horizon
+            or self._fired.get(task_id) == due_date
+        ):
+            self.cancel(task_id)
+            return
+
+        fire_at = due_date - self.lead
+        existing = self._scheduled.get(task_id)
+        if fire_at <= now and not due_date_changed and not (existing and existing[2] == due_date):
+            # The lead time passed before this write; the reminder was either
+            # sent already or the task only now came into scope
+            self.cancel(task_id)
+            return
+
+        self._push(task_id, fire_at, assignee_id, due_date)
+
+    def _push(self, task_id: uuid.UUID, fire_at: datetime, assignee_id: uuid.UUID, due_date: datetime):
+        self._scheduled[task_id] = (fire_at, assignee_id, due_date)
+        heapq.heappush(self._heap, (fire_at, task_id))
+        self._wakeup.set()
+
+    def cancel(self, task_id: uuid.UUID):
+        # The heap entry stays behind and is dropped when it reaches the top
+        self._scheduled.pop(task_id, None)
+
+    def pop_due(self, now: datetime) -> List[Tuple[uuid.UUID, uuid.UUID, datetime]]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            fire_at, task_id = heapq.heappop(self._heap)
+            entry = self._scheduled.get(task_id)
+            if entry and entry[0] == fire_at:
+                del self._scheduled[task_id]
+                due.append((task_id, entry[1], entry[2]))
+        return due
+
+    def _fetch_upcoming(self) -> List[Tuple[uuid.UUID, datetime, TaskStatus, uuid.UUID]]:
+        # Reminders whose fire time already passed were sent by a previous leader
+        now = datetime.now(timezone.utc)
+        db = SessionLocal()
+        try:
+            return db.query(
+                Task.id, Task.due_date, Task.status, Task.assignee_id
+            ).filter(
+                Task.due_date > now + self.lead,
+                Task.due_date <= now + self.horizon,
+                Task.status != TaskStatus.DONE,
+                Task.assignee_id.isnot(None)
+            ).all()
+        finally:
+            db.close()
+
+    async def reload(self):
+        self._pending = {}
+        try:
+            rows = await run_in_threadpool(self._fetch_upcoming)
+        except BaseException:
+            self._pending = None
+            raise
+
+        # Changes that arrived during the fetch may be newer than the rows
+        pending, self._pending = self._pending, None
+        self._heap.clear()
+        self._scheduled.clear()
+        for task_id, due_date, status, assignee_id in rows:
+            self.schedule(task_id, due_date, status, assignee_id)
+        for data in pending.values():
+            self._apply(data)
+
+        # Sent reminders only matter until their due date passes
+        now = datetime.now(timezone.utc)
+        self._fired = {
+            task_id: due_date for task_id, due_date in self._fired.items() if due_date > now
+        }
+
+    def _try_lead(self):
+        conn = psycopg2.connect(settings.DATABASE_URL)
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_lock(%s)", (REMINDER_LOCK_KEY,))
+            if not cursor.fetchone()[0]:
+                conn.close()
+                return None
+            cursor.execute(f"LISTEN {REMINDER_CHANNEL}")
+        return conn
+
+    def _on_notify(self, conn):
+        try:
+            conn.poll()
+        except psycopg2.Error:
+            self._connection_lost = True
+            self._wakeup.set()
+            return
+
+        while conn.notifies:
+            data = json.loads(conn.notifies.pop(0).payload)
+            if self._pending is not None:
+                self._pending[data["task_id"]] = data
+            self._apply(data)
+
+    def _apply(self, data: dict):
+        task_id = uuid.UUID(data["task_id"])
+        if data["deleted"]:
+            self.cancel(task_id)
+            return
+        self.schedule(
+            task_id,
+            datetime.fromisoformat(data["due_date"]) if data["due_date"] else None,
+            TaskStatus(data["status"]),
+            uuid.UUID(data["assignee_id"]) if data["assignee_id"] else None,
+            data.get("due_date_changed", False)
+        )
+
+    async def _fire(self, task_id: uuid.UUID, assignee_id: uuid.UUID, due_date: datetime):
+        try:
+            await notification_service.notify_user(assignee_id, {
+                "type": "task_due_soon",
+                "task_id": str(task_id),
+                "due_date": due_date.isoformat()
+            })
+        except redis.RedisError:
+            # Keep leadership and the reminder; a newer write to the task
+            # replaces the retry like any other heap entry
+            logger.exception("Failed to send reminder for task %s, retrying", task_id)
+            if task_id not in self._scheduled and due_date > datetime.now(timezone.utc):
+                self._push(task_id, datetime.now(timezone.utc) + FIRE_RETRY, assignee_id, due_date)
+            return
+        self._fired[task_id] = due_date
+
+    async def _lead(self, conn):
+        loop = asyncio.get_running_loop()
+        self._connection_lost = False
+        loop.add_reader(conn.fileno(), self._on_notify, conn)
+        try:
+            await self.reload()
+            reload_at = datetime.now(timezone.utc) + self.horizon / 2
+
+            while not self._connection_lost:
+                now = datetime.now(timezone.utc)
+                for task_id, assignee_id, due_date in self.pop_due(now):
+                    await self._fire(task_id, assignee_id, due_date)
+
+                if now >= reload_at:
+                    await self.reload()
+                    reload_at = now + self.horizon / 2
+
+                next_at = min(self._heap[0][0], reload_at) if self._heap else reload_at
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(),
+                        timeout=max((next_at - now).total_seconds(), 0)
+                    )
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            loop.remove_reader(conn.fileno())
+
+    async def run(self):
+        """Contend for leadership and schedule reminders while holding it"""
+
+        while True:
+            conn = None
+            try:
+                conn = await run_in_threadpool(self._try_lead)
+                if conn is not None:
+                    logger.info("Acquired reminder scheduler lock")
+                    await self._lead(conn)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Reminder scheduler failed")
+            finally:
+                # Closing the session releases the advisory lock for another worker
+                if conn is not None:
+                    conn.close()
+            await asyncio.sleep(settings.REMINDER_LEADER_RETRY_SECONDS)
+
+reminder_scheduler = ReminderScheduler()
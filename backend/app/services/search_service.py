@@ -0,0 +1,118 @@
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import cast, func, select, tuple_, union_all
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from fastapi import HTTPException
+from typing import Optional
+import uuid
+
+from ..models import Task, Comment, Board, TeamMember, User
+from ..models.task import SEARCH_CONFIG
+from ..schemas import SearchHit, SearchPage, TaskSummary
+
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=10, MaxFragments=2"
+
+# A match in a comment ranks below the same match on the task itself
+COMMENT_WEIGHT = 0.5
+
+def _matches(vector, tsquery):
+    return vector.bool_op("@@")(tsquery)
+
+def search_tasks(
+    db: Session,
+    user: User,
+    q: str,
+    board_id: Optional[uuid.UUID] = None,
+    cursor: Optional[str] = None,
+    limit: int = 20
+) -> SearchPage:
+    """Rank tasks matching `q` in their title, tags, description or comments.
+
+    Both branches are answered from the GIN indexes and restricted to the
+    user's boards before ranking, so only visible matches are scored. Pages
+    are keyed on (rank, id), which is stable between requests.
+    """
+
+    config = cast(SEARCH_CONFIG, REGCONFIG)
+    tsquery = func.websearch_to_tsquery(config, q)
+
+    boards = select(Board.id).join(
+        TeamMember, TeamMember.team_id == Board.team_id
+    ).where(TeamMember.user_id == user.id)
+    if board_id:
+        boards = boards.where(Board.id == board_id)
+
+    task_hits = select(
+        Task.id.label("task_id"),
+        func.ts_rank_cd(Task.search_vector, tsquery).label("rank")
+    ).where(
+        _matches(Task.search_vector, tsquery),
+        Task.board_id.in_(boards)
+    )
+    comment_hits = select(
+        Comment.task_id,
+        func.ts_rank_cd(Comment.search_vector, tsquery) * COMMENT_WEIGHT
+    ).join(Task, Task.id == Comment.task_id).where(
+        _matches(Comment.search_vector, tsquery),
+        Task.board_id.in_(boards)
+    )
+    hits = union_all(task_hits, comment_hits).subquery()
+    ranked = select(
+        hits.c.task_id,
+        func.max(hits.c.rank).label("rank")
+    ).group_by(hits.c.task_id).subquery()
+
+    # Headlines are expensive; Postgres evaluates them after the sort and
+    # limit, so only for the rows on this page
+    query = db.query(
+        Task,
+        ranked.c.rank,
+        func.ts_headline(config, Task.title, tsquery, HEADLINE_OPTIONS),
+        func.ts_headline(config, Task.description, tsquery, HEADLINE_OPTIONS)
+    ).options(
+        load_only(Task.id, Task.title, Task.status, Task.priority, Task.assignee_id, Task.due_date, Task.board_id)
+    ).join(ranked, ranked.c.task_id == Task.id)
+
+    if cursor:
+        try:
+            rank, task_id = cursor.split("_")
+            position = (float(rank), uuid.UUID(task_id))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(tuple_(ranked.c.rank, Task.id) < position)
+
+    rows = query.order_by(ranked.c.rank.desc(), Task.id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_task, last_rank = rows[-1][0], rows[-1][1]
+        next_cursor = f"{last_rank!r}_{last_task.id}"
+
+    # Best matching comment per task on this page
+    comment_highlights = {}
+    if rows:
+        comment_highlights = dict(db.query(
+            Comment.task_id,
+            func.ts_headline(config, Comment.content, tsquery, HEADLINE_OPTIONS)
+        ).filter(
+            Comment.task_id.in_([task.id for task, *_ in rows]),
+            _matches(Comment.search_vector, tsquery)
+        ).distinct(Comment.task_id).order_by(
+            Comment.task_id,
+            func.ts_rank_cd(Comment.search_vector, tsquery).desc()
+        ).all())
+
+    return SearchPage(
+        hits=[
+            SearchHit(
+                task=TaskSummary.model_validate(task),
+                board_id=task.board_id,
+                rank=rank,
+                title_highlight=title_highlight,
+                description_highlight=description_highlight,
+                comment_highlight=comment_highlights.get(task.id)
+            )
+            for task, rank, title_highlight, description_highlight in rows
+        ],
+        next_cursor=next_cursor
+    )
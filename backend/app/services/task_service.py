@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm.exc import StaleDataError
 from sqlalchemy import and_
 from fastapi import HTTPException
 from typing import Optional
@@ -6,11 +7,33 @@ import uuid
 
 from ..models import Task, Board, TeamMember, User
 from ..schemas import TaskMove, TaskWithDetails
+from ..core.rate_limit import enforce_board_write_limit
+from .activity_service import record_activity
+from .reminder_service import notify_due_change
+from .graph_service import bump_graph_version
+from .workload_service import apply_workload_change, task_snapshot
+from .board_service import column_index, shift_column_count
 
 class TaskService:
     def __init__(self, db: Session):
         self.db = db
     
+    def version_conflict(self, task_id: uuid.UUID) -> HTTPException:
+        """Roll back a lost update and build a 409 carrying the task's current state"""
+        
+        self.db.rollback()
+        task = self.db.query(Task).options(
+            joinedload(Task.assignee),
+            joinedload(Task.creator),
+            joinedload(Task.subtasks)
+        ).filter(Task.id == task_id).first()
+        
+        current = TaskWithDetails.model_validate(task).model_dump(mode="json") if task else None
+        return HTTPException(
+            status_code=409,
+            detail={"message": "Task was modified by another user", "task": current}
+        )
+    
     async def move_task(
         self, 
         task_id: uuid.UUID, 
@@ -33,9 +56,17 @@ class TaskService:
         if not membership or membership.role.value == "viewer":
             raise HTTPException(status_code=403, detail="Insufficient permissions")
         
+        await enforce_board_write_limit(board.id)
+        
+        if move_data.version is not None and move_data.version != task.version:
+            raise self.version_conflict(task_id)
+        
         old_column = task.column_id
         old_position = task.position
+        old_status = task.status
         target_board_id = move_data.board_id or task.board_id
+        target_board = board
+        workload_before = task_snapshot(task, board.team_id)
         
         # If moving to different board, check access
         if move_data.board_id and move_data.board_id != task.board_id:
@@ -50,40 +81,84 @@ class TaskService:
             
             if not target_membership or target_membership.role.value == "viewer":
                 raise HTTPException(status_code=403, detail="No access to target board")
+            
+        # Validated against the compiled column index of the board row already loaded
+        target_column = column_index(target_board).column(move_data.column_id)
+        
+        old_board_id = task.board_id
+        
+        # Update task
+        task.column_id = move_data.column_id
+        task.position = move_data.position
+        task.board_id = target_board_id
+        
+        # Update status based on column
+        if target_column.status:
+            task.status = target_column.status
+        
+        # Claim the row first with UPDATE ... WHERE version = :v so a concurrent
+        # move loses here, before any neighbouring positions have been shifted
+        try:
+            self.db.flush()
+        except StaleDataError:
+            raise self.version_conflict(task_id)
+        
+        # Moving into or out of done adds or cancels the due-date reminder
+        if task.due_date and task.status != old_status:
+            notify_due_change(self.db, task)
+        
+        # Enforces the target column's WIP limit when the task enters it
+        shift_column_count(
+            self.db,
+            (old_board_id, old_column),
+            (target_board_id, target_column.id),
+            target_column.wip_limit
+        )
+        
+        # Neighbours keep their version: a position shift is not a conflicting
+        # edit, and clients only learn the moved task's new version
         
         # Reorder tasks in old column (if column changed)
-        if old_column != move_data.column_id or target_board_id != task.board_id:
+        if old_column != move_data.column_id or target_board_id != old_board_id:
             self.db.query(Task).filter(
                 and_(
-                    Task.board_id == task.board_id,
+                    Task.board_id == old_board_id,
                     Task.column_id == old_column,
-                    Task.position > old_position
+                    Task.position > old_position,
+                    Task.id != task.id
                 )
-            ).update({Task.position: Task.position - 1})
+            ).update(
+                {Task.position: Task.position - 1},
+                synchronize_session=False
+            )
         
         # Make space in new column
         self.db.query(Task).filter(
             and_(
                 Task.board_id == target_board_id,
                 Task.column_id == move_data.column_id,
-                Task.position >= move_data.position
+                Task.position >= move_data.position,
+                Task.id != task.id
             )
-        ).update({Task.position: Task.position + 1})
+        ).update(
+            {Task.position: Task.position + 1},
+            synchronize_session=False
+        )
         
-        # Update task
-        task.column_id = move_data.column_id
-        task.position = move_data.position
-        task.board_id = target_board_id
+        apply_workload_change(self.db, workload_before, task_snapshot(task, target_board.team_id))
         
-        # Update status based on column
-        status_mapping = {
-            "todo": "todo",
-            "in_progress": "in_progress", 
-            "review": "review",
-            "done": "done"
-        }
-        if move_data.column_id in status_mapping:
-            task.status = status_mapping[move_data.column_id]
+        changes = {}
+        if old_board_id != task.board_id:
+            changes["board_id"] = [str(old_board_id), str(task.board_id)]
+        if old_column != task.column_id:
+            changes["column_id"] = [old_column, task.column_id]
+        if old_position != task.position:
+            changes["position"] = [old_position, task.position]
+        record_activity(self.db, task.id, task.board_id, current_user.id, "moved", changes)
+        
+        # Status and board changes alter remaining work on the critical path.
+        # Bumped last so the counter row lock is held as briefly as possible
+        bump_graph_version(self.db, old_board_id, target_board_id)
         
         self.db.commit()
         self.db.refresh(task)
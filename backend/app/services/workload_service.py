@@ -0,0 +1,146 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, select
+from sqlalchemy.dialects.postgresql import insert
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+import uuid
+
+from ..database import SessionLocal
+from ..models import Board, Task, TaskStatus, TaskPriority, WorkloadRollup
+
+logger = logging.getLogger(__name__)
+
+UNASSIGNED = uuid.UUID(int=0)
+
+# (team_id, assignee_id, status, priority, estimated_hours)
+WorkloadSnapshot = Tuple[uuid.UUID, uuid.UUID, TaskStatus, TaskPriority, int]
+WorkloadKey = Tuple[uuid.UUID, uuid.UUID, TaskStatus, TaskPriority]
+KEY_COLUMNS = ("team_id", "assignee_id", "status", "priority")
+
+def workload_snapshot(
+    team_id: uuid.UUID,
+    assignee_id: Optional[uuid.UUID],
+    status,
+    priority,
+    estimated_hours: Optional[int]
+) -> WorkloadSnapshot:
+    return (
+        team_id,
+        assignee_id or UNASSIGNED,
+        TaskStatus(status),
+        TaskPriority(priority),
+        estimated_hours or 0
+    )
+
+def task_snapshot(task: Task, team_id: uuid.UUID) -> WorkloadSnapshot:
+    """Capture the fields of a flushed task that feed the rollup"""
+    return workload_snapshot(
+        team_id, task.assignee_id, task.status, task.priority, task.estimated_hours
+    )
+
+def collect_deltas(
+    removed: Iterable[WorkloadSnapshot] = (),
+    added: Iterable[WorkloadSnapshot] = ()
+) -> Dict[WorkloadKey, List[int]]:
+    deltas: Dict[WorkloadKey, List[int]] = defaultdict(lambda: [0, 0])
+    for sign, snapshots in ((-1, removed), (1, added)):
+        for *key, hours in snapshots:
+            delta = deltas[tuple(key)]
+            delta[0] += sign
+            delta[1] += sign * hours
+    return deltas
+
+def record_deltas(db: Session, deltas: Dict[WorkloadKey, List[int]]):
+    """Upsert count/hour deltas in one statement; takes effect on commit"""
+
+    rows = [
+        {
+            "team_id": key[0],
+            "assignee_id": key[1],
+            "status": key[2],
+            "priority": key[3],
+            "task_count": count,
+            "estimated_hours": hours,
+        }
+        # Sorted so concurrent writers lock rollup rows in the same order
+        for key, (count, hours) in sorted(deltas.items(), key=lambda item: str(item[0]))
+        if count or hours
+    ]
+    if not rows:
+        return
+
+    statement = insert(WorkloadRollup).values(rows)
+    db.execute(statement.on_conflict_do_update(
+        index_elements=["team_id", "assignee_id", "status", "priority"],
+        set_={
+            "task_count": WorkloadRollup.task_count + statement.excluded.task_count,
+            "estimated_hours": WorkloadRollup.estimated_hours + statement.excluded.estimated_hours,
+        }
+    ))
+
+def apply_workload_change(
+    db: Session,
+    before: Optional[WorkloadSnapshot] = None,
+    after: Optional[WorkloadSnapshot] = None
+):
+    """Move one task's contribution from its old rollup cell to its new one"""
+
+    if before == after:
+        return
+    record_deltas(db, collect_deltas(
+        removed=[before] if before else [],
+        added=[after] if after else []
+    ))
+
+def reconcile_workload(db: Session) -> int:
+    """Repair rollup cells that drifted from the tasks they summarize.
+
+    Tasks and rollups are compared in one statement, so both come from the
+    same snapshot, and the differences are applied as deltas. Writes that
+    commit in between keep their own deltas.
+    """
+
+    cell = (
+        Board.team_id,
+        func.coalesce(Task.assignee_id, UNASSIGNED),
+        Task.status,
+        Task.priority
+    )
+    actual = select(
+        *(column.label(name) for column, name in zip(cell, KEY_COLUMNS)),
+        func.count(Task.id).label("task_count"),
+        func.coalesce(func.sum(Task.estimated_hours), 0).label("estimated_hours")
+    ).join(Board, Board.id == Task.board_id).group_by(*cell).subquery()
+    stored = select(WorkloadRollup).subquery()
+
+    count_delta = func.coalesce(actual.c.task_count, 0) - func.coalesce(stored.c.task_count, 0)
+    hours_delta = func.coalesce(actual.c.estimated_hours, 0) - func.coalesce(stored.c.estimated_hours, 0)
+    drifted = db.execute(select(
+        *(func.coalesce(actual.c[name], stored.c[name]) for name in KEY_COLUMNS),
+        count_delta,
+        hours_delta
+    ).select_from(actual.outerjoin(
+        stored,
+        and_(*(stored.c[name] == actual.c[name] for name in KEY_COLUMNS)),
+        full=True
+    )).where((count_delta != 0) | (hours_delta != 0))).all()
+
+    record_deltas(db, {
+        (team_id, assignee_id, TaskStatus(status), TaskPriority(priority)): [count, hours]
+        for team_id, assignee_id, status, priority, count, hours in drifted
+    })
+
+    db.commit()
+    return len(drifted)
+
+def reconcile_job():
+    """Periodic job: repair rollup drift"""
+
+    db = SessionLocal()
+    try:
+        repaired = reconcile_workload(db)
+        if repaired:
+            logger.warning("Repaired %d drifted workload rollup cells", repaired)
+    finally:
+        db.close()
@@ -0,0 +1,16 @@
+from starlette.concurrency import run_in_threadpool
+from typing import Callable
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+async def run_periodically(interval: float, job: Callable[[], object]):
+    """Run a blocking job every `interval` seconds in the threadpool, forever"""
+
+    while True:
+        try:
+            await run_in_threadpool(job)
+        except Exception:
+            logger.exception("Periodic job %s failed", getattr(job, "__name__", job))
+        await asyncio.sleep(interval)
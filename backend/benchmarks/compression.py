@@ -0,0 +1,119 @@
+"""CPU per request of response compression.
+
+Compares Starlette's GZipMiddleware, which main.py used before, against
+CompressionMiddleware for each encoding, and against a CompressedPayload
+whose variants are built once and then reused.
+
+    cd backend && python benchmarks/compression.py [--tasks 100] [--requests 300]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from starlette.applications import Starlette
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import Response
+from starlette.routing import Route
+
+from app.core.compression import CompressedPayload, CompressionMiddleware
+
+def task_list(count: int) -> bytes:
+    """A serialized task list shaped like GET /api/tasks"""
+
+    board_id, creator_id = str(uuid.uuid4()), str(uuid.uuid4())
+    return json.dumps([
+        {
+            "id": str(uuid.uuid4()),
+            "title": f"Task {i}: implement feature",
+            "description": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4,
+            "status": "in_progress",
+            "priority": "medium",
+            "task_type": "task",
+            "tags": ["backend", "api"],
+            "board_id": board_id,
+            "column_id": "in_progress",
+            "position": i,
+            "version": 3,
+            "creator": {"id": creator_id, "email": "dev@example.com", "name": "Dev"},
+            "created_at": "2026-10-19T10:00:00Z",
+            "updated_at": None
+        }
+        for i in range(count)
+    ]).encode()
+
+def build_app(body: bytes, middleware, **options) -> Starlette:
+    payload = CompressedPayload(body)
+
+    async def plain(request):
+        return Response(body, media_type="application/json")
+
+    async def cached(request):
+        return await payload.response(request)
+
+    app = Starlette(routes=[Route("/", plain), Route("/cached", cached)])
+    app.add_middleware(middleware, **options)
+    return app
+
+async def request(app, path: str, accept_encoding: str) -> int:
+    """Run one GET through the ASGI app; returns the response body size"""
+
+    scope = {
+        "type": "http", "method": "GET", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "scheme": "http", "http_version": "1.1",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+        "server": ("testserver", 80), "client": ("testclient", 50000)
+    }
+    received = False
+    size = 0
+
+    async def receive():
+        nonlocal received
+        if received:
+            # Nothing more arrives; a real server would report a disconnect
+            await asyncio.Event().wait()
+        received = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal size
+        if message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return size
+
+async def main(tasks: int, requests: int):
+    body = task_list(tasks)
+    gzip_app = build_app(body, GZipMiddleware, minimum_size=1000)
+    app = build_app(body, CompressionMiddleware)
+
+    print(f"{tasks} tasks, {len(body)} bytes uncompressed, {requests} requests each")
+    cases = [
+        ("GZipMiddleware", gzip_app, "/", "gzip"),
+        ("CompressionMiddleware gzip", app, "/", "gzip"),
+        ("CompressionMiddleware zstd", app, "/", "zstd"),
+        ("CompressionMiddleware br", app, "/", "br"),
+        ("CompressedPayload br", app, "/cached", "br")
+    ]
+    for name, case_app, path, encoding in cases:
+        # The first request also fills the payload cache
+        size = await request(case_app, path, encoding)
+        started = time.process_time()
+        for _ in range(requests):
+            await request(case_app, path, encoding)
+        per_request = (time.process_time() - started) * 1000 / requests
+        print(f"{name:28s} {per_request:7.3f} ms CPU/request {size:8d} bytes")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+    asyncio.run(main(args.tasks, args.requests))
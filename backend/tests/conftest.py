@@ -0,0 +1,72 @@
+import os
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Postgres-backed tests run against this database and are skipped without it.
+# Each run works in a scratch schema that is dropped afterwards.
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+@pytest.fixture(scope="session")
+def engine():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    from app.models import Base
+
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    try:
+        with create_engine(TEST_DATABASE_URL).begin() as conn:
+            conn.execute(text(f"CREATE SCHEMA {schema}"))
+    except OperationalError as exc:
+        pytest.skip(f"Test database unavailable: {exc.orig}")
+
+    engine = create_engine(
+        TEST_DATABASE_URL,
+        connect_args={"options": f"-csearch_path={schema}"}
+    )
+    Base.metadata.create_all(engine)
+    from app.services.activity_service import ensure_partitions
+    with sessionmaker(bind=engine)() as session:
+        ensure_partitions(session)
+    yield engine
+
+    engine.dispose()
+    with create_engine(TEST_DATABASE_URL).begin() as conn:
+        conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+
+@pytest.fixture
+def db(engine):
+    """A session whose writes are rolled back after the test"""
+
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = sessionmaker(bind=connection, join_transaction_mode="create_savepoint")()
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+@pytest.fixture
+def board(db):
+    """A board and an admin of its team, committed so code under test may roll back"""
+
+    from app.models import Board, Team, TeamMember, User, UserRole
+
+    user = User(email="owner@example.com", name="Owner", google_id="google-owner")
+    team = Team(name="Team")
+    db.add_all([user, team])
+    db.flush()
+    board = Board(name="Board", team_id=team.id)
+    db.add_all([board, TeamMember(user_id=user.id, team_id=team.id, role=UserRole.ADMIN)])
+    db.commit()
+    return user, board
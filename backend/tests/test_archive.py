@@ -0,0 +1,90 @@
+import pytest
+
+from app.models import ArchivedTask, ArchivedTaskDependency, Task, TaskDependency, TaskStatus
+from app.services.archive_service import archive_done_tasks, restore_task
+
+def add_task(db, user, board, title, status=TaskStatus.TODO):
+    task = Task(title=title, board_id=board.id, creator_id=user.id, status=status, column_id=status.value)
+    db.add(task)
+    db.flush()
+    return task
+
+def link(db, blocker, blocked):
+    db.add(TaskDependency(blocker_id=blocker.id, blocked_id=blocked.id))
+    db.flush()
+
+def edges(db):
+    return {(edge.blocker_id, edge.blocked_id) for edge in db.query(TaskDependency)}
+
+def archived_edges(db):
+    return {(edge.blocker_id, edge.blocked_id) for edge in db.query(ArchivedTaskDependency)}
+
+@pytest.fixture
+def chain(db, board):
+    """before -> done -> after, where only `done` is archived"""
+
+    user, board = board
+    before = add_task(db, user, board, "Before")
+    done = add_task(db, user, board, "Done", TaskStatus.DONE)
+    after = add_task(db, user, board, "After")
+    link(db, before, done)
+    link(db, done, after)
+    db.commit()
+    return before.id, done.id, after.id
+
+def test_archiving_sets_edges_aside_and_restoring_brings_them_back(db, chain):
+    before, done, after = chain
+
+    assert archive_done_tasks(db, older_than_days=0) == 1
+    assert edges(db) == set()
+    assert archived_edges(db) == {(before, done), (done, after)}
+
+    restore_task(db, done)
+
+    assert edges(db) == {(before, done), (done, after)}
+    assert archived_edges(db) == set()
+
+def test_edge_waits_until_both_tasks_are_restored(db, board):
+    user, board = board
+    first = add_task(db, user, board, "First", TaskStatus.DONE)
+    second = add_task(db, user, board, "Second", TaskStatus.DONE)
+    link(db, first, second)
+    db.commit()
+    first, second = first.id, second.id
+
+    assert archive_done_tasks(db, older_than_days=0) == 2
+    assert archived_edges(db) == {(first, second)}
+
+    restore_task(db, first)
+    assert edges(db) == set()
+    assert archived_edges(db) == {(first, second)}
+
+    restore_task(db, second)
+    assert edges(db) == {(first, second)}
+    assert archived_edges(db) == set()
+
+def test_edges_that_would_close_a_cycle_are_dropped(db, chain):
+    before, done, after = chain
+    archive_done_tasks(db, older_than_days=0)
+
+    # While `done` was archived: after -> before closes a loop through it
+    link(db, db.get(Task, after), db.get(Task, before))
+    db.commit()
+
+    restore_task(db, done)
+
+    # before -> done is safe; done -> after would close the loop
+    assert edges(db) == {(after, before), (before, done)}
+    assert archived_edges(db) == set()
+    assert db.get(ArchivedTask, done) is None
+
+def test_edges_to_deleted_tasks_are_dropped(db, chain):
+    before, done, after = chain
+    archive_done_tasks(db, older_than_days=0)
+    db.delete(db.get(Task, after))
+    db.commit()
+
+    restore_task(db, done)
+
+    assert edges(db) == {(before, done)}
+    assert archived_edges(db) == set()
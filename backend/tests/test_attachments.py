@@ -0,0 +1,208 @@
+import asyncio
+import hashlib
+import io
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.api import attachments as attachments_api
+from app.api.deps import get_current_active_user
+from app.config import settings
+from app.database import get_db
+from app.models import Attachment, DerivativeStatus, Task
+from app.services import attachment_service
+from app.services.attachment_service import (
+    DERIVATIVE_SIZES,
+    DerivativePipeline,
+    derivative_path,
+    original_path,
+    store_upload
+)
+
+PNG = b"\x89PNG\r\n\x1a\nnot really an image"
+
+@pytest.fixture(autouse=True)
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    return tmp_path
+
+def test_same_bytes_are_stored_once(upload_dir):
+    first = store_upload(io.BytesIO(PNG))
+    second = store_upload(io.BytesIO(PNG))
+    other, _ = store_upload(io.BytesIO(PNG + b"!"))
+
+    assert first == second == (first[0], len(PNG))
+    assert other != first[0]
+    with open(original_path(first[0]), "rb") as stored:
+        assert stored.read() == PNG
+    # Only the two originals are left, no temporary files
+    assert sorted(entry.name for entry in upload_dir.iterdir()) == ["originals"]
+    assert len(list(upload_dir.glob("originals/*/*"))) == 2
+
+def write_derivatives(content_hash):
+    for name in DERIVATIVE_SIZES:
+        path = derivative_path(content_hash, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, "wb").close()
+
+@pytest.fixture
+def task(db, board):
+    user, board = board
+    task = Task(title="Task", board_id=board.id, creator_id=user.id)
+    db.add(task)
+    db.commit()
+    return task
+
+@pytest.fixture
+def submitted(monkeypatch):
+    """(content_hash, content_type) handed to the pipeline by uploads"""
+
+    jobs = []
+    monkeypatch.setattr(
+        attachments_api.derivative_pipeline, "submit",
+        lambda content_hash, content_type: jobs.append((content_hash, content_type))
+    )
+    return jobs
+
+@pytest.fixture
+def client(db, board):
+    user, _ = board
+    app = FastAPI()
+    app.include_router(attachments_api.router, prefix="/api/attachments")
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_active_user] = lambda: user
+    return TestClient(app)
+
+def upload(client, task, content=PNG, content_type="image/png"):
+    response = client.post(
+        f"/api/attachments/tasks/{task.id}",
+        files={"file": ("file", content, content_type)}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+def test_upload_reuses_derivatives_of_the_same_content(client, task, submitted):
+    content_hash = hashlib.sha256(PNG).hexdigest()
+    first = upload(client, task)
+    assert (first["derivative_status"], first["derivatives"]) == ("pending", [])
+    assert submitted == [(content_hash, "image/png")]
+
+    write_derivatives(content_hash)
+    second = upload(client, task)
+
+    assert second["id"] != first["id"]
+    assert (second["derivative_status"], second["derivatives"]) == ("ready", list(DERIVATIVE_SIZES))
+    assert len(submitted) == 1
+
+def test_upload_without_derivatives_is_not_queued(client, task, submitted):
+    attachment = upload(client, task, content=b"plain text", content_type="text/plain")
+
+    assert attachment["derivative_status"] == "unsupported"
+    assert submitted == []
+
+@pytest.fixture
+def pipeline(db, monkeypatch):
+    """A pipeline rendering on the loop's default thread pool against the test session"""
+
+    monkeypatch.setattr(
+        attachment_service, "SessionLocal",
+        sessionmaker(bind=db.get_bind(), join_transaction_mode="create_savepoint")
+    )
+    pipeline = DerivativePipeline()
+    monkeypatch.setattr(pipeline, "_executor", lambda: None)
+    return pipeline
+
+def stub_render(monkeypatch, error=None):
+    def render_derivatives(content_hash, content_type):
+        if error:
+            raise error
+
+    monkeypatch.setattr(attachment_service, "render_derivatives", render_derivatives)
+
+def add_attachment(db, task, content_hash, status=DerivativeStatus.PENDING):
+    attachment = Attachment(
+        filename="file", content_type="image/png", size=1, content_hash=content_hash,
+        derivative_status=status, task_id=task.id, uploader_id=task.creator_id
+    )
+    db.add(attachment)
+    db.commit()
+    return attachment.id
+
+async def drain():
+    """Wait for every job, including status writes of jobs already released"""
+
+    while jobs := asyncio.all_tasks() - {asyncio.current_task()}:
+        await asyncio.gather(*jobs)
+
+def statuses(db, *attachment_ids):
+    db.expire_all()
+    return [db.get(Attachment, attachment_id).derivative_status for attachment_id in attachment_ids]
+
+@pytest.mark.asyncio
+async def test_rendered_content_resolves_every_pending_attachment(db, task, pipeline, monkeypatch):
+    stub_render(monkeypatch)
+    shared = [add_attachment(db, task, "a" * 64) for _ in range(2)]
+    unsupported = add_attachment(db, task, "a" * 64, DerivativeStatus.UNSUPPORTED)
+    other = add_attachment(db, task, "b" * 64)
+
+    pipeline.submit("a" * 64, "image/png")
+    pipeline.submit("a" * 64, "image/png")
+    assert len(pipeline._jobs) == 1
+    await drain()
+
+    assert statuses(db, *shared, unsupported, other) == [
+        DerivativeStatus.READY, DerivativeStatus.READY,
+        DerivativeStatus.UNSUPPORTED, DerivativeStatus.PENDING
+    ]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", [ValueError("bad image"), BrokenProcessPool("worker died")])
+async def test_failed_render_marks_attachments_failed(db, task, pipeline, monkeypatch, error):
+    stub_render(monkeypatch, error)
+    pipeline._pool = object()
+    attachment_id = add_attachment(db, task, "a" * 64)
+
+    pipeline.submit("a" * 64, "image/png")
+    await drain()
+
+    assert statuses(db, attachment_id) == [DerivativeStatus.FAILED]
+    # Only a crashed worker discards the pool
+    assert (pipeline._pool is None) == isinstance(error, BrokenProcessPool)
+
+@pytest.mark.asyncio
+async def test_upload_landing_as_a_job_finishes_is_resolved(db, task, pipeline, monkeypatch):
+    stub_render(monkeypatch)
+    loop = asyncio.get_running_loop()
+    write_status = attachment_service.set_derivative_status
+    late = []
+
+    def set_derivative_status(content_hash, status):
+        write_status(content_hash, status)
+        if not late:
+            # The same file is uploaded right after the status write, and
+            # its submit reaches the loop before the job's coroutine resumes
+            late.append(add_attachment(db, task, content_hash))
+            loop.call_soon_threadsafe(pipeline.submit, content_hash, "image/png")
+
+    monkeypatch.setattr(attachment_service, "set_derivative_status", set_derivative_status)
+    first = add_attachment(db, task, "a" * 64)
+
+    pipeline.submit("a" * 64, "image/png")
+    await drain()
+
+    assert statuses(db, first, *late) == [DerivativeStatus.READY, DerivativeStatus.READY]
+
+@pytest.mark.asyncio
+async def test_resume_queues_pending_content_once(db, task, pipeline, monkeypatch):
+    stub_render(monkeypatch)
+    pending = [add_attachment(db, task, "a" * 64) for _ in range(2)]
+
+    await pipeline.resume()
+    assert list(pipeline._jobs) == ["a" * 64]
+    await drain()
+
+    assert statuses(db, *pending) == [DerivativeStatus.READY, DerivativeStatus.READY]
@@ -0,0 +1,170 @@
+import json
+import time
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from app.api import auth as auth_api
+from app.config import settings
+from app.core import auth
+from app.database import get_db
+from app.core.auth import InvalidToken, TokenVerifier
+
+def access_token(expires_in: float = 300) -> str:
+    return jwt.encode(
+        {"sub": str(uuid.uuid4()), "exp": int(time.time() + expires_in)},
+        settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM
+    )
+
+class Clock:
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(auth.time, "time", clock)
+    return clock
+
+@pytest.fixture
+def decodes(monkeypatch):
+    """Tokens that reached jwt.decode"""
+
+    decoded = []
+    decode = auth.jwt.decode
+
+    def counting_decode(token, *args, **kwargs):
+        decoded.append(token)
+        return decode(token, *args, **kwargs)
+
+    monkeypatch.setattr(auth.jwt, "decode", counting_decode)
+    return decoded
+
+def test_cached_claims_expire_with_the_token(clock, decodes):
+    verifier = TokenVerifier()
+    token = access_token(expires_in=60)
+
+    claims = verifier.verify(token)
+    assert verifier.verify(token) == claims
+    assert len(decodes) == 1
+
+    clock.now += 61
+    verifier.verify(token)
+    assert len(decodes) == 2
+
+def test_least_recently_used_token_is_evicted(clock, decodes):
+    verifier = TokenVerifier(maxsize=2)
+    first, second, third = access_token(), access_token(), access_token()
+    for token in (first, second, first, third):
+        verifier.verify(token)
+    decodes.clear()
+
+    verifier.verify(first)
+    verifier.verify(third)
+    assert decodes == []
+
+    verifier.verify(second)
+    assert decodes == [second]
+
+def test_revoked_tokens_are_rejected_cached_or_not(clock):
+    verifier = TokenVerifier()
+    cached, unseen = access_token(), access_token()
+    verifier.verify(cached)
+
+    verifier.revoke(cached)
+    verifier.revoke(unseen)
+
+    for token in (cached, unseen):
+        with pytest.raises(InvalidToken):
+            verifier.verify(token)
+
+def test_expired_revocations_are_pruned(clock):
+    verifier = TokenVerifier()
+    short, long = access_token(expires_in=60), access_token(expires_in=3600)
+    verifier.verify(short)
+    verifier.verify(long)
+    verifier.revoke(short)
+
+    clock.now += 120
+    verifier.revoke(long)
+
+    assert set(verifier._revoked) == {TokenVerifier.digest(long)}
+
+def test_invalid_tokens_are_rejected():
+    verifier = TokenVerifier()
+    unsigned = jwt.encode({"sub": "someone"}, "another-secret", algorithm=settings.ALGORITHM)
+    subjectless = jwt.encode({"exp": int(time.time()) + 60}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+    for token in ("not-a-jwt", unsigned, access_token(expires_in=-60), subjectless):
+        with pytest.raises(InvalidToken):
+            verifier.verify(token)
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    def zadd(self, key, mapping):
+        self.redis.revoked.update(mapping)
+
+    def publish(self, channel, message):
+        self.redis.published.append((channel, message))
+
+    async def execute(self):
+        pass
+
+class FakeRedis:
+    def __init__(self):
+        self.revoked = {}
+        self.published = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+@pytest.mark.asyncio
+async def test_logout_revokes_the_token_on_other_workers():
+    worker, other_worker = TokenVerifier(), TokenVerifier()
+    worker.redis = FakeRedis()
+    token = access_token()
+    worker.verify(token)
+    other_worker.verify(token)
+
+    await worker.revoke_everywhere(token)
+
+    [(channel, message)] = worker.redis.published
+    data = json.loads(message)
+    assert channel == auth.TOKEN_REVOCATION_CHANNEL
+    assert token not in message
+    assert worker.redis.revoked == {data["token"]: data["expires_at"]}
+
+    other_worker.discard(data["token"], data["expires_at"])
+    with pytest.raises(InvalidToken):
+        other_worker.verify(token)
+
+@pytest.fixture
+def client(db, monkeypatch):
+    monkeypatch.setattr(auth.token_verifier, "redis", FakeRedis())
+    app = FastAPI()
+    app.include_router(auth_api.router, prefix="/api/auth")
+    app.dependency_overrides[get_db] = lambda: db
+    return TestClient(app)
+
+def test_logout_rejects_the_token_afterwards(client, board):
+    user, _ = board
+    token = jwt.encode({"sub": str(user.id), "exp": int(time.time()) + 300}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.post("/api/auth/logout", headers=headers).status_code == 204
+    assert client.post("/api/auth/logout", headers=headers).status_code == 401
@@ -0,0 +1,87 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.models import Board, BoardColumnCount, Task, TaskStatus
+from app.services.board_service import (
+    ColumnIndex, column_index, reconcile_column_counts, shift_column_count
+)
+
+COLUMNS = [
+    {"id": "done", "name": "Done", "order": 2, "status": "done"},
+    {"id": "todo", "name": "To Do", "order": 0},
+    {"id": "parked", "name": "Parked", "order": 1, "wip_limit": 3}
+]
+
+def make_board(columns=COLUMNS):
+    return Board(id=uuid.uuid4(), name="Board", columns=columns)
+
+def test_columns_are_ordered_and_carry_their_status():
+    index = ColumnIndex(make_board())
+
+    assert list(index.columns) == ["todo", "parked", "done"]
+    assert index.first.id == "todo"
+    assert index.column("done").status == TaskStatus.DONE
+    assert index.column("parked").status is None
+    assert index.column("parked").wip_limit == 3
+
+def test_column_named_after_a_status_implies_it():
+    index = ColumnIndex(make_board([{"id": "in_progress", "name": "Doing"}]))
+
+    assert index.column("in_progress").status == TaskStatus.IN_PROGRESS
+
+def test_unknown_column_is_rejected():
+    with pytest.raises(HTTPException) as exc:
+        ColumnIndex(make_board()).column("missing")
+
+    assert exc.value.status_code == 400
+
+def test_board_without_columns_has_no_first_column():
+    assert ColumnIndex(make_board([])).first is None
+
+def test_index_is_recompiled_only_when_columns_change():
+    board = make_board()
+    index = column_index(board)
+
+    assert column_index(board) is index
+
+    board.columns = COLUMNS[:1]
+    assert list(column_index(board).columns) == ["done"]
+
+def count(db, board, column_id):
+    return db.query(BoardColumnCount.task_count).filter(
+        BoardColumnCount.board_id == board.id,
+        BoardColumnCount.column_id == column_id
+    ).scalar()
+
+def test_wip_limit_is_enforced_when_entering_a_column(db, board):
+    _, board = board
+    todo, review = (board.id, "todo"), (board.id, "review")
+
+    shift_column_count(db, after=todo)
+    shift_column_count(db, after=todo)
+
+    assert shift_column_count(db, after=review, wip_limit=2) == 1
+    assert shift_column_count(db, todo, review, wip_limit=2) == 2
+    with pytest.raises(HTTPException) as exc:
+        shift_column_count(db, todo, review, wip_limit=2)
+
+    assert exc.value.status_code == 409
+    assert (count(db, board, "todo"), count(db, board, "review")) == (1, 2)
+
+def test_reconcile_adds_the_drift_to_each_counter(db, board):
+    user, board = board
+    db.add_all([
+        Task(title=f"Task {i}", board_id=board.id, creator_id=user.id, column_id="todo")
+        for i in range(3)
+    ])
+    db.add_all([
+        BoardColumnCount(board_id=board.id, column_id="todo", task_count=1),
+        BoardColumnCount(board_id=board.id, column_id="done", task_count=4)
+    ])
+    db.flush()
+
+    assert reconcile_column_counts(db) == 2
+    assert (count(db, board, "todo"), count(db, board, "done")) == (3, 0)
+    assert reconcile_column_counts(db) == 0
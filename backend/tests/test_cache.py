@@ -0,0 +1,29 @@
+from app.core.cache import VersionedLRU
+
+def test_value_is_only_returned_for_its_version():
+    cache = VersionedLRU()
+    cache.put("board", 3, "path")
+
+    assert cache.get("board", 3) == "path"
+    assert cache.get("board", 4) is None
+    assert cache.get("other", 3) is None
+
+def test_newer_version_replaces_the_entry():
+    cache = VersionedLRU()
+    cache.put("board", 1, "old")
+    cache.put("board", 2, "new")
+
+    assert cache.get("board", 1) is None
+    assert cache.get("board", 2) == "new"
+
+def test_least_recently_used_key_is_evicted():
+    cache = VersionedLRU(maxsize=2)
+    cache.put("first", 1, "a")
+    cache.put("second", 1, "b")
+
+    cache.get("first", 1)
+    cache.put("third", 1, "c")
+
+    assert cache.get("second", 1) is None
+    assert cache.get("first", 1) == "a"
+    assert cache.get("third", 1) == "c"
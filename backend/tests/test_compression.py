@@ -0,0 +1,68 @@
+import json
+
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressedPayload, CompressionMiddleware, negotiate
+
+BODY = json.dumps([{"id": i, "title": f"Task {i}", "status": "todo"} for i in range(200)])
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br", "br"),
+    ("gzip, zstd", "zstd"),
+    ("GZIP", "gzip"),
+    ("br;q=0.5, gzip;q=0.8", "gzip"),
+    ("br;q=0, *", "zstd"),
+    ("*;q=0, gzip;q=0.1", "gzip"),
+    ("br;q=oops, gzip", "gzip"),
+    ("identity", None),
+    ("", None)
+])
+def test_negotiate(header, expected):
+    assert negotiate(header) == expected
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/large")
+    def large():
+        return Response(BODY, media_type="application/json")
+
+    @app.get("/small")
+    def small():
+        return Response("{}", media_type="application/json")
+
+    @app.get("/binary")
+    def binary():
+        return Response(b"\0" * 1000, media_type="application/octet-stream")
+
+    payload = CompressedPayload(BODY.encode())
+
+    @app.get("/cached")
+    async def cached(request: Request):
+        return await payload.response(request)
+
+    return TestClient(app)
+
+def test_large_json_is_compressed_with_the_negotiated_encoding(client):
+    # The test client decodes the body, so equality means it round-trips
+    response = client.get("/large", headers={"Accept-Encoding": "br"})
+
+    assert response.headers["content-encoding"] == "br"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.content == BODY.encode()
+
+def test_small_and_binary_bodies_pass_through(client):
+    for path in ("/small", "/binary"):
+        response = client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+def test_precompressed_payload_is_not_compressed_again(client):
+    response = client.get("/cached", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    # The client decodes once; a second layer would leave gzip bytes behind
+    assert response.content == BODY.encode()
@@ -0,0 +1,54 @@
+import uuid
+
+from app.models import TaskStatus
+from app.services.graph_service import compute_critical_path
+
+def ids(count):
+    return [uuid.uuid4() for _ in range(count)]
+
+def test_longest_chain_by_remaining_hours_is_critical():
+    a, b, c, d = ids(4)
+    tasks = [
+        (a, 2, TaskStatus.TODO),
+        (b, 5, TaskStatus.TODO),
+        (c, 1, TaskStatus.TODO),
+        (d, 3, TaskStatus.TODO)
+    ]
+    # a -> b -> d is 10 hours, a -> c -> d only 6
+    edges = [(a, b), (a, c), (b, d), (c, d)]
+
+    length, path, finish = compute_critical_path(tasks, edges)
+
+    assert length == 10
+    assert path == [a, b, d]
+    assert finish == {a: 2, b: 7, c: 3, d: 10}
+
+def test_done_and_unestimated_tasks_add_no_time():
+    a, b, c = ids(3)
+    tasks = [(a, 8, TaskStatus.DONE), (b, None, TaskStatus.TODO), (c, 4, TaskStatus.IN_PROGRESS)]
+
+    length, path, _ = compute_critical_path(tasks, [(a, b), (b, c)])
+
+    assert length == 4
+    assert path == [a, b, c]
+
+def test_edges_to_tasks_outside_the_board_are_ignored():
+    a, b, outside = ids(3)
+    tasks = [(a, 1, TaskStatus.TODO), (b, 2, TaskStatus.TODO)]
+
+    length, path, _ = compute_critical_path(tasks, [(outside, a), (a, outside)])
+
+    assert length == 2
+    assert path == [b]
+
+def test_tasks_on_a_cycle_are_left_out():
+    a, b, c = ids(3)
+    tasks = [(a, 5, TaskStatus.TODO), (b, 5, TaskStatus.TODO), (c, 1, TaskStatus.TODO)]
+
+    length, path, finish = compute_critical_path(tasks, [(a, b), (b, a)])
+
+    assert (length, path) == (1, [c])
+    assert set(finish) == {c}
+
+def test_empty_board():
+    assert compute_critical_path([], []) == (0, [], {})
@@ -0,0 +1,114 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from app.config import settings
+from app.core.compression import CompressionMiddleware
+from app.core.idempotency import IdempotencyMiddleware
+
+class FakeRedis:
+    """The subset of redis.asyncio.Redis the middleware uses"""
+
+    def __init__(self):
+        self.store = {}
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def delete(self, key):
+        self.store.pop(key, None)
+
+def token():
+    expires = datetime.now(timezone.utc) + timedelta(minutes=5)
+    return jwt.encode({"sub": str(uuid.uuid4()), "exp": expires}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+@pytest.fixture
+def server(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr("app.core.idempotency.redis.from_url", lambda url: fake)
+    app = FastAPI()
+    calls = []
+
+    @app.post("/api/tasks")
+    async def create(request: Request):
+        calls.append(dict(fake.store))
+        payload = await request.json()
+        if payload.get("fail"):
+            return JSONResponse({"detail": "Invalid task"}, status_code=400)
+        # Large enough to be compressed on the way out
+        return JSONResponse({"title": payload["title"], "padding": "x" * 5000}, status_code=201)
+
+    app.add_middleware(IdempotencyMiddleware, path_prefixes=("/api/tasks",))
+    app.add_middleware(CompressionMiddleware)
+    return TestClient(app), fake, calls
+
+@pytest.fixture
+def headers():
+    return {"Authorization": f"Bearer {token()}", "Idempotency-Key": "key-1", "Accept-Encoding": "gzip"}
+
+def test_replay_through_compression_is_decodable(server, headers):
+    client, _, calls = server
+
+    first = client.post("/api/tasks", json={"title": "Write docs"}, headers=headers)
+    replay = client.post("/api/tasks", json={"title": "Write docs"}, headers=headers)
+
+    assert len(calls) == 1
+    assert replay.status_code == 201
+    assert replay.headers["idempotent-replayed"] == "true"
+    assert replay.headers["content-encoding"] == "gzip"
+    # The test client decodes gzip; a mislabelled body would fail here
+    assert replay.json() == first.json()
+
+def test_retry_while_first_request_is_in_flight_gets_409(server, headers):
+    client, fake, calls = server
+    client.post("/api/tasks", json={"title": "Write docs"}, headers=headers)
+    # Put back the claim the endpoint saw while the first request was running
+    fake.store = calls[0]
+
+    response = client.post("/api/tasks", json={"title": "Write docs"}, headers=headers)
+
+    assert response.status_code == 409
+    assert len(calls) == 1
+
+def test_key_reused_for_a_different_request_gets_422(server, headers):
+    client, _, calls = server
+    client.post("/api/tasks", json={"title": "Write docs"}, headers=headers)
+
+    response = client.post("/api/tasks", json={"title": "Something else"}, headers=headers)
+
+    assert response.status_code == 422
+    assert len(calls) == 1
+
+def test_failed_request_releases_the_key(server, headers):
+    client, fake, calls = server
+
+    failed = client.post("/api/tasks", json={"fail": True}, headers=headers)
+
+    assert failed.status_code == 400
+    assert fake.store == {}
+
+    retried = client.post("/api/tasks", json={"fail": True}, headers=headers)
+    assert retried.status_code == 400
+    assert "idempotent-replayed" not in retried.headers
+    assert len(calls) == 2
+
+def test_requests_without_a_key_are_not_recorded(server, headers):
+    client, fake, calls = server
+    del headers["Idempotency-Key"]
+
+    for _ in range(2):
+        client.post("/api/tasks", json={"title": "Write docs"}, headers=headers)
+
+    assert len(calls) == 2
+    assert fake.store == {}
@@ -0,0 +1,75 @@
+import pytest
+from fastapi import HTTPException
+
+from app.core import rate_limit
+from app.core.rate_limit import MemoryRateLimiter, RedisRateLimiter, TokenBucket
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    return clock
+
+def test_bucket_allows_a_burst_then_reports_the_wait(clock):
+    bucket = TokenBucket(rate=2.0, burst=3)
+
+    assert [bucket.take() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.take() == pytest.approx(0.5)
+
+def test_bucket_refills_at_the_rate_up_to_the_burst(clock):
+    bucket = TokenBucket(rate=2.0, burst=3)
+    for _ in range(3):
+        bucket.take()
+
+    clock.now += 0.5
+    assert bucket.take() == 0.0
+    assert bucket.take() > 0
+
+    clock.now += 60
+    assert [bucket.take() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.take() > 0
+
+@pytest.mark.asyncio
+async def test_memory_limiter_keeps_a_bucket_per_key(clock):
+    limiter = MemoryRateLimiter()
+
+    assert await limiter.acquire("a", 1.0, 1) == 0.0
+    assert await limiter.acquire("a", 1.0, 1) > 0
+    assert await limiter.acquire("b", 1.0, 1) == 0.0
+
+@pytest.mark.asyncio
+async def test_memory_limiter_prunes_only_refilled_buckets(clock, monkeypatch):
+    monkeypatch.setattr(MemoryRateLimiter, "MAX_KEYS", 2)
+    limiter = MemoryRateLimiter()
+    await limiter.acquire("idle", 1.0, 1)
+    clock.now += 5
+    await limiter.acquire("busy", 1.0, 1)
+
+    await limiter.acquire("new", 1.0, 1)
+
+    assert set(limiter._buckets) == {"busy", "new"}
+
+@pytest.mark.asyncio
+async def test_empty_bucket_raises_429_with_retry_after(clock, monkeypatch):
+    monkeypatch.setattr(rate_limit, "rate_limiter", MemoryRateLimiter())
+    await rate_limit.enforce_rate_limit("key", 0.4, 1)
+
+    with pytest.raises(HTTPException) as exc:
+        await rate_limit.enforce_rate_limit("key", 0.4, 1)
+
+    assert exc.value.status_code == 429
+    assert exc.value.headers == {"Retry-After": "3"}
+
+@pytest.mark.asyncio
+async def test_redis_limiter_allows_requests_while_redis_is_down():
+    # Nothing listens on this port, so every script call fails to connect
+    limiter = RedisRateLimiter("redis://127.0.0.1:1")
+
+    assert await limiter.acquire("key", 1.0, 1) == 0.0
@@ -0,0 +1,132 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import redis.asyncio as redis
+
+from app.models import TaskStatus
+from app.services import reminder_service
+from app.services.reminder_service import FIRE_RETRY, ReminderScheduler
+
+@pytest.fixture
+def scheduler():
+    scheduler = ReminderScheduler()
+    scheduler.lead = timedelta(hours=1)
+    scheduler.horizon = timedelta(hours=24)
+    return scheduler
+
+@pytest.fixture
+def sent(monkeypatch):
+    """Reminders delivered through the notification service"""
+
+    messages = []
+
+    async def notify_user(user_id, message):
+        messages.append((user_id, message))
+
+    monkeypatch.setattr(reminder_service.notification_service, "notify_user", notify_user)
+    return messages
+
+def now():
+    return datetime.now(timezone.utc)
+
+def notification(task_id, due_date, assignee_id, status="todo", deleted=False, due_date_changed=False):
+    """A NOTIFY payload as written by notify_due_change"""
+
+    return {
+        "task_id": str(task_id),
+        "deleted": deleted,
+        "due_date": due_date.isoformat() if due_date else None,
+        "status": status,
+        "assignee_id": str(assignee_id) if assignee_id else None,
+        "due_date_changed": due_date_changed
+    }
+
+def test_reminder_fires_lead_time_before_the_due_date(scheduler):
+    task_id, assignee_id = uuid.uuid4(), uuid.uuid4()
+    due = now() + timedelta(hours=5)
+    scheduler.schedule(task_id, due, TaskStatus.TODO, assignee_id)
+
+    assert scheduler.pop_due(due - timedelta(hours=1, seconds=1)) == []
+    assert scheduler.pop_due(due - timedelta(hours=1)) == [(task_id, assignee_id, due)]
+    assert scheduler.pop_due(due) == []
+
+def test_changed_due_date_replaces_the_reminder(scheduler):
+    task_id, assignee_id = uuid.uuid4(), uuid.uuid4()
+    first, second = now() + timedelta(hours=3), now() + timedelta(hours=6)
+    scheduler._apply(notification(task_id, first, assignee_id, due_date_changed=True))
+    scheduler._apply(notification(task_id, second, assignee_id, due_date_changed=True))
+
+    assert scheduler.pop_due(first) == []
+    assert scheduler.pop_due(second) == [(task_id, assignee_id, second)]
+
+@pytest.mark.parametrize("change", [
+    {"deleted": True},
+    {"status": "done"},
+    {"assignee_id": None},
+    {"due_date": None}
+])
+def test_reminder_is_dropped_when_it_no_longer_applies(scheduler, change):
+    task_id, assignee_id = uuid.uuid4(), uuid.uuid4()
+    due = now() + timedelta(hours=3)
+    scheduler._apply(notification(task_id, due, assignee_id))
+
+    scheduler._apply({**notification(task_id, due, assignee_id), **change})
+
+    assert scheduler.pop_due(due) == []
+
+def test_tasks_due_beyond_the_horizon_are_not_held(scheduler):
+    scheduler.schedule(uuid.uuid4(), now() + timedelta(hours=30), TaskStatus.TODO, uuid.uuid4())
+
+    assert scheduler._scheduled == {}
+
+def test_passed_lead_time_fires_only_for_a_new_due_date(scheduler):
+    task_id, assignee_id = uuid.uuid4(), uuid.uuid4()
+    due = now() + timedelta(minutes=30)
+
+    # An unrelated write to a task whose reminder time already passed
+    scheduler._apply(notification(task_id, due, assignee_id))
+    assert scheduler.pop_due(now()) == []
+
+    scheduler._apply(notification(task_id, due, assignee_id, due_date_changed=True))
+    assert scheduler.pop_due(now()) == [(task_id, assignee_id, due)]
+
+def test_pending_reminder_survives_writes_after_its_lead_time(scheduler):
+    task_id, assignee_id = uuid.uuid4(), uuid.uuid4()
+    due = now() + timedelta(minutes=30)
+    scheduler._apply(notification(task_id, due, assignee_id, due_date_changed=True))
+
+    scheduler._apply(notification(task_id, due, assignee_id))
+
+    assert scheduler.pop_due(now()) == [(task_id, assignee_id, due)]
+
+@pytest.mark.asyncio
+async def test_reminder_is_sent_once_per_due_date(scheduler, sent):
+    task_id, assignee_id = uuid.uuid4(), uuid.uuid4()
+    due = now() + timedelta(minutes=30)
+    scheduler._apply(notification(task_id, due, assignee_id, due_date_changed=True))
+    for reminder in scheduler.pop_due(now()):
+        await scheduler._fire(*reminder)
+
+    scheduler._apply(notification(task_id, due, assignee_id, due_date_changed=True))
+    assert scheduler.pop_due(now()) == []
+
+    later = due + timedelta(minutes=15)
+    scheduler._apply(notification(task_id, later, assignee_id, due_date_changed=True))
+    assert scheduler.pop_due(now()) == [(task_id, assignee_id, later)]
+    assert [message["task_id"] for _, message in sent] == [str(task_id)]
+
+@pytest.mark.asyncio
+async def test_failed_send_is_retried(scheduler, monkeypatch):
+    async def notify_user(user_id, message):
+        raise redis.ConnectionError("down")
+
+    monkeypatch.setattr(reminder_service.notification_service, "notify_user", notify_user)
+    task_id, assignee_id = uuid.uuid4(), uuid.uuid4()
+    due = now() + timedelta(minutes=30)
+
+    await scheduler._fire(task_id, assignee_id, due)
+
+    assert scheduler._fired == {}
+    assert scheduler.pop_due(now()) == []
+    assert scheduler.pop_due(now() + FIRE_RETRY) == [(task_id, assignee_id, due)]
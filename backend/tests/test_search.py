@@ -0,0 +1,102 @@
+import pytest
+from fastapi import HTTPException
+
+from app.models import Board, Comment, Task, Team, TeamMember, User
+from app.services.search_service import search_tasks
+
+@pytest.fixture
+def boards(db):
+    """Two boards the user can see and one on a team they are not in"""
+
+    user = User(email="searcher@example.com", name="Searcher")
+    outsider = User(email="outsider@example.com", name="Outsider")
+    own_team, other_team = Team(name="Own"), Team(name="Other")
+    db.add_all([user, outsider, own_team, other_team])
+    db.flush()
+
+    db.add_all([
+        TeamMember(user_id=user.id, team_id=own_team.id),
+        TeamMember(user_id=outsider.id, team_id=other_team.id)
+    ])
+    first = Board(name="First", team_id=own_team.id)
+    second = Board(name="Second", team_id=own_team.id)
+    hidden = Board(name="Hidden", team_id=other_team.id)
+    db.add_all([first, second, hidden])
+    db.flush()
+    return user, first, second, hidden
+
+def add_task(db, user, board, title, description=None):
+    task = Task(title=title, description=description, board_id=board.id, creator_id=user.id)
+    db.add(task)
+    db.flush()
+    return task
+
+def test_title_matches_outrank_description_and_comment_matches(db, boards):
+    user, first, second, _ = boards
+    in_title = add_task(db, user, first, "Deploy the pipeline")
+    in_description = add_task(db, user, first, "Pipeline work", "Deploy once review passes")
+    in_comment = add_task(db, user, second, "Release notes")
+    db.add(Comment(content="Ready to deploy tomorrow", task_id=in_comment.id, author_id=user.id))
+    add_task(db, user, first, "Unrelated chore")
+    db.flush()
+
+    page = search_tasks(db, user, "deploy")
+
+    assert [hit.task.id for hit in page.hits] == [in_title.id, in_description.id, in_comment.id]
+    assert page.hits[0].title_highlight == "<mark>Deploy</mark> the pipeline"
+    assert page.next_cursor is None
+
+def test_comment_only_match_is_highlighted(db, boards):
+    user, first, _, _ = boards
+    task = add_task(db, user, first, "Release notes", "Summarise the sprint")
+    db.add_all([
+        Comment(content="Nothing to see here", task_id=task.id, author_id=user.id),
+        Comment(content="The deploy failed twice", task_id=task.id, author_id=user.id)
+    ])
+    db.flush()
+
+    [hit] = search_tasks(db, user, "deploy").hits
+
+    assert hit.task.id == task.id
+    assert hit.board_id == first.id
+    assert "<mark>deploy</mark> failed twice" in hit.comment_highlight
+
+def test_results_are_limited_to_the_users_teams(db, boards):
+    user, first, second, hidden = boards
+    visible = add_task(db, user, first, "Deploy staging")
+    other_board = add_task(db, user, second, "Deploy production")
+    hidden_task = add_task(db, user, hidden, "Deploy secrets")
+    db.add(Comment(content="deploy", task_id=hidden_task.id, author_id=user.id))
+    db.flush()
+
+    everywhere = search_tasks(db, user, "deploy")
+    on_board = search_tasks(db, user, "deploy", board_id=first.id)
+    on_hidden_board = search_tasks(db, user, "deploy", board_id=hidden.id)
+
+    assert {hit.task.id for hit in everywhere.hits} == {visible.id, other_board.id}
+    assert [hit.task.id for hit in on_board.hits] == [visible.id]
+    assert on_hidden_board.hits == []
+
+def test_cursor_pages_through_equal_ranks_without_gaps(db, boards):
+    user, first, second, _ = boards
+    tasks = [add_task(db, user, (first, second)[i % 2], "Database migration") for i in range(5)]
+    best = add_task(db, user, first, "Migration migration plan")
+
+    seen, cursor = [], None
+    while True:
+        page = search_tasks(db, user, "migration", cursor=cursor, limit=2)
+        seen.extend(hit.task.id for hit in page.hits)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert seen[0] == best.id
+    assert sorted(seen[1:]) == sorted(task.id for task in tasks)
+    assert seen[1:] == sorted(seen[1:], reverse=True)
+
+def test_invalid_cursor_is_rejected(db, boards):
+    user, *_ = boards
+    with pytest.raises(HTTPException) as exc:
+        search_tasks(db, user, "deploy", cursor="not-a-cursor")
+
+    assert exc.value.status_code == 400
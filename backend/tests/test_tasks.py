@@ -0,0 +1,146 @@
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.api import tasks as tasks_api
+from app.api.deps import get_current_active_user
+from app.database import get_db
+from app.models import Task
+from app.schemas import TaskMove, TaskUpdate
+from app.services.task_service import TaskService
+
+@pytest.fixture(autouse=True)
+def no_broadcasts(monkeypatch):
+    async def broadcast(*args, **kwargs):
+        pass
+
+    monkeypatch.setattr(tasks_api.websocket_manager, "broadcast_task_change", broadcast)
+    monkeypatch.setattr(tasks_api.websocket_manager, "broadcast_to_board", broadcast)
+
+def add_tasks(db, user, board, column_id, count):
+    tasks = [
+        Task(title=f"{column_id} {i}", board_id=board.id, creator_id=user.id, column_id=column_id, position=i)
+        for i in range(count)
+    ]
+    db.add_all(tasks)
+    db.commit()
+    return tasks
+
+def bump_behind_the_session(db, task):
+    """Simulate a concurrent writer: the row moves on, the loaded object does not"""
+
+    version = task.version
+    db.execute(update(Task).where(Task.id == task.id).values(version=Task.version + 1))
+    db.commit()
+    set_committed_value(task, "version", version)
+
+@pytest.mark.asyncio
+async def test_update_with_a_stale_version_returns_the_current_task(db, board):
+    user, board = board
+    [task] = add_tasks(db, user, board, "todo", 1)
+
+    with pytest.raises(HTTPException) as exc:
+        await tasks_api.update_task(task.id, TaskUpdate(title="Mine", version=task.version - 1), user, db)
+
+    assert exc.value.status_code == 409
+    assert exc.value.detail["task"]["id"] == str(task.id)
+    assert exc.value.detail["task"]["title"] == "todo 0"
+
+@pytest.mark.asyncio
+async def test_update_that_loses_the_race_at_flush_returns_409(db, board):
+    user, board = board
+    [task] = add_tasks(db, user, board, "todo", 1)
+    bump_behind_the_session(db, task)
+
+    with pytest.raises(HTTPException) as exc:
+        await tasks_api.update_task(task.id, TaskUpdate(title="Mine"), user, db)
+
+    assert exc.value.status_code == 409
+    assert exc.value.detail["task"]["version"] == 2
+    assert db.get(Task, task.id).title == "todo 0"
+
+@pytest.mark.asyncio
+async def test_update_with_the_current_version_bumps_it(db, board):
+    user, board = board
+    [task] = add_tasks(db, user, board, "todo", 1)
+
+    updated = await tasks_api.update_task(task.id, TaskUpdate(title="Mine", version=1), user, db)
+
+    assert (updated.title, updated.version) == ("Mine", 2)
+
+@pytest.mark.asyncio
+async def test_move_with_a_stale_version_returns_409(db, board):
+    user, board = board
+    [task] = add_tasks(db, user, board, "todo", 1)
+
+    with pytest.raises(HTTPException) as exc:
+        await TaskService(db).move_task(task.id, TaskMove(column_id="done", position=0, version=5), user)
+
+    assert exc.value.status_code == 409
+    assert db.get(Task, task.id).column_id == "todo"
+
+@pytest.mark.asyncio
+async def test_move_that_loses_the_race_at_flush_returns_409(db, board):
+    user, board = board
+    [task] = add_tasks(db, user, board, "todo", 1)
+    bump_behind_the_session(db, task)
+
+    with pytest.raises(HTTPException) as exc:
+        await TaskService(db).move_task(task.id, TaskMove(column_id="done", position=0), user)
+
+    assert exc.value.status_code == 409
+    assert exc.value.detail["task"]["column_id"] == "todo"
+
+@pytest.mark.asyncio
+async def test_move_shifts_neighbour_positions_but_not_their_versions(db, board):
+    user, board = board
+    todo = add_tasks(db, user, board, "todo", 3)
+    done = add_tasks(db, user, board, "done", 2)
+
+    moved = await TaskService(db).move_task(todo[0].id, TaskMove(column_id="done", position=0, version=1), user)
+
+    db.expire_all()
+    assert (moved.column_id, moved.position, moved.version) == ("done", 0, 2)
+    assert [(db.get(Task, task.id).position, db.get(Task, task.id).version) for task in todo[1:]] == [(0, 1), (1, 1)]
+    assert [(db.get(Task, task.id).position, db.get(Task, task.id).version) for task in done] == [(1, 1), (2, 1)]
+
+@pytest.fixture
+def client(db, board):
+    user, _ = board
+    app = FastAPI()
+    app.include_router(tasks_api.router, prefix="/api/tasks")
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_active_user] = lambda: user
+    return TestClient(app)
+
+def test_task_list_views(db, board, client):
+    user, board = board
+    [task] = add_tasks(db, user, board, "todo", 1)
+
+    [full] = client.get("/api/tasks/", params={"board_id": str(board.id)}).json()
+    [summary] = client.get("/api/tasks/", params={"view": "summary"}).json()
+    [sparse] = client.get("/api/tasks/", params={"fields": "title, position,title"}).json()
+
+    assert full["creator"]["id"] == str(user.id)
+    assert full["comments_count"] == 0
+    assert summary == {
+        "id": str(task.id), "title": "todo 0", "status": "todo",
+        "priority": "medium", "assignee_id": None, "due_date": None
+    }
+    assert sparse == {"id": str(task.id), "title": "todo 0", "position": 0}
+
+def test_unknown_fields_are_rejected(board, client):
+    response = client.get("/api/tasks/", params={"fields": "title,creator,secret"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown fields: creator, secret"
+
+def test_task_list_schema_documents_every_view(client):
+    schema = client.get("/openapi.json").json()
+    response = schema["paths"]["/api/tasks/"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+
+    assert [variant["items"]["$ref"].rsplit("/", 1)[1] for variant in response["anyOf"]] == [
+        "TaskWithDetails", "TaskSummary", "TaskFields"
+    ]
@@ -0,0 +1,142 @@
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.api import teams as teams_api
+from app.api.deps import get_current_active_user
+from app.config import settings
+from app.database import get_db
+from app.models import TeamMember, User, UserRole
+
+@pytest.fixture(autouse=True)
+def no_invalidations(monkeypatch):
+    async def invalidate(team_id, user_ids):
+        pass
+
+    monkeypatch.setattr(teams_api.team_role_cache, "invalidate", invalidate)
+
+@pytest.fixture
+def client(db, board):
+    user, _ = board
+    app = FastAPI()
+    app.include_router(teams_api.router, prefix="/api/teams")
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_active_user] = lambda: user
+    return TestClient(app)
+
+@pytest.fixture
+def users(db):
+    """Accounts a@, b@ and c@example.com, none of them in the team yet"""
+
+    users = [
+        User(email=f"{name}@example.com", name=name, google_id=f"google-{name}")
+        for name in "abc"
+    ]
+    db.add_all(users)
+    db.commit()
+    return users
+
+def roles(db, board):
+    db.expire_all()
+    return {
+        member.user.email: member.role
+        for member in db.query(TeamMember).filter(TeamMember.team_id == board.team_id)
+    }
+
+def bulk_add(client, board, *members):
+    return client.post(
+        f"/api/teams/{board.team_id}/members/bulk",
+        json={"members": [{"user_email": email, "role": role} for email, role in members]}
+    )
+
+def test_bulk_add_inserts_new_members_and_updates_existing_ones(db, board, client, users):
+    _, board = board
+    db.add(TeamMember(team_id=board.team_id, user_id=users[0].id, role=UserRole.VIEWER))
+    db.commit()
+
+    response = bulk_add(
+        client, board,
+        ("a@example.com", "editor"),
+        ("b@example.com", "viewer"),
+        ("nobody@example.com", "editor"),
+        # Later entries for the same email win
+        ("c@example.com", "viewer"),
+        (" c@example.com ", "admin")
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "added": ["b@example.com", "c@example.com"],
+        "updated": ["a@example.com"],
+        "not_found": ["nobody@example.com"]
+    }
+    assert roles(db, board) == {
+        "owner@example.com": UserRole.ADMIN,
+        "a@example.com": UserRole.EDITOR,
+        "b@example.com": UserRole.VIEWER,
+        "c@example.com": UserRole.ADMIN
+    }
+
+def test_repeated_bulk_add_reports_every_member_as_updated(db, board, client, users):
+    _, board = board
+    members = [("a@example.com", "editor"), ("b@example.com", "viewer")]
+    bulk_add(client, board, *members)
+
+    response = bulk_add(client, board, *members)
+
+    assert response.json() == {"added": [], "updated": ["a@example.com", "b@example.com"], "not_found": []}
+    assert len(roles(db, board)) == 3
+
+def test_single_add_keeps_an_existing_members_role(db, board, client, users):
+    _, board = board
+    bulk_add(client, board, ("a@example.com", "viewer"))
+
+    response = client.post(
+        f"/api/teams/{board.team_id}/members",
+        json={"user_email": "a@example.com", "role": "admin"}
+    )
+
+    assert response.status_code == 409
+    assert roles(db, board)["a@example.com"] == UserRole.VIEWER
+
+def test_bulk_add_cannot_change_the_callers_own_role(db, board, client, users):
+    _, board = board
+
+    response = bulk_add(client, board, ("a@example.com", "editor"), ("owner@example.com", "editor"))
+
+    assert response.status_code == 400
+    assert roles(db, board) == {"owner@example.com": UserRole.ADMIN}
+
+def test_oversized_bulk_add_is_rejected_by_the_schema(db, board, client):
+    _, board = board
+    members = [(f"user{i}@example.com", "viewer") for i in range(settings.TEAM_BULK_MAX_MEMBERS + 1)]
+
+    response = bulk_add(client, board, *members)
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "too_long"
+
+def test_last_admin_cannot_be_demoted_or_removed(db, board, client, users):
+    owner, board = board
+
+    with pytest.raises(HTTPException) as exc:
+        teams_api._ensure_admin_remains(db, board.team_id, [owner.id])
+    assert exc.value.status_code == 409
+
+    response = client.delete(f"/api/teams/{board.team_id}/members/{owner.id}")
+    assert response.status_code == 409
+    assert roles(db, board) == {"owner@example.com": UserRole.ADMIN}
+
+def test_another_admin_can_be_demoted_while_one_remains(db, board, client, users):
+    owner, board = board
+    bulk_add(client, board, ("a@example.com", "admin"))
+
+    # Demoting both admins at once leaves none
+    with pytest.raises(HTTPException):
+        teams_api._ensure_admin_remains(db, board.team_id, [owner.id, users[0].id])
+    db.rollback()
+
+    response = bulk_add(client, board, ("a@example.com", "editor"))
+
+    assert response.json()["updated"] == ["a@example.com"]
+    assert roles(db, board)["a@example.com"] == UserRole.EDITOR
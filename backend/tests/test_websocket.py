@@ -0,0 +1,44 @@
+import json
+
+import msgpack
+
+from app.core.websocket import decode_message, encode_message, task_patch
+
+BEFORE = {"id": "t1", "title": "Write docs", "status": "todo", "position": 2}
+
+def test_patch_replaces_only_changed_fields():
+    after = dict(BEFORE, status="done", position=0)
+
+    assert task_patch(after, BEFORE) == [
+        {"op": "replace", "path": "/status", "value": "done"},
+        {"op": "replace", "path": "/position", "value": 0}
+    ]
+
+def test_patch_of_identical_snapshots_is_empty():
+    assert task_patch(dict(BEFORE), BEFORE) == []
+
+def test_patch_without_before_replaces_every_field():
+    assert [op["path"] for op in task_patch(BEFORE)] == ["/id", "/title", "/status", "/position"]
+
+def test_patch_can_be_restricted_to_fields():
+    after = dict(BEFORE, title="Write more docs", status="done")
+
+    assert task_patch(after, BEFORE, fields=["status"]) == [
+        {"op": "replace", "path": "/status", "value": "done"}
+    ]
+    assert task_patch(after, fields=["title"]) == [
+        {"op": "replace", "path": "/title", "value": "Write more docs"}
+    ]
+
+def test_messages_round_trip_in_both_encodings():
+    message = {"type": "ping", "data": {"n": 1}}
+
+    assert decode_message({"text": encode_message(message, "json")}) == message
+    assert decode_message({"bytes": encode_message(message, "msgpack")}) == message
+
+def test_frames_that_are_not_objects_are_dropped():
+    assert decode_message({"text": "not json"}) is None
+    assert decode_message({"text": json.dumps([1, 2])}) is None
+    assert decode_message({"text": None}) is None
+    assert decode_message({"bytes": b"\xc1"}) is None
+    assert decode_message({"bytes": msgpack.packb("ping")}) is None
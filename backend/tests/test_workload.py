@@ -0,0 +1,130 @@
+import pytest
+from sqlalchemy import update
+
+from app.api import tasks as tasks_api
+from app.models import TaskPriority, TaskStatus, TeamMember, User, UserRole, WorkloadRollup
+from app.schemas import TaskCreate, TaskUpdate
+from app.services.archive_service import archive_done_tasks, restore_task
+from app.services.workload_service import UNASSIGNED, reconcile_workload
+
+TODO, DONE = TaskStatus.TODO, TaskStatus.DONE
+MEDIUM, HIGH = TaskPriority.MEDIUM, TaskPriority.HIGH
+
+@pytest.fixture(autouse=True)
+def no_broadcasts(monkeypatch):
+    async def broadcast(*args, **kwargs):
+        pass
+
+    monkeypatch.setattr(tasks_api.websocket_manager, "broadcast_task_change", broadcast)
+    monkeypatch.setattr(tasks_api.websocket_manager, "broadcast_to_board", broadcast)
+
+@pytest.fixture
+def assignee(db, board):
+    _, board = board
+    user = User(email="assignee@example.com", name="Assignee", google_id="google-assignee")
+    db.add(user)
+    db.flush()
+    db.add(TeamMember(user_id=user.id, team_id=board.team_id, role=UserRole.EDITOR))
+    db.commit()
+    return user.id
+
+def cells(db, board):
+    """Non-empty rollup cells of the board's team: (assignee, status, priority) -> (count, hours)"""
+
+    db.expire_all()
+    return {
+        (cell.assignee_id, cell.status, cell.priority): (cell.task_count, cell.estimated_hours)
+        for cell in db.query(WorkloadRollup).filter(WorkloadRollup.team_id == board.team_id)
+        if cell.task_count or cell.estimated_hours
+    }
+
+async def create(db, user, board, **fields):
+    task = await tasks_api.create_task(TaskCreate(title="Task", board_id=board.id, **fields), user, db)
+    return task.id
+
+@pytest.mark.asyncio
+async def test_create_counts_the_task_in_its_cell(db, board, assignee):
+    user, board = board
+
+    await create(db, user, board, assignee_id=assignee, estimated_hours=3)
+    await create(db, user, board, assignee_id=assignee, estimated_hours=2)
+    await create(db, user, board, priority=HIGH)
+
+    assert cells(db, board) == {
+        (assignee, TODO, MEDIUM): (2, 5),
+        (UNASSIGNED, TODO, HIGH): (1, 0)
+    }
+
+@pytest.mark.asyncio
+async def test_reassign_moves_the_task_between_assignees(db, board, assignee):
+    user, board = board
+    task_id = await create(db, user, board, estimated_hours=4)
+
+    await tasks_api.update_task(task_id, TaskUpdate(assignee_id=assignee), user, db)
+
+    assert cells(db, board) == {(assignee, TODO, MEDIUM): (1, 4)}
+
+@pytest.mark.asyncio
+async def test_status_priority_and_hours_changes_move_the_task(db, board, assignee):
+    user, board = board
+    task_id = await create(db, user, board, assignee_id=assignee, estimated_hours=4)
+    await create(db, user, board, assignee_id=assignee, estimated_hours=1)
+
+    await tasks_api.update_task(task_id, TaskUpdate(status=DONE), user, db)
+    assert cells(db, board) == {
+        (assignee, TODO, MEDIUM): (1, 1),
+        (assignee, DONE, MEDIUM): (1, 4)
+    }
+
+    await tasks_api.update_task(task_id, TaskUpdate(priority=HIGH, estimated_hours=6), user, db)
+    assert cells(db, board) == {
+        (assignee, TODO, MEDIUM): (1, 1),
+        (assignee, DONE, HIGH): (1, 6)
+    }
+
+@pytest.mark.asyncio
+async def test_unrelated_update_leaves_the_rollup_alone(db, board, assignee):
+    user, board = board
+    task_id = await create(db, user, board, assignee_id=assignee, estimated_hours=2)
+
+    await tasks_api.update_task(task_id, TaskUpdate(title="Renamed"), user, db)
+
+    assert cells(db, board) == {(assignee, TODO, MEDIUM): (1, 2)}
+
+@pytest.mark.asyncio
+async def test_delete_archive_and_restore_adjust_the_cell(db, board, assignee):
+    user, board = board
+    deleted = await create(db, user, board, assignee_id=assignee, estimated_hours=1)
+    done = await create(db, user, board, assignee_id=assignee, estimated_hours=5)
+    await tasks_api.update_task(done, TaskUpdate(status=DONE), user, db)
+
+    await tasks_api.delete_task(deleted, user, db)
+    assert cells(db, board) == {(assignee, DONE, MEDIUM): (1, 5)}
+
+    assert archive_done_tasks(db, older_than_days=0) == 1
+    assert cells(db, board) == {}
+
+    restore_task(db, done)
+    assert cells(db, board) == {(assignee, DONE, MEDIUM): (1, 5)}
+
+@pytest.mark.asyncio
+async def test_reconcile_repairs_drifted_cells(db, board, assignee):
+    user, board = board
+    await create(db, user, board, assignee_id=assignee, estimated_hours=3)
+    await create(db, user, board, priority=HIGH, estimated_hours=2)
+    expected = cells(db, board)
+
+    # One cell over-counted, one lost, and one left behind with no tasks
+    db.execute(update(WorkloadRollup).where(
+        WorkloadRollup.assignee_id == assignee
+    ).values(task_count=7, estimated_hours=1))
+    db.query(WorkloadRollup).filter(WorkloadRollup.assignee_id == UNASSIGNED).delete()
+    db.add(WorkloadRollup(
+        team_id=board.team_id, assignee_id=assignee, status=DONE, priority=MEDIUM,
+        task_count=2, estimated_hours=8
+    ))
+    db.commit()
+
+    assert reconcile_workload(db) == 3
+    assert cells(db, board) == expected
+    assert reconcile_workload(db) == 0